@@ -0,0 +1,94 @@
+"""
+Benchmark of compressed request and response bodies
+
+Runs queries against the local mock server without compression
+(compression="identity"), with gzip and with zstd, and reports the bytes on the wire and the end-to-end latency.
+Large request bodies, like the CREATE script of examples/stations.py, are
+compressed over --compress-over bytes.
+
+Loopback links are faster than compression, real networks are not: compare
+the wire bytes, and the latency on the link you care about.
+
+Usage: python benchmarks/bench_compression.py [--chunks 10] [--rows-per-chunk 10000]
+"""
+
+import argparse
+import importlib.util
+import statistics
+import time
+
+from mock_server import MockTuringDBServer
+
+from turingdb import TuringDB
+
+
+def create_script(size_kib: int) -> str:
+    statements = []
+    size = 0
+    i = 0
+
+    while size < size_kib * 1024:
+        statement = f'CREATE (:Station {{id: {i}, name: "Station {i}", line: "Line {i % 16}"}})'
+        statements.append(statement)
+        size += len(statement) + 1
+        i += 1
+
+    return "\n".join(statements)
+
+
+def run(server: MockTuringDBServer, compression, compress_over: int, repeat: int, script: str):
+    client = TuringDB(
+        host=server.url,
+        compression=compression,
+        compress_requests_over=compress_over,
+    )
+    client.warmup()
+
+    results = {}
+
+    for name, query in [("query", "MATCH (n) RETURN n"), ("create", script)]:
+        received, sent = server.bytes_received, server.bytes_sent
+        latencies = []
+
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            client.query(query, raw=True)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+        results[name] = (
+            (server.bytes_received - received) // repeat,
+            (server.bytes_sent - sent) // repeat,
+            statistics.median(latencies),
+        )
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=10)
+    parser.add_argument("--rows-per-chunk", type=int, default=10_000)
+    parser.add_argument("--create-kib", type=int, default=1024)
+    parser.add_argument("--compress-over", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    compressions = ["identity", "gzip"]
+    if importlib.util.find_spec("zstandard") is not None:
+        compressions.append("zstd")
+
+    script = create_script(args.create_kib)
+
+    with MockTuringDBServer(
+        chunk_count=args.chunks, rows_per_chunk=args.rows_per_chunk, arrow=False
+    ) as server:
+        print(f"{'compression':<12} {'request':<8} {'sent KiB':>10} {'received KiB':>13} {'median ms':>10}")
+
+        for compression in compressions:
+            results = run(server, compression, args.compress_over, args.repeat, script)
+
+            for name, (up, down, latency) in results.items():
+                print(
+                    f"{compression:<12} {name:<8} {up / 1024:>10.1f} "
+                    f"{down / 1024:>13.1f} {latency:>10.2f}"
+                )
@@ -0,0 +1,89 @@
+"""
+Micro-benchmark of the response decode path
+
+Compares decoding the response through a str (orjson.loads(response.text))
+with decoding the bytes directly (orjson.loads(response.content)), and
+building a DataFrame with returning the raw columns (query(..., raw=True)).
+
+Usage: python benchmarks/bench_decode.py [--sizes-mb 1,100,1000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import httpx
+import orjson
+
+from turingdb import QueryTiming, TuringDB
+
+ROWS_PER_CHUNK = 10_000
+
+
+def make_body(size_mb: int) -> bytes:
+    chunk = [
+        list(range(ROWS_PER_CHUNK)),
+        [f"node-{i}" for i in range(ROWS_PER_CHUNK)],
+        [i * 0.5 for i in range(ROWS_PER_CHUNK)],
+    ]
+    chunk_size = len(orjson.dumps(chunk))
+    chunk_count = max(1, size_mb * 1024 * 1024 // chunk_size)
+
+    return orjson.dumps({
+        "header": {
+            "column_names": ["id", "name", "score"],
+            "column_types": ["Int64", "String", "Double"],
+        },
+        "data": [chunk] * chunk_count,
+        "time": 0.0,
+    })
+
+
+def measure(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - t0) * 1000
+    del result
+
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return elapsed, peak / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes-mb", default="1,100,1000")
+    args = parser.parse_args()
+
+    client = TuringDB(host="http://localhost:6666")
+
+    for size_mb in (int(size) for size in args.sizes_mb.split(",")):
+        body = make_body(size_mb)
+        response = httpx.Response(
+            200, content=body, request=httpx.Request("POST", client.host)
+        )
+
+        print(f"- {len(body) / (1024 * 1024):.0f} MB response")
+
+        for name, fn in (
+            # Same as response.text, which would cache the str after the first call
+            ("str decode", lambda: orjson.loads(body.decode("utf-8"))),
+            ("bytes decode", lambda: client._parse_response(response, QueryTiming())),
+        ):
+            elapsed, peak = measure(fn)
+            print(f"  {name}: Time={elapsed:.2f} ms Peak={peak:.1f} MB")
+
+        json = client._parse_response(response, QueryTiming())
+
+        for name, fn in (
+            ("DataFrame", lambda: client._parse_chunks(json)),
+            ("raw columns", lambda: client._parse_chunks(json, raw=True)),
+        ):
+            elapsed, peak = measure(fn)
+            print(f"  {name}: Time={elapsed:.2f} ms Peak={peak:.1f} MB")
+
+        del response, json, body
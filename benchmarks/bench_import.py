@@ -0,0 +1,90 @@
+"""
+Import-time check of `import turingdb`
+
+Imports the package in fresh interpreters with `python -X importtime`,
+and fails when the best cumulative import time is over the budget, or
+when one of the heavy dependencies that the SDK imports on first use is
+imported. Short-lived jobs pay the import time on every run.
+
+Usage: python benchmarks/bench_import.py [--budget-ms 50] [--runs 5] [--module turingdb]
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Imported on first use only
+DEFERRED_MODULES = [
+    "asyncio",
+    "boto3",
+    "click",
+    "dataclasses",
+    "hashlib",
+    "httpx",
+    "json",
+    "logging",
+    "numpy",
+    "orjson",
+    "pandas",
+    "prompt_toolkit",
+    "pyarrow",
+    "queue",
+    "tempfile",
+]
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time of each imported module, in microseconds"""
+
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    times: dict[str, int] = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+
+        # Children are listed before their parent, drop the interpreter startup
+        if not name.startswith("  "):
+            if name.strip() == module:
+                break
+            times = {}
+
+    return times
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="turingdb")
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [import_times(args.module) for _ in range(args.runs)]
+    best_ms = min(times[args.module] for times in runs) / 1000
+
+    slowest = sorted(runs[0].items(), key=lambda item: item[1], reverse=True)
+    print(f"import {args.module}: {best_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, cumulative in slowest[1:11]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    failures = []
+
+    if best_ms > args.budget_ms:
+        failures.append(f"import time {best_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for name in DEFERRED_MODULES:
+        if name in runs[0]:
+            failures.append(f"{name} is imported by `import {args.module}`")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+
+    sys.exit(1 if failures else 0)
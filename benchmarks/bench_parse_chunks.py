@@ -0,0 +1,83 @@
+"""
+Benchmark of TuringDB._parse_chunks over synthetic chunked responses
+
+Usage: python benchmarks/bench_parse_chunks.py [--rows-per-chunk N]
+           [--result-format pandas|pandas-arrow|pyarrow|numpy] [--legacy]
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from turingdb import TuringDB
+from turingdb.results import DTYPE_MAP, RESULT_FORMATS
+
+COLUMN_NAMES = ["id", "name", "score", "active"]
+COLUMN_TYPES = ["Int64", "String", "Double", "Bool"]
+
+
+def make_response(chunk_count: int, rows_per_chunk: int) -> dict:
+    chunk = [
+        list(range(rows_per_chunk)),
+        [f"node-{i}" for i in range(rows_per_chunk)],
+        [i * 0.5 for i in range(rows_per_chunk)],
+        [i % 2 == 0 for i in range(rows_per_chunk)],
+    ]
+
+    return {
+        "header": {"column_names": COLUMN_NAMES, "column_types": COLUMN_TYPES},
+        "data": [chunk] * chunk_count,
+        "time": 0.0,
+    }
+
+
+def legacy_parse_chunks(json: dict):
+    header = json["header"]
+    column_names = header["column_names"]
+    column_types = header["column_types"]
+
+    df = pd.DataFrame()
+
+    for chunk in json["data"]:
+        df_chunk = pd.DataFrame({
+            cname: pd.Series(col, dtype=DTYPE_MAP.get(ctype, "object"))
+            for (cname, ctype), col in zip(zip(column_names, column_types), chunk)
+        })
+        df = pd.concat([df, df_chunk], ignore_index=True)
+
+    return df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows-per-chunk", type=int, default=100)
+    parser.add_argument("--result-format", choices=RESULT_FORMATS, default="pandas")
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Also time the previous per-chunk pd.concat implementation",
+    )
+    args = parser.parse_args()
+
+    client = TuringDB(host="http://localhost:6666")
+
+    for chunk_count in (1, 100, 10_000):
+        json = make_response(chunk_count, args.rows_per_chunk)
+
+        t0 = time.perf_counter()
+        client._parse_chunks(json, result_format=args.result_format)
+        elapsed = (time.perf_counter() - t0) * 1000
+        rows = chunk_count * args.rows_per_chunk
+        rows_per_sec = rows / (elapsed / 1000) if elapsed > 0 else float("inf")
+
+        print(
+            f"- {chunk_count} chunks: Rows={rows} Time={elapsed:.2f} ms "
+            f"Throughput={rows_per_sec:,.0f} rows/s"
+        )
+
+        if args.legacy:
+            t0 = time.perf_counter()
+            legacy_parse_chunks(json)
+            legacy_elapsed = (time.perf_counter() - t0) * 1000
+            print(f"  legacy pd.concat: Time={legacy_elapsed:.2f} ms")
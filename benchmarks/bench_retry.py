@@ -0,0 +1,71 @@
+"""
+Benchmark of retried and hedged read queries
+
+Runs read queries against the local mock server with injected faults: a
+--fail-rate share of the requests is answered with 502, and a --slow-rate
+share is delayed by --slow-delay seconds. Reports the error rate and the
+p50/p99 latency without retries, with a RetryPolicy, and with a RetryPolicy
+and a HedgePolicy.
+
+Usage: python benchmarks/bench_retry.py [--fail-rate 0.05] [--slow-rate 0.02] [--queries 500]
+"""
+
+import argparse
+import statistics
+import time
+
+from mock_server import MockTuringDBServer
+
+from turingdb import HedgePolicy, RetryPolicy, TuringDB
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(server: MockTuringDBServer, queries: int, retry, hedge):
+    client = TuringDB(host=server.url, retry=retry, hedge=hedge)
+    session = client.session()
+
+    latencies = []
+    errors = 0
+    hedged = 0
+
+    for _ in range(queries):
+        t0 = time.perf_counter()
+        try:
+            _, timing = session.query_timed("MATCH (n) RETURN n", raw=True)
+            hedged += timing.hedged
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    return errors / queries, statistics.median(latencies), percentile(latencies, 0.99), hedged
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fail-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.02)
+    parser.add_argument("--slow-delay", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    policies = [
+        ("none", None, None),
+        ("retry", RetryPolicy(backoff=0.01), None),
+        ("retry+hedge", RetryPolicy(backoff=0.01), HedgePolicy(percentile=0.9)),
+    ]
+
+    with MockTuringDBServer(
+        fail_rate=args.fail_rate,
+        slow_rate=args.slow_rate,
+        slow_delay=args.slow_delay,
+        seed=0,
+    ) as server:
+        print(f"{'policy':<12} {'errors':>8} {'p50 ms':>8} {'p99 ms':>8} {'hedged':>7}")
+
+        for name, retry, hedge in policies:
+            error_rate, p50, p99, hedged = run(server, args.queries, retry, hedge)
+            print(f"{name:<12} {error_rate:>8.2%} {p50:>8.2f} {p99:>8.2f} {hedged:>7}")
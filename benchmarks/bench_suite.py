@@ -0,0 +1,322 @@
+"""
+Benchmark suite of the SDK hot paths, against local stand-in servers
+
+Runs, without a TuringDB engine:
+- roundtrip: request overhead of the client over a bare httpx request to
+  the mock server, for an endpoint call and a one-row query
+- parse: _parse_chunks throughput in rows/sec per result format and
+  column types, and the peak RSS of a process parsing the result.
+  parse_rss_mb is the growth of the peak RSS while parsing, 0 when parsing
+  stays under the peak reached while generating the response
+- s3: upload and download throughput of S3Client.transfer() against a
+  local S3 emulator (moto, install moto[server]) or --s3-endpoint
+- scaling: queries/sec and latencies of one client shared by 1 to N
+  threads, and of AsyncTuringDB.gather_queries()
+
+Results are written as JSON, with the SDK and Python versions, so that
+runs of two releases can be compared.
+
+Usage: python benchmarks/bench_suite.py [--only roundtrip,parse,s3,scaling]
+           [--output results.json] [--quick] [--s3-endpoint http://localhost:9000]
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+import httpx
+import orjson
+
+from mock_server import MockTuringDBServer, make_response
+
+from turingdb import AsyncTuringDB, TuringDB
+
+BENCHMARKS = ("roundtrip", "parse", "s3", "scaling")
+MiB = 1024 * 1024
+
+PARSE_CASES = [
+    # name, column types, chunks, rows per chunk
+    ("mixed", ["Int64", "String", "Double", "Bool"], 100, 10_000),
+    ("numeric", ["Int64", "UInt64", "Double", "Double"], 100, 10_000),
+    ("strings", ["String", "String", "String", "String"], 100, 10_000),
+    ("many-chunks", ["Int64", "String", "Double", "Bool"], 10_000, 100),
+]
+PARSE_FORMATS = ["pandas", "pandas-arrow", "pyarrow", "numpy"]
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def latency_stats(latencies: list[float]) -> dict:
+    """Latencies in seconds, as milliseconds"""
+    return {
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def timed(fn, repeat: int) -> list[float]:
+    latencies = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def bench_roundtrip(quick: bool) -> dict:
+    repeat = 200 if quick else 2000
+
+    with MockTuringDBServer(chunk_count=1, rows_per_chunk=1) as server:
+        bare = httpx.Client()
+        client = TuringDB(host=server.url)
+        client.warmup()
+
+        cases = {
+            "httpx": lambda: bare.post(f"{server.url}/list_avail_graphs").content,
+            "send_request": lambda: client._send_request("list_avail_graphs"),
+            "query_raw": lambda: client.query("MATCH (n) RETURN n", raw=True),
+            "query_pandas": lambda: client.query("MATCH (n) RETURN n"),
+        }
+
+        results = {}
+        for name, fn in cases.items():
+            timed(fn, repeat // 10)
+            results[name] = latency_stats(timed(fn, repeat))
+
+        bare.close()
+
+    baseline = results["httpx"]["mean_ms"]
+    for name, stats in results.items():
+        stats["overhead_ms"] = stats["mean_ms"] - baseline
+
+    return {"repeat": repeat, "results": results}
+
+
+def _parse_case(types: list[str], chunks: int, rows: int, result_format: str, repeat: int):
+    """Runs in a fresh process, so that its peak RSS is its own"""
+    import resource
+
+    # Decoded from bytes, like the responses
+    json = orjson.loads(orjson.dumps(make_response(types, chunks, rows)))
+    client = TuringDB()
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    elapsed = min(
+        timed(lambda: client._parse_chunks(json, result_format=result_format), repeat)
+    )
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return {
+        "rows": chunks * rows,
+        "seconds": elapsed,
+        "rows_per_sec": chunks * rows / elapsed,
+        "peak_rss_mb": peak_kib / 1024,
+        "parse_rss_mb": (peak_kib - baseline_kib) / 1024,
+    }
+
+
+def bench_parse(quick: bool) -> dict:
+    repeat = 1 if quick else 5
+    scale = 10 if quick else 1
+    context = multiprocessing.get_context("spawn")
+
+    results = []
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for name, types, chunks, rows in PARSE_CASES:
+            for result_format in PARSE_FORMATS:
+                args = (types, chunks // scale, rows, result_format, repeat)
+                result = pool.apply(_parse_case, args)
+                results.append({"case": name, "result_format": result_format, **result})
+
+    return {"repeat": repeat, "results": results}
+
+
+def bench_s3(quick: bool, endpoint: str | None) -> dict:
+    import boto3
+
+    moto_server = None
+    if endpoint is None:
+        from moto.server import ThreadedMotoServer
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        moto_server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+        moto_server.start()
+        host, port = moto_server.get_host_and_port()
+        endpoint = f"http://{host}:{port}"
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    os.environ["AWS_ENDPOINT_URL"] = endpoint
+    os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+    bucket = "turingdb-bench"
+    boto3.client("s3").create_bucket(Bucket=bucket)
+
+    sizes_mb = [8, 64] if quick else [8, 64, 256]
+    results = []
+
+    try:
+        with MockTuringDBServer() as server, tempfile.TemporaryDirectory() as tmp:
+            client = TuringDB(host=server.url)
+            client.s3_connect(bucket, multipart_threshold=8 * MiB, multipart_chunksize=8 * MiB)
+
+            for size_mb in sizes_mb:
+                path = os.path.join(tmp, f"file-{size_mb}.bin")
+                with open(path, "wb") as f:
+                    f.write(os.urandom(size_mb * MiB))
+
+                for direction, src, dst in [
+                    ("upload", path, f"s3://bench/file-{size_mb}.bin"),
+                    ("download", f"s3://bench/file-{size_mb}.bin", path + ".out"),
+                ]:
+                    stats = client.transfer(src, dst, skip_unchanged=False)
+                    results.append({
+                        "direction": direction,
+                        "files": stats.files,
+                        "size_mb": size_mb,
+                        "seconds": stats.elapsed,
+                        "mb_per_sec": (stats.throughput or 0) / MiB,
+                    })
+
+            small = os.path.join(tmp, "small")
+            os.makedirs(small)
+            file_count = 50 if quick else 500
+            for i in range(file_count):
+                with open(os.path.join(small, f"{i}.csv"), "wb") as f:
+                    f.write(os.urandom(64 * 1024))
+
+            stats = client.transfer(small, "s3://bench/small/", skip_unchanged=False)
+            results.append({
+                "direction": "upload",
+                "files": stats.files,
+                "size_mb": (stats.bytes_transferred or 0) / MiB,
+                "seconds": stats.elapsed,
+                "mb_per_sec": (stats.throughput or 0) / MiB,
+            })
+    finally:
+        if moto_server is not None:
+            moto_server.stop()
+
+    return {"endpoint": endpoint if moto_server is None else "moto", "results": results}
+
+
+def bench_scaling(quick: bool) -> dict:
+    queries = 500 if quick else 5000
+    levels = [1, 2, 4, 8, 16, 32]
+    results = []
+
+    with MockTuringDBServer(chunk_count=1, rows_per_chunk=100) as server:
+        client = TuringDB(host=server.url)
+        client.warmup()
+
+        for threads in levels:
+            latencies: list[float] = []
+            lock = threading.Lock()
+
+            def worker(count: int):
+                # DataFrames, like the results of gather_queries()
+                mine = timed(lambda: client.query("MATCH (n) RETURN n"), count)
+                with lock:
+                    latencies.extend(mine)
+
+            t0 = time.perf_counter()
+            workers = [
+                threading.Thread(target=worker, args=(queries // threads,))
+                for _ in range(threads)
+            ]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            elapsed = time.perf_counter() - t0
+
+            results.append({
+                "client": "threads",
+                "concurrency": threads,
+                "queries_per_sec": len(latencies) / elapsed,
+                **latency_stats(latencies),
+            })
+
+        async def gather(concurrency: int) -> float:
+            async with AsyncTuringDB(host=server.url) as async_client:
+                await async_client.warmup()
+                t0 = time.perf_counter()
+                await async_client.gather_queries(
+                    ["MATCH (n) RETURN n"] * queries, max_concurrency=concurrency
+                )
+                return time.perf_counter() - t0
+
+        for concurrency in levels:
+            elapsed = asyncio.run(gather(concurrency))
+            results.append({
+                "client": "async",
+                "concurrency": concurrency,
+                "queries_per_sec": queries / elapsed,
+            })
+
+    return {"queries": queries, "results": results}
+
+
+def environment() -> dict:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        sdk_version = version("turingdb")
+    except PackageNotFoundError:
+        sdk_version = None
+
+    return {
+        "sdk_version": sdk_version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "date": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", default=",".join(BENCHMARKS))
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--s3-endpoint", default=None)
+    args = parser.parse_args()
+
+    report = {"environment": environment(), "quick": args.quick, "benchmarks": {}}
+
+    for name in args.only.split(","):
+        if name not in BENCHMARKS:
+            parser.error(f"Unknown benchmark {name}, expected one of {', '.join(BENCHMARKS)}")
+
+        print(f"Running {name}...", flush=True)
+        t0 = time.perf_counter()
+
+        match name:
+            case "roundtrip":
+                result = bench_roundtrip(args.quick)
+            case "parse":
+                result = bench_parse(args.quick)
+            case "s3":
+                result = bench_s3(args.quick, args.s3_endpoint)
+            case _:
+                result = bench_scaling(args.quick)
+
+        report["benchmarks"][name] = result
+        print(f"  done in {time.perf_counter() - t0:.1f}s")
+
+    with open(args.output, "wb") as f:
+        f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+
+    print(f"Results written to {args.output}")
@@ -0,0 +1,309 @@
+"""
+Local stand-in for the TuringDB SDK endpoints
+
+Answers every query with a synthetic result of configurable chunk count,
+rows per chunk and column types. Query results are encoded as JSON, or as
+an Arrow IPC stream when the request accepts it and pyarrow is installed.
+Bodies are compressed with gzip or zstd when the request accepts it, and
+compressed request bodies are decoded. bytes_received and bytes_sent count
+the bytes on the wire.
+
+Faults can be injected: a fail_rate share of the requests is answered with
+fail_status, with a Retry-After header when retry_after is set, and a
+slow_rate share is delayed by slow_delay seconds. Requests to
+missing_endpoints are answered with 404, as by servers without them.
+
+Usage: python benchmarks/mock_server.py [--port 6666] [--chunks N] [--rows-per-chunk N]
+       [--fail-rate 0.05] [--slow-rate 0.05] [--slow-delay 0.5]
+"""
+
+import argparse
+import io
+import random
+import threading
+import time
+from collections.abc import Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import orjson
+
+from turingdb.wire import ARROW_STREAM_MEDIA_TYPE, JSON_MEDIA_TYPE
+
+DEFAULT_COLUMN_TYPES = ["Int64", "String", "Double", "Bool"]
+
+
+def make_column(ctype: str, offset: int, rows: int) -> list:
+    match ctype:
+        case "Int64" | "UInt64":
+            return list(range(offset, offset + rows))
+        case "Double":
+            return [i * 0.5 for i in range(offset, offset + rows)]
+        case "Bool":
+            return [i % 2 == 0 for i in range(offset, offset + rows)]
+        case _:
+            return [f"value-{i}" for i in range(offset, offset + rows)]
+
+
+def make_response(column_types: list[str], chunk_count: int, rows_per_chunk: int) -> dict:
+    """Query result of chunk_count chunks of rows_per_chunk rows"""
+    return {
+        "header": {
+            "column_names": [f"col{i}" for i in range(len(column_types))],
+            "column_types": column_types,
+        },
+        "data": [
+            [
+                make_column(ctype, i * rows_per_chunk, rows_per_chunk)
+                for ctype in column_types
+            ]
+            for i in range(chunk_count)
+        ],
+        "time": 0.1,
+    }
+
+
+class MockTuringDBServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chunk_count: int = 1,
+        rows_per_chunk: int = 100,
+        column_types: list[str] | None = None,
+        arrow: bool = True,
+        fail_rate: float = 0.0,
+        fail_status: int = 502,
+        retry_after: int | None = None,
+        slow_rate: float = 0.0,
+        slow_delay: float = 0.5,
+        seed: int | None = None,
+        missing_endpoints: Iterable[str] = (),
+    ):
+        self.chunk_count = chunk_count
+        self.rows_per_chunk = rows_per_chunk
+        self.column_types = column_types or DEFAULT_COLUMN_TYPES
+        self.column_names = [f"col{i}" for i in range(len(self.column_types))]
+        self.arrow = arrow
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.missing_endpoints = set(missing_endpoints)
+        self.request_count = 0
+        self.failed_count = 0
+        self.slow_count = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+        self._json_body: bytes | None = None
+        self._arrow_body: bytes | None = None
+        self._encoded: dict[tuple[int, str], bytes] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def chunks(self) -> list[list[list]]:
+        return make_response(self.column_types, self.chunk_count, self.rows_per_chunk)["data"]
+
+    def json_body(self) -> bytes:
+        if self._json_body is None:
+            self._json_body = orjson.dumps(
+                make_response(self.column_types, self.chunk_count, self.rows_per_chunk)
+            )
+
+        return self._json_body
+
+    def arrow_body(self) -> bytes:
+        import pyarrow as pa
+
+        from turingdb.results import ResultBuilder
+
+        if self._arrow_body is None:
+            sink = io.BytesIO()
+            schema = None
+
+            for chunk in self.chunks():
+                builder = ResultBuilder(self.column_names, self.column_types)
+                builder.add_chunk(chunk)
+                batch = builder.build_record_batch()
+
+                if schema is None:
+                    schema = batch.schema.with_metadata({"time": "0.1"})
+                    writer = pa.ipc.new_stream(sink, schema)
+
+                writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+
+            if schema is not None:
+                writer.close()
+
+            self._arrow_body = sink.getvalue()
+
+        return self._arrow_body
+
+    def handle(self, path: str, body: bytes, accept: str) -> tuple[str, bytes]:
+        match path:
+            case "list_avail_graphs":
+                return JSON_MEDIA_TYPE, orjson.dumps({"data": ["default"]})
+            case "list_loaded_graphs":
+                return JSON_MEDIA_TYPE, orjson.dumps({"data": [[["default"]]]})
+            case "is_graph_loaded":
+                return JSON_MEDIA_TYPE, orjson.dumps({"data": True})
+            case "load_graph":
+                return JSON_MEDIA_TYPE, orjson.dumps({"error": "GRAPH_ALREADY_EXISTS"})
+            case "query":
+                if self.arrow and self.chunk_count > 0 and ARROW_STREAM_MEDIA_TYPE in accept:
+                    return ARROW_STREAM_MEDIA_TYPE, self.arrow_body()
+                return JSON_MEDIA_TYPE, self.json_body()
+
+        return JSON_MEDIA_TYPE, orjson.dumps({"error": "UNKNOWN_ENDPOINT"})
+
+    def fault(self) -> tuple[bool, bool]:
+        """Whether the next request fails, and whether it is slow"""
+        with self._lock:
+            fail = self._random.random() < self.fail_rate
+            slow = self._random.random() < self.slow_rate
+            self.failed_count += fail
+            self.slow_count += slow
+
+        return fail, slow
+
+    def encode(self, payload: bytes, accept_encoding: str) -> tuple[str | None, bytes]:
+        """Compresses a body with the first encoding accepted by the client"""
+        from turingdb.compression import compress
+
+        accepted = [e.split(";")[0].strip() for e in accept_encoding.split(",")]
+        encoding = next((e for e in accepted if e in ("zstd", "gzip")), None)
+
+        if encoding is None:
+            return None, payload
+
+        if payload is not self._json_body and payload is not self._arrow_body:
+            return encoding, compress(payload, encoding)  # type: ignore[arg-type]
+
+        # Query results are reused, encode them once
+        key = (id(payload), encoding)
+        if key not in self._encoded:
+            self._encoded[key] = compress(payload, encoding)  # type: ignore[arg-type]
+
+        return encoding, self._encoded[key]
+
+    @staticmethod
+    def decode(body: bytes, content_encoding: str | None) -> bytes:
+        match content_encoding:
+            case "gzip":
+                import gzip
+
+                return gzip.decompress(body)
+            case "zstd":
+                import zstandard
+
+                return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+        return body
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                path = urlparse(self.path).path.rsplit("/", 1)[-1]
+
+                fail, slow = server.fault()
+                if slow:
+                    time.sleep(server.slow_delay)
+                if fail or path in server.missing_endpoints:
+                    with server._lock:
+                        server.request_count += 1
+                        server.bytes_received += len(body)
+                    self.send_response(server.fail_status if fail else 404)
+                    if fail and server.retry_after is not None:
+                        self.send_header("Retry-After", str(server.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                content_type, payload = server.handle(
+                    path,
+                    server.decode(body, self.headers.get("Content-Encoding")),
+                    self.headers.get("Accept", ""),
+                )
+                encoding, payload = server.encode(
+                    payload, self.headers.get("Accept-Encoding", "")
+                )
+
+                with server._lock:
+                    server.request_count += 1
+                    server.bytes_received += len(body)
+                    server.bytes_sent += len(payload)
+
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                if encoding is not None:
+                    self.send_header("Content-Encoding", encoding)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up, e.g. on the losing side of a hedge
+                    pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=6666)
+    parser.add_argument("--chunks", type=int, default=1)
+    parser.add_argument("--rows-per-chunk", type=int, default=100)
+    parser.add_argument("--no-arrow", action="store_true")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = MockTuringDBServer(
+        port=args.port,
+        chunk_count=args.chunks,
+        rows_per_chunk=args.rows_per_chunk,
+        arrow=not args.no_arrow,
+        fail_rate=args.fail_rate,
+        slow_rate=args.slow_rate,
+        slow_delay=args.slow_delay,
+    )
+
+    print(f"Serving on {server.url}")
+    server._server.serve_forever()
@@ -26,6 +26,8 @@ if __name__ == "__main__":
 
     print(f"Created graph in {(time.time() - t0) * 1000:.2f} milliseconds")
 
+    queries = []
+
     for i in range(1, 13):
         station_count = i
         stations_path = ""
@@ -36,8 +38,10 @@ if __name__ == "__main__":
             stations_return += f", s{j}, s{j}.displayName"
 
         query = f'MATCH (start:Station{{displayName:"Paddington"}}){stations_path}--(end:Station{{displayName:"Blackfriars"}}) RETURN start, start.displayName{stations_return}, end, end.displayName'
-        res = client.query(query)
+        queries.append(query)
 
-        total_time = client.get_total_exec_time()
-        query_time = client.get_query_exec_time()
+    for station_count, batch_result in enumerate(client.query_batch(queries), start=1):
+        res = batch_result.result
+        total_time = batch_result.timing.total_exec_time
+        query_time = batch_result.timing.query_exec_time
         print(f"- {station_count} stations: Result={res.shape} Total={total_time:.2f} ms Query={query_time:.2f} ms")
@@ -1,4 +1,84 @@
+import sys
+from types import ModuleType
+from typing import TYPE_CHECKING
+
 from .turingdb import TuringDB, TuringDBException
-from .turingsh import main as turingsh
 
-__all__ = ["TuringDB", "TuringDBException", "turingsh"]
+if TYPE_CHECKING:
+    from .async_turingdb import AsyncTuringDB
+    from .batch import BatchResult
+    from .bulk import BulkStats, BulkWriter
+    from .cache import DiskResultCache, ResultCache
+    from .observers import OpenTelemetryObserver, PrometheusObserver, QueryObserver
+    from .retry import HedgePolicy, RetryPolicy
+    from .s3 import TransferStats
+    from .session import Session
+    from .timing import QueryTiming
+    from .turingsh import main as turingsh
+
+# Imported on first use: the shell pulls in click and prompt_toolkit, the
+# async client asyncio, and the others dataclasses, logging or json, which
+# short-lived jobs that only query would load for nothing
+_LAZY_ATTRIBUTES = {
+    "AsyncTuringDB": (".async_turingdb", "AsyncTuringDB"),
+    "BatchResult": (".batch", "BatchResult"),
+    "BulkStats": (".bulk", "BulkStats"),
+    "BulkWriter": (".bulk", "BulkWriter"),
+    "DiskResultCache": (".cache", "DiskResultCache"),
+    "HedgePolicy": (".retry", "HedgePolicy"),
+    "OpenTelemetryObserver": (".observers", "OpenTelemetryObserver"),
+    "PrometheusObserver": (".observers", "PrometheusObserver"),
+    "QueryObserver": (".observers", "QueryObserver"),
+    "QueryTiming": (".timing", "QueryTiming"),
+    "ResultCache": (".cache", "ResultCache"),
+    "RetryPolicy": (".retry", "RetryPolicy"),
+    "Session": (".session", "Session"),
+    "TransferStats": (".s3", "TransferStats"),
+    "turingsh": (".turingsh", "main"),
+}
+
+__all__ = [
+    "AsyncTuringDB",
+    "BatchResult",
+    "BulkStats",
+    "BulkWriter",
+    "DiskResultCache",
+    "HedgePolicy",
+    "OpenTelemetryObserver",
+    "PrometheusObserver",
+    "QueryObserver",
+    "QueryTiming",
+    "ResultCache",
+    "RetryPolicy",
+    "Session",
+    "TransferStats",
+    "TuringDB",
+    "TuringDBException",
+    "turingsh",
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+
+        module, attribute = _LAZY_ATTRIBUTES[name]
+        value = getattr(importlib.import_module(module, __name__), attribute)
+
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _Package(ModuleType):
+    def __setattr__(self, name: str, value):
+        # Importing the turingsh subpackage binds its module to the package,
+        # turingdb.turingsh stays the shell's entry point
+        if name == "turingsh" and isinstance(value, ModuleType):
+            return
+
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
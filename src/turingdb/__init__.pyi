@@ -1,4 +1,17 @@
+from .async_turingdb import AsyncTuringDB as AsyncTuringDB
+from .batch import BatchResult as BatchResult
+from .bulk import BulkStats as BulkStats, BulkWriter as BulkWriter
+from .cache import DiskResultCache as DiskResultCache, ResultCache as ResultCache
+from .observers import OpenTelemetryObserver as OpenTelemetryObserver, PrometheusObserver as PrometheusObserver, QueryObserver as QueryObserver
+from .retry import HedgePolicy as HedgePolicy, RetryPolicy as RetryPolicy
+from .s3 import TransferStats as TransferStats
+from .session import Session as Session
+from .timing import QueryTiming as QueryTiming
 from .turingdb import TuringDB as TuringDB, TuringDBException as TuringDBException
 from .turingsh import main as turingsh
+from types import ModuleType
 
-__all__ = ['TuringDB', 'TuringDBException', 'turingsh']
+__all__ = ['AsyncTuringDB', 'BatchResult', 'BulkStats', 'BulkWriter', 'DiskResultCache', 'HedgePolicy', 'OpenTelemetryObserver', 'PrometheusObserver', 'QueryObserver', 'QueryTiming', 'ResultCache', 'RetryPolicy', 'Session', 'TransferStats', 'TuringDB', 'TuringDBException', 'turingsh']
+
+class _Package(ModuleType):
+    def __setattr__(self, name: str, value): ...
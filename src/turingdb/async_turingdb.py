@@ -0,0 +1,488 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Mapping, Optional
+
+from .base import TuringDBBase
+from .compression import Compression
+from .cypher import (
+    check_identifier,
+    check_pageable,
+    page_query,
+    render_query,
+)
+from .exceptions import TuringDBException
+from .path import MiB
+from .results import ResultFormat, result_row_count
+from .wire import WireFormat
+
+if TYPE_CHECKING:
+    from .batch import BatchQuery
+    from .cache import DiskResultCache, ResultCache
+    from .observers import QueryObserver
+    from .retry import HedgePolicy, RetryPolicy
+    from .s3 import ScratchCleanup, TransferStats
+    from .timing import QueryTiming
+
+
+class _BlockingQueryAdapter:
+    """
+    Exposes the async client as a blocking QueryProtocol so that the
+    S3 client can run its queries from a worker thread
+    """
+
+    def __init__(self, client: "AsyncTuringDB", loop: asyncio.AbstractEventLoop):
+        self._client = client
+        self._loop = loop
+
+    def query(self, query: str):
+        future = asyncio.run_coroutine_threadsafe(self._client.query(query), self._loop)
+        return future.result()
+
+
+class AsyncTuringDB(TuringDBBase):
+    def __init__(
+        self,
+        instance_id: str = "",
+        auth_token: str = "",
+        host: str = "https://engines.turingdb.ai/sdk",
+        timeout: Optional[int] = None,
+        result_format: ResultFormat = "pandas",
+        wire_format: WireFormat = "json",
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        result_cache: Optional["ResultCache"] = None,
+        disk_cache: Optional["DiskResultCache"] = None,
+        compression: Optional[Compression] = None,
+        compress_requests_over: Optional[int] = None,
+        retry: Optional["RetryPolicy"] = None,
+        hedge: Optional["HedgePolicy"] = None,
+        observers: Optional[Iterable["QueryObserver"]] = None,
+    ):
+        import httpx
+
+        super().__init__(
+            instance_id=instance_id,
+            auth_token=auth_token,
+            host=host,
+            timeout=timeout,
+            result_format=result_format,
+            wire_format=wire_format,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            result_cache=result_cache,
+            disk_cache=disk_cache,
+            compression=compression,
+            compress_requests_over=compress_requests_over,
+            retry=retry,
+            hedge=hedge,
+            observers=observers,
+        )
+
+        self._client = httpx.AsyncClient(**self._client_options())
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def try_reach(self, timeout: int = 5):
+        await self._send_request("list_avail_graphs", timeout=timeout)
+
+    async def warmup(self, timeout: int = 5):
+        await self._query("LIST GRAPH", self._params, timeout=timeout)
+
+    async def prepare(
+        self,
+        graphs: Iterable[str] = (),
+        connections: int = 1,
+        timeout: float = 300.0,
+        poll_interval: float = 0.05,
+    ):
+        """See TuringDB.prepare()"""
+
+        deadline = time.monotonic() + timeout
+        connections = self._warm_connection_count(connections)
+
+        # Each connection is held until all are open, so that none is reused
+        responses = await asyncio.gather(
+            *(self._open_connection() for _ in range(connections)),
+            return_exceptions=True,
+        )
+        for response in responses:
+            if not isinstance(response, BaseException):
+                await response.aclose()
+        for response in responses:
+            if isinstance(response, BaseException):
+                raise response
+
+        await asyncio.gather(
+            *(self._load_and_wait(graph, deadline, poll_interval) for graph in graphs)
+        )
+
+    async def list_available_graphs(self) -> list[str]:
+        return (await self._send_request("list_avail_graphs", idempotent=True))["data"]
+
+    async def list_loaded_graphs(self) -> list[str]:
+        return (await self._send_request("list_loaded_graphs", idempotent=True))["data"][0][0]
+
+    async def is_graph_loaded(self) -> bool:
+        return await self._is_graph_loaded(self.get_graph())
+
+    async def load_graph(self, graph_name: str, raise_if_loaded: bool = True):
+        try:
+            return await self._send_request("load_graph", params={"graph": graph_name})
+        except TuringDBException as e:
+            if raise_if_loaded or e.__str__() != "GRAPH_ALREADY_EXISTS":
+                raise e
+
+    async def create_graph(self, graph_name: str):
+        check_identifier(graph_name)
+        return await self.query(f"create graph {graph_name}")
+
+    async def query(
+        self,
+        query: str,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ):
+        """See TuringDB.query()"""
+        return (await self.query_timed(query, raw, result_format, params))[0]
+
+    async def query_timed(
+        self,
+        query: str,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> tuple[Any, "QueryTiming"]:
+        """
+        Same as query(), also returns the timing of the request. Tasks
+        sharing the client can use it instead of get_query_exec_time()
+        """
+        query = render_query(query, params)
+        return await self._query(query, self._params, raw, result_format)
+
+    async def iter_query(
+        self,
+        query: str,
+        page_size: int = 100_000,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        commit: Optional[str] = None,
+    ) -> AsyncIterator:
+        """See TuringDB.iter_query()"""
+        query = render_query(query, params)
+
+        if page_size < 1:
+            raise TuringDBException("page_size must be at least 1")
+        check_pageable(query)
+
+        commit = commit or self._params.get("commit") or await self._head_commit()
+        page_params = {**self._params, "commit": commit}
+
+        async def fetch(offset: int):
+            page = page_query(query, offset, page_size)
+            # Pages would fill the caches and evict the results they keep
+            return (
+                await self._query(page, page_params, False, result_format, cache=False)
+            )[0]
+
+        # The next page is fetched while the current one is consumed
+        offset = 0
+        task: Optional[asyncio.Future] = asyncio.ensure_future(fetch(offset))
+
+        try:
+            while task is not None:
+                page = await task
+                rows = result_row_count(page)
+
+                offset += page_size
+                task = asyncio.ensure_future(fetch(offset)) if rows == page_size else None
+
+                if rows > 0:
+                    yield page
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def gather_queries(
+        self, queries: Iterable["BatchQuery"], max_concurrency: int = 8
+    ):
+        """
+        Runs read queries concurrently over the client's connection pool,
+        with at most `max_concurrency` requests in flight.
+        Results are returned in the order of `queries`, which can be
+        (query, params) pairs.
+        """
+
+        from .batch import batch_query_text
+
+        if max_concurrency < 1:
+            raise TuringDBException("max_concurrency must be at least 1")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(query: "BatchQuery"):
+            async with semaphore:
+                return await self.query(batch_query_text(query))
+
+        return await asyncio.gather(*(run(query) for query in queries))
+
+    async def new_change(self) -> int:
+        self._check_can_create_change()
+
+        res = await self.query("CHANGE NEW", raw=True)
+        self._params["change"] = res["changeID"][0]
+        return self._params["change"]
+
+    async def s3_connect(
+        self,
+        bucket_name: str,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        region: Optional[str] = None,
+        use_scratch: bool = True,
+        multipart_threshold: int = 64 * MiB,
+        multipart_chunksize: int = 64 * MiB,
+        max_concurrency: int = 16,
+        progress: Optional[Callable[["TransferStats"], None]] = None,
+        max_files: int = 8,
+        scratch_cleanup: "ScratchCleanup" = "immediate",
+        scratch_expiration_days: Optional[int] = None,
+    ):
+        """
+        Connects the server and this client to an S3 bucket. See S3Client
+        for the transfer options.
+        """
+        from .s3 import S3Client
+
+        adapter = _BlockingQueryAdapter(self, asyncio.get_running_loop())
+
+        self._s3_client = await asyncio.to_thread(
+            S3Client,
+            bucket_name,
+            access_key,
+            secret_key,
+            region,
+            use_scratch,
+            multipart_threshold,
+            multipart_chunksize,
+            max_concurrency,
+            progress,
+            max_files,
+            scratch_cleanup,
+            scratch_expiration_days,
+        )
+        await asyncio.to_thread(self._s3_client.connect, adapter)
+
+    async def transfer(
+        self,
+        src: str,
+        dst: str,
+        skip_unchanged: bool = True,
+        target: Optional["AsyncTuringDB"] = None,
+    ) -> "TransferStats":
+        """See TuringDB.transfer()"""
+        if self._s3_client is None:
+            raise TuringDBException("S3 client is not connected")
+
+        adapter = None
+        if target is not None:
+            adapter = _BlockingQueryAdapter(target, asyncio.get_running_loop())
+
+        return await asyncio.to_thread(
+            self._s3_client.transfer, src, dst, skip_unchanged, adapter
+        )
+
+    async def upload(
+        self,
+        local_path: str,
+        dst: str,
+        chunk_size: int = 8 * MiB,
+        compression: Optional[Compression] = None,
+        resume: bool = True,
+        progress: Optional[Callable[["TransferStats"], None]] = None,
+    ) -> "TransferStats":
+        """
+        Streams a local file to a turingdb:// path without staging it in S3,
+        see TuringDB.upload()
+        """
+        import httpx
+
+        from .upload import Upload
+
+        upload = Upload(
+            local_path, dst, self._headers, chunk_size, compression, resume, progress
+        )
+
+        try:
+            status = await self._send_request(**upload.status_request())
+        except httpx.HTTPStatusError as e:
+            if not upload.is_unsupported(e.response.status_code):
+                raise
+            return await self._upload_fallback(local_path, dst)
+
+        for request in upload.requests(status):
+            await self._send_request(**request)
+
+        return upload.done()
+
+    async def flush_scratch(self):
+        """
+        Waits until scratch objects deleted in the background are gone, and
+        raises a TuringDBException listing the ones that could not be deleted
+        """
+        if self._s3_client is not None:
+            await asyncio.to_thread(self._s3_client.flush_scratch)
+
+    async def _upload_fallback(self, local_path: str, dst: str) -> "TransferStats":
+        if self._s3_client is None:
+            raise TuringDBException(
+                "The server does not accept uploads, connect to S3 with s3_connect() "
+                "to transfer through the bucket"
+            )
+
+        return await self.transfer(local_path, dst)
+
+    async def _open_connection(self):
+        request = self._client.build_request("POST", **self._build_request("list_avail_graphs"))
+        response = await self._client.send(request, stream=True)
+
+        try:
+            response.raise_for_status()
+            # Reads the body without releasing the connection, unlike aread()
+            async for _ in response.stream:
+                pass
+        except BaseException:
+            await response.aclose()
+            raise
+
+        return response
+
+    async def _load_and_wait(self, graph: str, deadline: float, poll_interval: float):
+        await self.load_graph(graph, raise_if_loaded=False)
+        intervals = self._load_poll_intervals(graph, deadline, poll_interval)
+
+        while not await self._is_graph_loaded(graph):
+            await asyncio.sleep(next(intervals))
+
+    async def _head_commit(self) -> str:
+        history = (await self._query("CALL db.history()", self._params, raw=True))[0]
+        return self._parse_history(history, self.get_graph())
+
+    async def _is_graph_loaded(self, graph_name: str) -> bool:
+        return (
+            await self._send_request(
+                "is_graph_loaded", params={"graph": graph_name}, idempotent=True
+            )
+        )["data"]
+
+    async def _send_request(
+        self,
+        path: str,
+        data: Optional[dict | str | bytes] = None,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        timing: Optional["QueryTiming"] = None,
+        idempotent: bool = False,
+    ):
+        request, request_timing = self._start_request(
+            path, data, params, headers, timeout, timing
+        )
+
+        if self._is_resilient(idempotent):
+            result = await self._send_idempotent(request, request_timing)
+        else:
+            result = await self._post(request, request_timing)
+
+        self._finish_request(request_timing, owned=timing is None)
+
+        return result
+
+    async def _send_idempotent(self, request: dict[str, Any], timing: "QueryTiming"):
+        attempt = 0
+
+        while True:
+            timing.attempts = attempt + 1
+
+            try:
+                return await self._post_hedged(request, timing)
+            except Exception as e:
+                if self._retry is None or not self._retry.should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(self._retry.delay(e, attempt))
+                attempt += 1
+
+    async def _post_hedged(self, request: dict[str, Any], timing: "QueryTiming"):
+        delay = self._hedge.hedge_delay() if self._hedge is not None else None
+        if delay is None:
+            return await self._post(request, timing)
+
+        first = asyncio.ensure_future(self._post(request, timing))
+
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        timing.hedged = True
+        pending = {first, asyncio.ensure_future(self._post(request, timing))}
+        error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        assert error is not None
+        raise error
+
+    async def _post(self, request: dict[str, Any], timing: "QueryTiming"):
+        t0 = time.perf_counter()
+        response = await self._client.post(
+            **request, extensions={"trace": timing.async_tracer()}
+        )
+
+        if self._hedge is not None and response.is_success:
+            self._hedge.record(time.perf_counter() - t0)
+
+        return self._parse_response(response, timing)
+
+    async def _query(
+        self,
+        query: str,
+        params: dict,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        timeout: Optional[float] = None,
+        cache: bool = True,
+    ) -> tuple[Any, "QueryTiming"]:
+        entry, cached = self._query_from_cache(query, params, raw, result_format, cache)
+        if cached is not None:
+            return cached
+
+        request = self._query_request(query, params, timeout)
+        try:
+            result = await self._send_request(**request)
+        finally:
+            # Failed writes may have been applied too
+            self._invalidate_unpinned(query, params)
+
+        return self._finish_query(entry, result, request["timing"], raw, result_format)
@@ -0,0 +1,42 @@
+import asyncio
+from .base import TuringDBBase as TuringDBBase
+from .batch import BatchQuery as BatchQuery
+from .cache import DiskResultCache as DiskResultCache, ResultCache as ResultCache
+from .compression import Compression as Compression
+from .cypher import check_identifier as check_identifier, check_pageable as check_pageable, page_query as page_query, render_query as render_query
+from .exceptions import TuringDBException as TuringDBException
+from .observers import QueryObserver as QueryObserver
+from .path import MiB as MiB
+from .results import ResultFormat as ResultFormat, result_row_count as result_row_count
+from .retry import HedgePolicy as HedgePolicy, RetryPolicy as RetryPolicy
+from .s3 import ScratchCleanup as ScratchCleanup, TransferStats as TransferStats
+from .timing import QueryTiming as QueryTiming
+from .wire import WireFormat as WireFormat
+from typing import Any, AsyncIterator, Callable, Iterable, Mapping
+
+class _BlockingQueryAdapter:
+    def __init__(self, client: AsyncTuringDB, loop: asyncio.AbstractEventLoop) -> None: ...
+    def query(self, query: str): ...
+
+class AsyncTuringDB(TuringDBBase):
+    def __init__(self, instance_id: str = '', auth_token: str = '', host: str = 'https://engines.turingdb.ai/sdk', timeout: int | None = None, result_format: ResultFormat = 'pandas', wire_format: WireFormat = 'json', max_connections: int | None = 100, max_keepalive_connections: int | None = 20, keepalive_expiry: float | None = 5.0, http2: bool = False, result_cache: ResultCache | None = None, disk_cache: DiskResultCache | None = None, compression: Compression | None = None, compress_requests_over: int | None = None, retry: RetryPolicy | None = None, hedge: HedgePolicy | None = None, observers: Iterable['QueryObserver'] | None = None) -> None: ...
+    async def __aenter__(self): ...
+    async def __aexit__(self, *exc_info) -> None: ...
+    async def aclose(self) -> None: ...
+    async def try_reach(self, timeout: int = 5): ...
+    async def warmup(self, timeout: int = 5): ...
+    async def prepare(self, graphs: Iterable[str] = (), connections: int = 1, timeout: float = 300.0, poll_interval: float = 0.05): ...
+    async def list_available_graphs(self) -> list[str]: ...
+    async def list_loaded_graphs(self) -> list[str]: ...
+    async def is_graph_loaded(self) -> bool: ...
+    async def load_graph(self, graph_name: str, raise_if_loaded: bool = True): ...
+    async def create_graph(self, graph_name: str): ...
+    async def query(self, query: str, raw: bool = False, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None): ...
+    async def query_timed(self, query: str, raw: bool = False, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None) -> tuple[Any, 'QueryTiming']: ...
+    async def iter_query(self, query: str, page_size: int = 100000, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None, commit: str | None = None) -> AsyncIterator: ...
+    async def gather_queries(self, queries: Iterable['BatchQuery'], max_concurrency: int = 8): ...
+    async def new_change(self) -> int: ...
+    async def s3_connect(self, bucket_name: str, access_key: str | None = None, secret_key: str | None = None, region: str | None = None, use_scratch: bool = True, multipart_threshold: int = ..., multipart_chunksize: int = ..., max_concurrency: int = 16, progress: Callable[[TransferStats], None] | None = None, max_files: int = 8, scratch_cleanup: ScratchCleanup = 'immediate', scratch_expiration_days: int | None = None): ...
+    async def transfer(self, src: str, dst: str, skip_unchanged: bool = True, target: AsyncTuringDB | None = None) -> TransferStats: ...
+    async def upload(self, local_path: str, dst: str, chunk_size: int = ..., compression: Compression | None = None, resume: bool = True, progress: Callable[[TransferStats], None] | None = None) -> TransferStats: ...
+    async def flush_scratch(self) -> None: ...
@@ -0,0 +1,584 @@
+import contextvars
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Literal, Optional
+
+from .compression import Compression, accept_encoding, check_compression, compress
+from .cypher import is_read_query, redact_query
+from .exceptions import TuringDBException
+from .results import (
+    ResultBuilder,
+    ResultFormat,
+    arrow_table_to_format,
+    check_result_format,
+)
+from .wire import (
+    ArrowResult,
+    WireFormat,
+    accept_header,
+    check_wire_format,
+    decode_arrow_stream,
+    is_arrow_response,
+)
+
+if TYPE_CHECKING:
+    from .cache import CacheEntry, DiskResultCache, ResultCache
+    from .observers import QueryObserver
+    from .retry import HedgePolicy, RetryPolicy
+    from .s3 import S3Client
+    from .timing import QueryTiming
+
+# Last timing of each client, per thread and per asyncio task. Contexts keep
+# their variables forever, so all clients share one
+_last_timings: contextvars.ContextVar[
+    Optional["weakref.WeakKeyDictionary[TuringDBBase, QueryTiming]"]
+] = contextvars.ContextVar("turingdb_last_timings", default=None)
+
+
+class TuringDBBase:
+    """
+    State, request building and response parsing shared by the
+    synchronous and asynchronous clients
+    """
+
+    DEFAULT_HEADERS = {
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+
+    _client: Any
+
+    def __init__(
+        self,
+        instance_id: str = "",
+        auth_token: str = "",
+        host: str = "https://engines.turingdb.ai/sdk",
+        timeout: Optional[int] = None,
+        result_format: ResultFormat = "pandas",
+        wire_format: WireFormat = "json",
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        result_cache: Optional["ResultCache"] = None,
+        disk_cache: Optional["DiskResultCache"] = None,
+        compression: Optional[Compression] = None,
+        compress_requests_over: Optional[int] = None,
+        retry: Optional["RetryPolicy"] = None,
+        hedge: Optional["HedgePolicy"] = None,
+        observers: Optional[Iterable["QueryObserver"]] = None,
+    ):
+        import copy
+
+        check_result_format(result_format)
+        check_wire_format(wire_format)
+        check_compression(compression)
+
+        self.host = host
+        self._s3_client: Optional["S3Client"] = None
+        self._timeout = timeout
+        self._result_format = result_format
+        self._http2 = http2
+        self._result_cache = result_cache
+        self._disk_cache = disk_cache
+        self._compression = compression
+        self._compress_requests_over = compress_requests_over
+        # Only applied to idempotent requests
+        self._retry = retry
+        self._hedge = hedge
+        self._observers = list(observers or [])
+        self._limits = {
+            "max_connections": max_connections,
+            "max_keepalive_connections": max_keepalive_connections,
+            "keepalive_expiry": keepalive_expiry,
+        }
+
+        self._params = {
+            "graph": "default",
+        }
+
+        self._headers = copy.deepcopy(TuringDBBase.DEFAULT_HEADERS)
+
+        if instance_id != "":
+            self._headers["Turing-Instance-Id"] = instance_id
+
+        if auth_token != "":
+            self._headers["Authorization"] = f"Bearer {auth_token}"
+
+        if compression is not None:
+            self._headers["Accept-Encoding"] = accept_encoding(compression)
+
+        # Query requests negotiate the wire format, other endpoints are JSON only
+        self._query_headers = {**self._headers, "Accept": accept_header(wire_format)}
+
+    def set_commit(self, commit: str):
+        self._params["commit"] = commit
+
+    def set_change(self, change: int | str):
+        if isinstance(change, int):
+            change = f"{change:x}"
+        self._params["change"] = change
+
+    def checkout(self, change: int | Literal["main"] = "main", commit: str = "HEAD"):
+        if change == "main":
+            if "change" in self._params:
+                del self._params["change"]
+        else:
+            self.set_change(change)
+
+        if commit == "HEAD":
+            if "commit" in self._params:
+                del self._params["commit"]
+        else:
+            self.set_commit(commit)
+
+    def set_graph(self, graph_name: str):
+        self._params["graph"] = graph_name
+
+    def get_graph(self) -> str:
+        return self._params["graph"]
+
+    def get_query_exec_time(self) -> Optional[float]:
+        """Server execution time of the last query sent by this thread or task"""
+        timing = self._last_timing()
+        return timing.query_exec_time if timing is not None else None
+
+    def get_total_exec_time(self) -> Optional[float]:
+        """Total execution time of the last request sent by this thread or task"""
+        timing = self._last_timing()
+        return timing.total_exec_time if timing is not None else None
+
+    def pool_stats(self) -> dict[str, Any]:
+        """
+        Snapshot of the client's connection pool, for export to metrics.
+        `requests` counts the requests in flight, `queued_requests` the ones
+        still waiting for a connection.
+        """
+
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        requests = list(getattr(pool, "_requests", []))
+
+        return {
+            **self._limits,
+            "http2": self._http2,
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "active_connections": sum(1 for c in connections if not c.is_idle()),
+            "http2_connections": sum(1 for c in connections if "HTTP/2" in c.info()),
+            "requests": len(requests),
+            "queued_requests": sum(
+                1 for r in requests if getattr(r, "connection", None) is None
+            ),
+        }
+
+    @property
+    def result_cache(self) -> Optional["ResultCache"]:
+        return self._result_cache
+
+    @property
+    def disk_cache(self) -> Optional["DiskResultCache"]:
+        return self._disk_cache
+
+    @property
+    def current_graph(self) -> str:
+        return self._params["graph"]
+
+    @property
+    def current_commit(self) -> str:
+        return self._params.get("commit") or "HEAD"
+
+    @property
+    def current_change(self) -> str:
+        return self._params.get("change") or "main"
+
+    def _check_can_create_change(self, params: Optional[dict] = None):
+        params = params if params is not None else self._params
+
+        if params.get("change") is not None:
+            raise TuringDBException("Cannot create a new change while working on one")
+
+        if params.get("commit") is not None:
+            raise TuringDBException("Cannot create a new change while working on a commit")
+
+    def _cache_entry(
+        self,
+        query: str,
+        params: dict,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ) -> Optional["CacheEntry"]:
+        """Where to cache the result of a query, None if it cannot be cached"""
+        from .cache import CacheEntry
+
+        if self._result_cache is None and self._disk_cache is None:
+            return None
+
+        if not is_read_query(query):
+            return None
+
+        commit = params.get("commit") or "HEAD"
+        change = params.get("change") or "main"
+
+        ttl = None
+        if commit == "HEAD" or change != "main":
+            # The result can change with every commit
+            if self._result_cache is None or self._result_cache.unpinned_ttl is None:
+                return None
+            ttl = self._result_cache.unpinned_ttl
+
+        key = (
+            self.host,
+            self._headers.get("Turing-Instance-Id"),
+            params.get("graph"),
+            change,
+            commit,
+            query,
+        )
+
+        return CacheEntry(key, "raw" if raw else result_format or self._result_format, ttl)
+
+    def _query_from_cache(
+        self,
+        query: str,
+        params: dict,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        cache: bool = True,
+    ) -> tuple[Optional["CacheEntry"], Optional[tuple[Any, "QueryTiming"]]]:
+        """
+        Cache entry of a query and its cached result and timing, which the
+        clients return instead of sending the query when it is not None
+        """
+
+        entry = self._cache_entry(query, params, raw, result_format) if cache else None
+        cached = self._cached_result(entry, raw, result_format)
+
+        if cached is not None:
+            cached[1].query = redact_query(query)
+            self._notify(cached[1])
+
+        return entry, cached
+
+    def _query_request(
+        self, query: str, params: dict, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
+        """Arguments of _send_request() for a query"""
+        from .timing import QueryTiming
+
+        return {
+            "path": "query",
+            "data": query,
+            "params": params,
+            "headers": self._query_headers,
+            "timeout": timeout,
+            "timing": QueryTiming(query=redact_query(query)),
+            "idempotent": is_read_query(query),
+        }
+
+    def _finish_query(
+        self,
+        entry: Optional["CacheEntry"],
+        result,
+        timing: "QueryTiming",
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ) -> tuple[Any, "QueryTiming"]:
+        """Caches and parses the result of a query sent by a client"""
+
+        result = self._persist_result(entry, result)
+        data = self._parse_query_result(result, timing, raw, result_format)
+        self._store_result(entry, data)
+        self._notify(timing)
+
+        return data, timing
+
+    def _cached_result(
+        self,
+        entry: Optional["CacheEntry"],
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ) -> Optional[tuple[Any, "QueryTiming"]]:
+        from .timing import QueryTiming
+
+        if entry is None:
+            return None
+
+        timing = QueryTiming(cached=True, endpoint="query")
+        data = None
+
+        if self._result_cache is not None:
+            data = self._result_cache.get(entry.memory_key)
+
+        if data is None and entry.pinned and self._disk_cache is not None:
+            table = self._disk_cache.get(entry.key)
+            if table is not None:
+                data = self._parse_arrow(ArrowResult(table), raw, result_format)
+                self._store_result(entry, data)
+
+        if data is None:
+            return None
+
+        self._record_timing(timing)
+        timing.stop()
+
+        return data, timing
+
+    def _persist_result(self, entry: Optional["CacheEntry"], result):
+        """
+        Writes the result of a query on a commit to the disk cache, and
+        returns it as an ArrowResult
+        """
+
+        if entry is None or not entry.pinned or self._disk_cache is None:
+            return result
+
+        if isinstance(result, dict):
+            import pyarrow as pa
+
+            header = result["header"]
+            builder = ResultBuilder(header["column_names"], header["column_types"])
+
+            for chunk in result["data"]:
+                builder.add_chunk(chunk)
+
+            try:
+                table = builder.build_arrow_table()
+            except pa.ArrowException:
+                # e.g. mixed values in a column of unknown type, left uncached
+                return result
+            if result.get("time") is not None:
+                table = table.replace_schema_metadata({"time": str(result["time"])})
+
+            result = ArrowResult(table)
+
+        if isinstance(result, ArrowResult):
+            self._disk_cache.put(entry.key, result.table)
+
+        return result
+
+    def _invalidate_unpinned(self, query: str, params: dict):
+        """Writes make the cached results of HEAD and of the changes stale"""
+
+        if self._result_cache is None or is_read_query(query):
+            return
+
+        self._result_cache.invalidate_unpinned(
+            (self.host, self._headers.get("Turing-Instance-Id"), params.get("graph"))
+        )
+
+    def _store_result(self, entry: Optional["CacheEntry"], data):
+        if entry is not None and self._result_cache is not None:
+            self._result_cache.put(entry.memory_key, data, entry.ttl)
+
+    def _start_request(
+        self,
+        path: str,
+        data: Optional[dict | str | bytes] = None,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        timing: Optional["QueryTiming"] = None,
+    ) -> tuple[dict[str, Any], "QueryTiming"]:
+        """Arguments of the request to `path`, and its timing"""
+        from .timing import QueryTiming
+
+        if timing is None:
+            timing = QueryTiming()
+        timing.endpoint = path
+        self._record_timing(timing)
+
+        return self._build_request(path, data, params, headers, timeout), timing
+
+    def _finish_request(self, timing: "QueryTiming", owned: bool):
+        timing.stop()
+
+        # Timings passed by the caller are reported by the caller
+        if owned:
+            self._notify(timing)
+
+    def _is_resilient(self, idempotent: bool) -> bool:
+        """Whether a request is sent with the retry and hedge policies"""
+        return idempotent and (self._retry is not None or self._hedge is not None)
+
+    def _parse_history(self, history: dict, graph: str) -> str:
+        """Head commit of the raw result of CALL db.history()"""
+
+        # The first column holds the commit hashes, from the oldest
+        commits = next(iter(history.values()), [])
+        if len(commits) == 0:
+            raise TuringDBException(f"Graph {graph} has no commit")
+
+        return str(commits[-1])
+
+    @staticmethod
+    def _load_poll_intervals(
+        graph: str, deadline: float, poll_interval: float
+    ) -> Iterator[float]:
+        """Waits between the polls of a loading graph, until the deadline"""
+
+        while True:
+            if time.monotonic() + poll_interval > deadline:
+                raise TuringDBException(f"Graph {graph} is still loading")
+
+            yield poll_interval
+            poll_interval = min(poll_interval * 2, 2.0)
+
+    def _client_options(self) -> dict[str, Any]:
+        import httpx
+
+        return {
+            "auth": None,
+            "verify": False,
+            "timeout": self._timeout,
+            "limits": httpx.Limits(**self._limits),
+            "http2": self._http2,
+        }
+
+    def _build_request(
+        self,
+        path: str,
+        data: Optional[dict | str | bytes] = None,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        if data is None:
+            data = ""
+
+        request: dict[str, Any] = {
+            "url": f"{self.host}/{path}",
+            "params": params,
+            "headers": headers or self._headers,
+        }
+
+        if isinstance(data, dict):
+            request["json"] = data
+        else:
+            request["content"] = self._compress_body(data, request)
+
+        if timeout is not None:
+            request["timeout"] = timeout
+
+        return request
+
+    def _compress_body(self, data: str | bytes, request: dict[str, Any]) -> str | bytes:
+        """Compresses bodies over compress_requests_over bytes"""
+
+        if self._compression in (None, "identity") or self._compress_requests_over is None:
+            return data
+
+        # Already encoded by the caller, e.g. compressed upload chunks
+        if any(name.lower() == "content-encoding" for name in request["headers"]):
+            return data
+
+        body = data.encode() if isinstance(data, str) else data
+        if len(body) <= self._compress_requests_over:
+            return data
+
+        request["headers"] = {**request["headers"], "Content-Encoding": self._compression}
+        return compress(body, self._compression)
+
+    def add_observer(self, observer: "QueryObserver"):
+        """Passes the timing of every following request to `observer`"""
+        self._observers.append(observer)
+
+    def _notify(self, timing: "QueryTiming"):
+        for observer in self._observers:
+            observer.on_request(timing)
+
+    def _warm_connection_count(self, connections: int) -> int:
+        """Connections that the pool can open and keep alive"""
+
+        limits = [
+            limit
+            for limit in (
+                self._limits["max_connections"],
+                self._limits["max_keepalive_connections"],
+            )
+            if limit is not None
+        ]
+        return max(1, min([connections, *limits]))
+
+    def _record_timing(self, timing: "QueryTiming"):
+        # Tasks inherit the mapping of their parent, which must not see their timings
+        timings = weakref.WeakKeyDictionary(_last_timings.get() or {})
+        timings[self] = timing
+        _last_timings.set(timings)
+
+    def _last_timing(self) -> Optional["QueryTiming"]:
+        timings = _last_timings.get()
+        return timings.get(self) if timings is not None else None
+
+    def _parse_response(self, response, timing: "QueryTiming"):
+        import orjson
+
+        response.raise_for_status()
+
+        with timing.phase("decode"):
+            if is_arrow_response(response):
+                json = decode_arrow_stream(response.content)
+            else:
+                json = orjson.loads(response.content)
+
+        self._check_error(json)
+
+        return json
+
+    def _check_error(self, json):
+        if isinstance(json, dict):
+            err = json.get("error")
+            if err is not None:
+                details = json.get("error_details")
+                if details is not None:
+                    err = f"{err}: {details}"
+                raise TuringDBException(err)
+
+    def _parse_query_result(
+        self,
+        result,
+        timing: "QueryTiming",
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ):
+        with timing.phase("build"):
+            if isinstance(result, ArrowResult):
+                timing.query_exec_time = result.query_exec_time
+                data = self._parse_arrow(result, raw, result_format)
+            elif isinstance(result, dict):
+                timing.query_exec_time = result["time"]
+                data = self._parse_chunks(result, raw, result_format)
+            else:
+                raise TuringDBException("Invalid response from the server")
+
+        timing.stop()
+
+        return data
+
+    def _parse_arrow(
+        self,
+        result: ArrowResult,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ):
+        if raw:
+            return result.table.to_pydict()
+
+        return arrow_table_to_format(result.table, result_format or self._result_format)
+
+    def _parse_chunks(
+        self,
+        json: dict,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ):
+        header = json["header"]
+        builder = ResultBuilder(header["column_names"], header["column_types"])
+
+        for chunk in json["data"]:
+            builder.add_chunk(chunk)
+
+        if raw:
+            return builder.build_columns()
+
+        return builder.build_as(result_format or self._result_format)
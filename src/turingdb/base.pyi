@@ -0,0 +1,36 @@
+from .cache import CacheEntry as CacheEntry, DiskResultCache as DiskResultCache, ResultCache as ResultCache
+from .compression import Compression as Compression, accept_encoding as accept_encoding, check_compression as check_compression, compress as compress
+from .cypher import is_read_query as is_read_query, redact_query as redact_query
+from .exceptions import TuringDBException as TuringDBException
+from .observers import QueryObserver as QueryObserver
+from .results import ResultBuilder as ResultBuilder, ResultFormat as ResultFormat, arrow_table_to_format as arrow_table_to_format, check_result_format as check_result_format
+from .retry import HedgePolicy as HedgePolicy, RetryPolicy as RetryPolicy
+from .s3 import S3Client as S3Client
+from .timing import QueryTiming as QueryTiming
+from .wire import ArrowResult as ArrowResult, WireFormat as WireFormat, accept_header as accept_header, check_wire_format as check_wire_format, decode_arrow_stream as decode_arrow_stream, is_arrow_response as is_arrow_response
+from _typeshed import Incomplete
+from typing import Any, Iterable, Literal
+
+class TuringDBBase:
+    DEFAULT_HEADERS: Incomplete
+    host: Incomplete
+    def __init__(self, instance_id: str = '', auth_token: str = '', host: str = 'https://engines.turingdb.ai/sdk', timeout: int | None = None, result_format: ResultFormat = 'pandas', wire_format: WireFormat = 'json', max_connections: int | None = 100, max_keepalive_connections: int | None = 20, keepalive_expiry: float | None = 5.0, http2: bool = False, result_cache: ResultCache | None = None, disk_cache: DiskResultCache | None = None, compression: Compression | None = None, compress_requests_over: int | None = None, retry: RetryPolicy | None = None, hedge: HedgePolicy | None = None, observers: Iterable['QueryObserver'] | None = None) -> None: ...
+    def set_commit(self, commit: str): ...
+    def set_change(self, change: int | str): ...
+    def checkout(self, change: int | Literal['main'] = 'main', commit: str = 'HEAD'): ...
+    def set_graph(self, graph_name: str): ...
+    def get_graph(self) -> str: ...
+    def get_query_exec_time(self) -> float | None: ...
+    def get_total_exec_time(self) -> float | None: ...
+    def pool_stats(self) -> dict[str, Any]: ...
+    @property
+    def result_cache(self) -> ResultCache | None: ...
+    @property
+    def disk_cache(self) -> DiskResultCache | None: ...
+    @property
+    def current_graph(self) -> str: ...
+    @property
+    def current_commit(self) -> str: ...
+    @property
+    def current_change(self) -> str: ...
+    def add_observer(self, observer: QueryObserver): ...
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from .cypher import render_query
+from .timing import QueryTiming
+
+# A query, or a query template and its parameters
+BatchQuery = str | tuple[str, Mapping[str, Any]]
+
+
+def batch_query_text(query: BatchQuery) -> str:
+    if isinstance(query, tuple):
+        return render_query(*query)
+    return query
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one query of a batch"""
+
+    query: str
+    result: Any = None
+    timing: Optional[QueryTiming] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -0,0 +1,17 @@
+from .cypher import render_query as render_query
+from .timing import QueryTiming as QueryTiming
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+BatchQuery = str | tuple[str, Mapping[str, Any]]
+
+def batch_query_text(query: BatchQuery) -> str: ...
+
+@dataclass
+class BatchResult:
+    query: str
+    result: Any = ...
+    timing: QueryTiming | None = ...
+    error: Exception | None = ...
+    @property
+    def ok(self) -> bool: ...
@@ -0,0 +1,326 @@
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Optional
+
+from .cypher import format_key, format_literal, format_properties
+from .exceptions import TuringDBException
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from .session import Session
+    from .turingdb import TuringDB
+
+Rows = Iterable[Mapping[str, Any]]
+
+
+@dataclass
+class BulkStats:
+    """Rows written by a BulkWriter"""
+
+    change: Optional[str] = None
+    nodes: int = 0
+    edges: int = 0
+    requests: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        if self.elapsed <= 0:
+            return None
+        return (self.nodes + self.edges) / self.elapsed
+
+
+def iter_rows(rows) -> Iterator[Mapping[str, Any]]:
+    """Rows of a DataFrame, or of an iterable of mappings"""
+
+    if hasattr(rows, "itertuples"):
+        columns = [str(c) for c in rows.columns]
+        for values in rows.itertuples(index=False, name=None):
+            yield dict(zip(columns, values))
+    else:
+        yield from rows
+
+
+def _label(label: str) -> str:
+    if not label.isidentifier():
+        raise TuringDBException(f"Invalid label or edge type: {label!r}")
+
+    return f":{label}"
+
+
+class _Batch:
+    """CREATE query being filled, with the size of its text"""
+
+    def __init__(self):
+        self.matches: dict[tuple[str, str, str], str] = {}
+        self.creates: list[str] = []
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self.creates)
+
+    def node_var(self, label: str, key: str, value: Any) -> str:
+        """Variable of a MATCH pattern on an existing node"""
+
+        literal = format_literal(value)
+        match_key = (label, key, literal)
+
+        if match_key not in self.matches:
+            var = f"m{len(self.matches)}"
+            self.matches[match_key] = var
+            self.size += len(var) + len(label) + len(key) + len(literal) + 10
+
+        return self.matches[match_key]
+
+    def add(self, pattern: str):
+        self.creates.append(pattern)
+        self.size += len(pattern) + 2
+
+    def query(self) -> str:
+        create = "CREATE " + ", ".join(self.creates)
+
+        if not self.matches:
+            return create
+
+        return f"MATCH {self._patterns()} {create} RETURN count(*) AS matched"
+
+    def check_query(self) -> str:
+        """Read query counting the combinations of nodes that the MATCH binds"""
+        return f"MATCH {self._patterns()} RETURN count(*) AS matched"
+
+    def _patterns(self) -> str:
+        # The MATCH patterns form a cartesian product: the CREATE runs once
+        # per combination of matched nodes, and the count tells how often
+        return ", ".join(
+            f"({var}{_label(label)} {{{format_key(key)}: {literal}}})"
+            for (label, key, literal), var in self.matches.items()
+        )
+
+
+def _check_matched(result, edges: int):
+    """Raises unless the keys of a batch of edges match one node each"""
+
+    matched = result["matched"][0]
+
+    if matched == 0:
+        raise TuringDBException(
+            f"A batch of {edges} edges was not created, "
+            "one of their source or target keys matches no node"
+        )
+
+    if matched != 1:
+        raise TuringDBException(
+            f"A batch of {edges} edges was not created, one of their source or "
+            f"target keys matches several nodes ({matched} combinations)"
+        )
+
+
+class BulkWriter:
+    """
+    Writes nodes and edges in CREATE queries of about `batch_bytes` bytes,
+    or `batch_rows` rows, inside a new change that is submitted when the
+    context exits without error.
+
+    Edges are matched to existing nodes by their `key` property, so nodes
+    must be added before the edges that reference them. An edge batch binds
+    at most `batch_endpoints` distinct nodes, and a read query checks that
+    each of its keys matches exactly one node before the edges are created.
+    Otherwise it raises TuringDBException and the change is not submitted.
+    With `max_concurrency` above 1, batches are sent concurrently, and edge
+    batches wait for the node batches sent before them.
+
+        with client.bulk_writer(graph="stations") as writer:
+            writer.add_nodes(stations_df, "Station")
+            writer.add_edges(lines_df, "CONNECTED", "Station", "Station")
+        print(writer.stats.rows_per_sec)
+    """
+
+    def __init__(
+        self,
+        client: "TuringDB",
+        graph: Optional[str] = None,
+        batch_bytes: int = 1024 * 1024,
+        batch_rows: Optional[int] = None,
+        max_concurrency: int = 1,
+        submit: bool = True,
+        batch_endpoints: int = 16,
+    ):
+        if max_concurrency < 1:
+            raise TuringDBException("max_concurrency must be at least 1")
+
+        if batch_endpoints < 2:
+            raise TuringDBException("batch_endpoints must be at least 2")
+
+        self.stats = BulkStats()
+
+        self._client = client
+        self._graph = graph
+        self._batch_bytes = batch_bytes
+        self._batch_rows = batch_rows
+        self._max_concurrency = max_concurrency
+        self._submit = submit
+        self._batch_endpoints = batch_endpoints
+
+        self._session: Optional["Session"] = None
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._pending: list["Future"] = []
+        self._nodes_in_flight = False
+        self._nodes = _Batch()
+        self._edges = _Batch()
+        self._t0 = 0.0
+
+    def __enter__(self) -> "BulkWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._shutdown()
+
+    @property
+    def session(self) -> Optional["Session"]:
+        """Session on the change being written"""
+        return self._session
+
+    def open(self):
+        if self._session is not None:
+            raise TuringDBException("The bulk writer is already open")
+
+        self._t0 = time.perf_counter()
+        self._session = self._client.session(graph=self._graph).new_change()
+        self.stats.change = str(self._session.change)
+
+        if self._max_concurrency > 1:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(max_workers=self._max_concurrency)
+
+    def add_nodes(self, rows: Rows, label: str):
+        """Adds a node per row, with the non-null values as properties"""
+
+        for row in iter_rows(rows):
+            self._nodes.add(f"({_label(label)}{format_properties(row)})")
+            self.stats.nodes += 1
+
+            if self._is_full(self._nodes):
+                self._flush_nodes()
+
+    def add_edges(
+        self,
+        rows: Rows,
+        edge_type: str,
+        source_label: str,
+        target_label: str,
+        source: str = "source",
+        target: str = "target",
+        key: str = "id",
+    ):
+        """
+        Adds an edge per row, from the node whose `key` property is the value
+        of the `source` column to the node of the `target` column. The other
+        values are the properties of the edge.
+        """
+
+        for row in iter_rows(rows):
+            properties = {k: v for k, v in row.items() if k not in (source, target)}
+            src = self._edges.node_var(source_label, key, row[source])
+            dst = self._edges.node_var(target_label, key, row[target])
+
+            self._edges.add(
+                f"({src})-[{_label(edge_type)}{format_properties(properties)}]->({dst})"
+            )
+            self.stats.edges += 1
+
+            if self._is_full(self._edges):
+                self._flush_edges()
+
+    def close(self) -> BulkStats:
+        """Sends the remaining batches and submits the change"""
+
+        if self._session is None:
+            raise TuringDBException("The bulk writer is not open")
+
+        try:
+            self._flush_nodes()
+            self._flush_edges()
+            self._wait()
+
+            if self._submit:
+                self._session.query("CHANGE SUBMIT")
+        finally:
+            self._shutdown()
+
+        self.stats.elapsed = time.perf_counter() - self._t0
+        return self.stats
+
+    def _is_full(self, batch: _Batch) -> bool:
+        if self._batch_rows is not None and len(batch) >= self._batch_rows:
+            return True
+
+        # Room for the source and target of the next edge, the check query
+        # enumerates every combination when a key matches several nodes
+        if len(batch.matches) + 2 > self._batch_endpoints:
+            return True
+
+        return batch.size >= self._batch_bytes
+
+    def _flush_nodes(self):
+        if len(self._nodes) > 0:
+            self._send(self._nodes.query())
+            self._nodes = _Batch()
+            self._nodes_in_flight = True
+
+    def _flush_edges(self):
+        if len(self._edges) > 0:
+            # The nodes of the edges must exist first
+            self._flush_nodes()
+            if self._nodes_in_flight:
+                self._wait()
+                self._nodes_in_flight = False
+
+            self._send(
+                self._edges.query(), len(self._edges), self._edges.check_query()
+            )
+            self._edges = _Batch()
+
+    def _send(self, query: str, edges: int = 0, check: Optional[str] = None):
+        self.stats.requests += 1
+
+        if self._executor is None:
+            self._run(query, edges, check)
+            return
+
+        # Bounds the queries held in memory
+        if len(self._pending) >= 2 * self._max_concurrency:
+            self._pending.pop(0).result()
+
+        self._pending.append(self._executor.submit(self._run, query, edges, check))
+
+    def _run(self, query: str, edges: int, check: Optional[str]):
+        assert self._session is not None
+
+        if check is not None:
+            # Read from the server, the change has new nodes since any cached result
+            session = self._session
+            result = session.client._query(check, session.params, raw=True, cache=False)[0]
+            _check_matched(result, edges)
+
+        result = self._session.query(query, raw=True)
+
+        if edges > 0:
+            _check_matched(result, edges)
+
+    def _wait(self):
+        while self._pending:
+            self._pending.pop(0).result()
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+        self._pending = []
+        self._session = None
@@ -0,0 +1,45 @@
+import types
+from .cypher import format_key as format_key, format_literal as format_literal, format_properties as format_properties
+from .exceptions import TuringDBException as TuringDBException
+from .session import Session as Session
+from .turingdb import TuringDB as TuringDB
+from _typeshed import Incomplete
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Mapping
+
+Rows = Iterable[Mapping[str, Any]]
+
+@dataclass
+class BulkStats:
+    change: str | None = ...
+    nodes: int = ...
+    edges: int = ...
+    requests: int = ...
+    elapsed: float = ...
+    @property
+    def rows_per_sec(self) -> float | None: ...
+
+def iter_rows(rows) -> Iterator[Mapping[str, Any]]: ...
+
+class _Batch:
+    matches: dict[tuple[str, str, str], str]
+    creates: list[str]
+    size: int
+    def __init__(self) -> None: ...
+    def __len__(self) -> int: ...
+    def node_var(self, label: str, key: str, value: Any) -> str: ...
+    def add(self, pattern: str): ...
+    def query(self) -> str: ...
+    def check_query(self) -> str: ...
+
+class BulkWriter:
+    stats: Incomplete
+    def __init__(self, client: TuringDB, graph: str | None = None, batch_bytes: int = ..., batch_rows: int | None = None, max_concurrency: int = 1, submit: bool = True, batch_endpoints: int = 16) -> None: ...
+    def __enter__(self) -> BulkWriter: ...
+    def __exit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: types.TracebackType | None) -> None: ...
+    @property
+    def session(self) -> Session | None: ...
+    def open(self) -> None: ...
+    def add_nodes(self, rows: Rows, label: str): ...
+    def add_edges(self, rows: Rows, edge_type: str, source_label: str, target_label: str, source: str = 'source', target: str = 'target', key: str = 'id'): ...
+    def close(self) -> BulkStats: ...
@@ -0,0 +1,309 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Where a query result is cached"""
+
+    key: tuple
+    result_shape: str
+    ttl: Optional[float] = None
+
+    @property
+    def pinned(self) -> bool:
+        """Whether the query runs on a commit, so that its result never changes"""
+        return self.ttl is None
+
+    @property
+    def memory_key(self) -> tuple:
+        return (*self.key, self.result_shape)
+
+
+def result_nbytes(result) -> int:
+    """Approximate memory footprint of a query result"""
+
+    if hasattr(result, "memory_usage"):  # pandas DataFrame
+        return int(result.memory_usage(deep=True).sum())
+
+    if hasattr(result, "nbytes"):  # pyarrow Table, NumPy array
+        return int(result.nbytes)
+
+    if isinstance(result, dict):  # numpy or raw columns
+        return sum(result_nbytes(values) for values in result.values())
+
+    if isinstance(result, list):
+        return sys.getsizeof(result) + sum(sys.getsizeof(v) for v in result)
+
+    return sys.getsizeof(result)
+
+
+def copy_result(result):
+    """Copy of a cached result that callers can modify safely"""
+
+    if isinstance(result, dict):
+        return {name: values.copy() for name, values in result.items()}
+
+    if hasattr(result, "memory_usage"):
+        return result.copy()
+
+    # pyarrow tables are immutable
+    return result
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of query results, bounded by their size in bytes.
+    Entries can expire after a time to live.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, unpinned_ttl: Optional[float] = None):
+        """
+        `unpinned_ttl` is the time to live, in seconds, of the results of
+        queries on HEAD or on a change. They are not cached when it is None,
+        and write queries of the clients remove them for their graph.
+        Results of queries on a commit never expire.
+        """
+
+        self.max_bytes = max_bytes
+        self.unpinned_ttl = unpinned_ttl
+
+        self._entries: OrderedDict[Hashable, tuple[Any, int, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[2] is not None and entry[2] < time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+        return copy_result(entry[0])
+
+    def put(self, key: Hashable, result, ttl: Optional[float] = None):
+        size = result_nbytes(result)
+
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (copy_result(result), size, expires_at)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def invalidate_unpinned(self, prefix: tuple):
+        """Removes the entries with a time to live whose key starts with prefix"""
+
+        with self._lock:
+            stale = [
+                key
+                for key, (_, _, expires_at) in self._entries.items()
+                if expires_at is not None
+                and isinstance(key, tuple)
+                and key[: len(prefix)] == prefix
+            ]
+            for key in stale:
+                self._remove(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _remove(self, key: Hashable):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+class DiskResultCache:
+    """
+    Arrow IPC files of query results on commits, kept in a directory shared
+    by processes. Files are memory-mapped when read back, and the least
+    recently used ones are removed once the directory exceeds `max_bytes`.
+
+    Files and the index are written to temporary files then renamed, so
+    concurrent writers never expose partial files. Lookups go straight to
+    the files, and hits only touch the modification time of their file,
+    which orders the eviction. The index describes the cached queries, it
+    is only written when results are added.
+    """
+
+    INDEX_FILE = "index.json"
+    SUFFIX = ".arrow"
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = 4 * 1024**3):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: tuple):
+        """Memory-maps the table cached for a key, None if there is none"""
+        import pyarrow as pa
+
+        path = os.path.join(self.directory, self._file_name(key))
+
+        try:
+            with pa.memory_map(path) as source:
+                table = pa.ipc.open_file(source).read_all()
+            # Marks the file as recently used
+            os.utime(path)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+
+        return table
+
+    def put(self, key: tuple, table):
+        import tempfile
+
+        import pyarrow as pa
+
+        name = self._file_name(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                with pa.ipc.new_file(f, table.schema) as writer:
+                    writer.write_table(table)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            index = self._read_index()
+            index[name] = {
+                "graph": key[2],
+                "commit": key[4],
+                "query": key[-1],
+                "size": size,
+            }
+            self._evict(index)
+            self._write_index(index)
+
+    def clear(self):
+        with self._lock:
+            for name in self._list_files():
+                self._remove_file(name)
+            self._write_index({})
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            index = self._read_index()
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(index),
+                "bytes": sum(entry["size"] for entry in index.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    def _file_name(self, key: tuple) -> str:
+        import hashlib
+
+        return hashlib.sha256(repr(key).encode()).hexdigest() + self.SUFFIX
+
+    def _list_files(self) -> list[str]:
+        return [name for name in os.listdir(self.directory) if name.endswith(self.SUFFIX)]
+
+    def _read_index(self) -> dict[str, dict]:
+        import json
+
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILE), "rb") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_index(self, index: dict[str, dict]):
+        import json
+        import tempfile
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, os.path.join(self.directory, self.INDEX_FILE))
+
+    def _evict(self, index: dict[str, dict]):
+        # Another process may have written or removed files meanwhile
+        last_access = {}
+        for name in self._list_files():
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            last_access[name] = st.st_mtime
+            index.setdefault(name, {"size": st.st_size})
+
+        for name in list(index):
+            if name not in last_access:
+                del index[name]
+
+        total = sum(entry["size"] for entry in index.values())
+
+        for name in sorted(index, key=last_access.__getitem__):
+            if total <= self.max_bytes:
+                break
+
+            if self._remove_file(name):
+                total -= index.pop(name)["size"]
+                self._evictions += 1
+
+    def _remove_file(self, name: str) -> bool:
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            # Still memory-mapped on platforms that forbid removing it
+            return False
+
+        return True
@@ -0,0 +1,38 @@
+import os
+from _typeshed import Incomplete
+from dataclasses import dataclass
+from typing import Hashable
+
+@dataclass(frozen=True)
+class CacheEntry:
+    key: tuple
+    result_shape: str
+    ttl: float | None = ...
+    @property
+    def pinned(self) -> bool: ...
+    @property
+    def memory_key(self) -> tuple: ...
+
+def result_nbytes(result) -> int: ...
+def copy_result(result): ...
+
+class ResultCache:
+    max_bytes: Incomplete
+    unpinned_ttl: Incomplete
+    def __init__(self, max_bytes: int = ..., unpinned_ttl: float | None = None) -> None: ...
+    def get(self, key: Hashable): ...
+    def put(self, key: Hashable, result, ttl: float | None = None): ...
+    def clear(self) -> None: ...
+    def invalidate_unpinned(self, prefix: tuple): ...
+    def stats(self) -> dict[str, int]: ...
+
+class DiskResultCache:
+    INDEX_FILE: str
+    SUFFIX: str
+    directory: Incomplete
+    max_bytes: Incomplete
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = ...) -> None: ...
+    def get(self, key: tuple): ...
+    def put(self, key: tuple, table): ...
+    def clear(self) -> None: ...
+    def stats(self) -> dict[str, int]: ...
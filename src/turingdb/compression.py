@@ -0,0 +1,57 @@
+import importlib.util
+from typing import Literal, Optional, get_args
+
+from .exceptions import TuringDBException
+
+# "identity" turns off the compression httpx negotiates by default
+Compression = Literal["gzip", "zstd", "identity"]
+COMPRESSIONS: tuple[str, ...] = get_args(Compression)
+
+
+def check_compression(compression: Optional[str]):
+    if compression is None:
+        return
+
+    if compression not in COMPRESSIONS:
+        raise TuringDBException(
+            f"Unknown compression '{compression}', "
+            f"expected one of {', '.join(COMPRESSIONS)}"
+        )
+
+    if compression == "zstd" and importlib.util.find_spec("zstandard") is None:
+        raise TuringDBException(
+            "zstd compression needs the zstandard package, "
+            "install turingdb[zstd]"
+        )
+
+
+def accept_encoding(compression: Compression) -> str:
+    """Accept-Encoding header, httpx decodes the responses while they stream"""
+
+    match compression:
+        case "zstd":
+            return "zstd, gzip;q=0.8"
+        case "gzip":
+            return "gzip"
+
+    return "identity"
+
+
+def compress(data: bytes, compression: Compression) -> bytes:
+    """Fast compression levels, bodies are compressed on the request path"""
+
+    match compression:
+        case "gzip":
+            import zlib
+
+            compressor = zlib.compressobj(1, wbits=31)
+            return compressor.compress(data) + compressor.flush()
+        case "zstd":
+            import zstandard
+
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        case "identity":
+            return data
+
+    check_compression(compression)
+    return data
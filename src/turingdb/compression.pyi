@@ -0,0 +1,9 @@
+from .exceptions import TuringDBException as TuringDBException
+from _typeshed import Incomplete
+
+Compression: Incomplete
+COMPRESSIONS: tuple[str, ...]
+
+def check_compression(compression: str | None): ...
+def accept_encoding(compression: Compression) -> str: ...
+def compress(data: bytes, compression: Compression) -> bytes: ...
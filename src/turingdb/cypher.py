@@ -0,0 +1,176 @@
+import functools
+import math
+import re
+from typing import Any, Mapping, Optional
+
+from .exceptions import TuringDBException
+
+_READ_CLAUSES = {"MATCH", "OPTIONAL", "WITH", "UNWIND", "RETURN"}
+_WRITE_CLAUSES = re.compile(
+    r"\b(CREATE|MERGE|SET|DELETE|DETACH|REMOVE|LOAD|DROP)\b", re.IGNORECASE
+)
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# Statements whose arguments are credentials
+_SECRET_STATEMENT = re.compile(r"^\s*(S3\s+CONNECT)\b", re.IGNORECASE)
+_TRAILING_WINDOW = re.compile(r"\b(SKIP|LIMIT)\s+(\d+|\$\w+)\s*$", re.IGNORECASE)
+
+# Strings and quoted names are skipped, $ signs in them are not parameters
+_PARAMETER = re.compile(
+    r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|`[^`]*`)|\$([A-Za-z_][A-Za-z0-9_]*)""",
+    re.DOTALL,
+)
+
+
+def is_read_query(query: str) -> bool:
+    """
+    Conservative check that a query only reads the graph. Queries that
+    mention a write clause anywhere, even inside a string, are reported
+    as writes.
+    """
+
+    words = query.split(maxsplit=1)
+    if not words or words[0].upper() not in _READ_CLAUSES:
+        return False
+
+    return _WRITE_CLAUSES.search(query) is None
+
+
+def redact_query(query: str) -> str:
+    """Query text safe to export, without the credentials of S3 CONNECT"""
+
+    m = _SECRET_STATEMENT.match(query)
+    if m is None:
+        return query
+
+    return f"{m.group(1)} <redacted>"
+
+
+def check_pageable(query: str):
+    """Pages are SKIP/LIMIT windows appended to a read query"""
+
+    if not is_read_query(query):
+        raise TuringDBException("Only read queries can be paged")
+
+    if _TRAILING_WINDOW.search(query.rstrip().rstrip(";")) is not None:
+        raise TuringDBException("Paged queries cannot end with their own SKIP or LIMIT")
+
+
+def page_query(query: str, offset: int, limit: int) -> str:
+    return f"{query.rstrip().rstrip(';')} SKIP {offset} LIMIT {limit}"
+
+
+def is_null(value: Any) -> bool:
+    """None, NaN, pandas.NA and NaT, which are left out of property maps"""
+
+    if value is None:
+        return True
+
+    if isinstance(value, float):
+        return math.isnan(value)
+
+    return type(value).__name__ in ("NAType", "NaTType")
+
+
+def format_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def format_key(key: str) -> str:
+    if _IDENTIFIER.fullmatch(key):
+        return key
+
+    return format_string(key)
+
+
+def format_literal(value: Any) -> str:
+    """Cypher literal of a Python, NumPy or pandas scalar or list"""
+
+    if hasattr(value, "tolist"):
+        value = value.tolist()  # NumPy scalar or array
+
+    match value:
+        case None:
+            return "null"
+        case bool():
+            return "true" if value else "false"
+        case int():
+            return str(value)
+        case float():
+            if not math.isfinite(value):
+                raise TuringDBException(f"Cannot write {value} in a query")
+            return repr(value)
+        case str():
+            return format_string(value)
+        case list() | tuple():
+            return f"[{', '.join(format_literal(v) for v in value)}]"
+        case dict():
+            items = (f"{format_key(k)}: {format_literal(v)}" for k, v in value.items())
+            return f"{{{', '.join(items)}}}"
+
+    raise TuringDBException(f"Cannot write a {type(value).__name__} in a query")
+
+
+def format_properties(properties: Mapping[str, Any]) -> str:
+    """Property map of the non-null properties, empty if there is none"""
+
+    items = [
+        f"{format_key(key)}: {format_literal(value)}"
+        for key, value in properties.items()
+        if not is_null(value)
+    ]
+
+    return f" {{{', '.join(items)}}}" if items else ""
+
+
+def check_identifier(name: str):
+    if not _IDENTIFIER.fullmatch(name):
+        raise TuringDBException(
+            f"Invalid name {name!r}, names are letters, digits and underscores"
+        )
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_template(query: str) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Splits a query around its $parameters. Templates are cached, so
+    repeated queries are only scanned once.
+    """
+
+    texts = []
+    names = []
+    start = 0
+
+    for match in _PARAMETER.finditer(query):
+        if match.group(2) is None:
+            continue
+
+        texts.append(query[start:match.start()])
+        names.append(match.group(2))
+        start = match.end()
+
+    texts.append(query[start:])
+
+    return tuple(texts), tuple(names)
+
+
+def render_query(query: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """Replaces the $parameters of a query with the literals of their values"""
+
+    if params is None:
+        return query
+
+    texts, names = compile_template(query)
+
+    missing = [name for name in names if name not in params]
+    if missing:
+        raise TuringDBException(f"Missing query parameters: {', '.join(missing)}")
+
+    literals = {name: format_literal(params[name]) for name in set(names)}
+    parts = [texts[0]]
+
+    for name, text in zip(names, texts[1:]):
+        parts.append(literals[name])
+        parts.append(text)
+
+    return "".join(parts)
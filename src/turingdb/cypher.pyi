@@ -0,0 +1,15 @@
+from .exceptions import TuringDBException as TuringDBException
+from typing import Any, Mapping
+
+def is_read_query(query: str) -> bool: ...
+def redact_query(query: str) -> str: ...
+def check_pageable(query: str): ...
+def page_query(query: str, offset: int, limit: int) -> str: ...
+def is_null(value: Any) -> bool: ...
+def format_string(value: str) -> str: ...
+def format_key(key: str) -> str: ...
+def format_literal(value: Any) -> str: ...
+def format_properties(properties: Mapping[str, Any]) -> str: ...
+def check_identifier(name: str): ...
+def compile_template(query: str) -> tuple[tuple[str, ...], tuple[str, ...]]: ...
+def render_query(query: str, params: Mapping[str, Any] | None = None) -> str: ...
@@ -0,0 +1,108 @@
+from typing import Any, Optional, Protocol, Sequence
+
+from .timing import QueryTiming
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class QueryObserver(Protocol):
+    """
+    Receives the timing of each request once it completed, including the
+    results served from the caches. Observers run on the request path, so
+    they should only record the timing.
+    """
+
+    def on_request(self, timing: QueryTiming): ...
+
+
+class OpenTelemetryObserver:
+    """
+    Exports each request as an OpenTelemetry span, with a child span per
+    phase. Needs the opentelemetry-api package, install turingdb[otel]
+    """
+
+    def __init__(self, tracer: Optional[Any] = None):
+        from opentelemetry import trace
+
+        self._tracer = tracer or trace.get_tracer("turingdb")
+
+    def on_request(self, timing: QueryTiming):
+        from opentelemetry import trace
+
+        attributes: dict[str, Any] = {
+            "turingdb.endpoint": timing.endpoint or "",
+            "turingdb.cached": timing.cached,
+            "turingdb.attempts": timing.attempts,
+            "turingdb.hedged": timing.hedged,
+        }
+        if timing.query is not None:
+            attributes["db.statement"] = timing.query
+        if timing.query_exec_time is not None:
+            attributes["turingdb.query_exec_time_ms"] = timing.query_exec_time
+
+        span = self._tracer.start_span(
+            f"turingdb {timing.endpoint}",
+            kind=trace.SpanKind.CLIENT,
+            start_time=timing.started_at,
+            attributes=attributes,
+        )
+        context = trace.set_span_in_context(span)
+
+        for phase, start, end in timing.spans():
+            child = self._tracer.start_span(
+                phase,
+                context=context,
+                start_time=start,
+                attributes={"turingdb.phase_ms": timing.phases[phase]},
+            )
+            child.end(end_time=end)
+
+        span.end(end_time=timing.end_ns())
+
+
+class PrometheusObserver:
+    """
+    Records the request latencies, and the time spent in each phase, in
+    Prometheus histograms labelled by endpoint. Needs the prometheus-client
+    package, install turingdb[prometheus]
+    """
+
+    def __init__(
+        self,
+        registry: Optional[Any] = None,
+        namespace: str = "turingdb",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        from prometheus_client import REGISTRY, Histogram
+
+        registry = registry or REGISTRY
+
+        self.requests = Histogram(
+            "request_duration_seconds",
+            "Duration of the requests sent to TuringDB",
+            ["endpoint", "cached"],
+            namespace=namespace,
+            buckets=buckets,
+            registry=registry,
+        )
+        self.phases = Histogram(
+            "request_phase_duration_seconds",
+            "Time spent in each phase of the requests sent to TuringDB",
+            ["endpoint", "phase"],
+            namespace=namespace,
+            buckets=buckets,
+            registry=registry,
+        )
+
+    def on_request(self, timing: QueryTiming):
+        endpoint = timing.endpoint or ""
+
+        if timing.total_exec_time is not None:
+            self.requests.labels(endpoint, str(timing.cached).lower()).observe(
+                timing.total_exec_time / 1000
+            )
+
+        for phase, duration in timing.phases.items():
+            self.phases.labels(endpoint, phase).observe(duration / 1000)
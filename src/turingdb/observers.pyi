@@ -0,0 +1,18 @@
+from .timing import QueryTiming as QueryTiming
+from _typeshed import Incomplete
+from typing import Any, Protocol, Sequence
+
+DEFAULT_BUCKETS: Incomplete
+
+class QueryObserver(Protocol):
+    def on_request(self, timing: QueryTiming): ...
+
+class OpenTelemetryObserver:
+    def __init__(self, tracer: Any | None = None) -> None: ...
+    def on_request(self, timing: QueryTiming): ...
+
+class PrometheusObserver:
+    requests: Incomplete
+    phases: Incomplete
+    def __init__(self, registry: Any | None = None, namespace: str = 'turingdb', buckets: Sequence[float] = ...) -> None: ...
+    def on_request(self, timing: QueryTiming): ...
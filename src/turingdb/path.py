@@ -1,5 +1,7 @@
 from enum import Enum
 
+MiB = 1024 * 1024
+
 
 class PathType(Enum):
     LOCAL = "local"
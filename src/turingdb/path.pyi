@@ -1,5 +1,8 @@
+from _typeshed import Incomplete
 from enum import Enum
 
+MiB: Incomplete
+
 class PathType(Enum):
     LOCAL = 'local'
     S3 = 's3'
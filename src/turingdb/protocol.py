@@ -1,7 +1,8 @@
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
-from pandas import DataFrame
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class QueryProtocol(Protocol):
-    def query(self, query: str) -> DataFrame: ...
+    def query(self, query: str) -> "DataFrame": ...
@@ -0,0 +1,206 @@
+from typing import Literal, get_args
+
+from .exceptions import TuringDBException
+
+ResultFormat = Literal["pandas", "pandas-arrow", "pyarrow", "numpy"]
+RESULT_FORMATS: tuple[str, ...] = get_args(ResultFormat)
+
+DTYPE_MAP = {
+    "String": "string",
+    "Int64": "Int64",
+    "UInt64": "UInt64",
+    "Double": "float64",
+    "Bool": "boolean",
+}
+
+ARROW_TYPE_MAP = {
+    "String": "string",
+    "Int64": "int64",
+    "UInt64": "uint64",
+    "Double": "float64",
+    "Bool": "bool",
+}
+
+# NumPy dtype and the value stored under the mask for null entries
+NUMPY_TYPE_MAP = {
+    "String": ("object", None),
+    "Int64": ("int64", 0),
+    "UInt64": ("uint64", 0),
+    "Double": ("float64", 0.0),
+    "Bool": ("bool", False),
+}
+
+
+def result_row_count(data) -> int:
+    """Rows of a result in any result format, or of raw columns"""
+
+    if isinstance(data, dict):
+        return len(next(iter(data.values()), []))
+
+    return len(data)
+
+
+def check_result_format(result_format: str):
+    if result_format not in RESULT_FORMATS:
+        raise TuringDBException(
+            f"Unknown result format '{result_format}', "
+            f"expected one of {', '.join(RESULT_FORMATS)}"
+        )
+
+
+class ResultBuilder:
+    """
+    Accumulates the columns of a chunked query response and builds
+    the final result in a single pass.
+    """
+
+    def __init__(self, column_names: list[str], column_types: list[str]):
+        if len(column_names) != len(column_types):
+            raise TuringDBException(
+                "Query response column names and types do not match"
+            )
+
+        self._column_names = column_names
+        self._column_types = column_types
+        self._columns: list[list] = [[] for _ in column_names]
+
+    def add_chunk(self, chunk: list[list]):
+        for values, col in zip(self._columns, chunk):
+            values.extend(col)
+
+    @property
+    def row_count(self) -> int:
+        return len(self._columns[0]) if self._columns else 0
+
+    def build_as(self, result_format: ResultFormat):
+        match result_format:
+            case "pandas":
+                return self.build()
+            case "pandas-arrow":
+                return self.build_pandas_arrow()
+            case "pyarrow":
+                return self.build_arrow_table()
+            case "numpy":
+                return self.build_numpy()
+
+        check_result_format(result_format)
+
+    def build(self):
+        import pandas as pd
+
+        return pd.DataFrame({
+            cname: pd.Series(values, dtype=DTYPE_MAP.get(ctype, "object"))
+            for cname, ctype, values in zip(
+                self._column_names, self._column_types, self._columns
+            )
+        })
+
+    def build_columns(self) -> dict[str, list]:
+        return dict(zip(self._column_names, self._columns))
+
+    def build_arrow_table(self):
+        import pyarrow as pa
+
+        return pa.Table.from_arrays(self._build_arrow_arrays(), names=self._column_names)
+
+    def build_record_batch(self):
+        import pyarrow as pa
+
+        return pa.record_batch(self._build_arrow_arrays(), names=self._column_names)
+
+    def build_pandas_arrow(self):
+        import pandas as pd
+
+        return self.build_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+
+    def build_numpy(self) -> dict:
+        """Builds a dict of NumPy masked arrays, masked where values are null"""
+        import numpy as np
+
+        result = {}
+
+        for cname, ctype, values in zip(
+            self._column_names, self._column_types, self._columns
+        ):
+            dtype, fill = NUMPY_TYPE_MAP.get(ctype, ("object", None))
+
+            if dtype == "object":
+                # fromiter keeps nested values (lists, dicts) as single objects
+                data = np.fromiter(values, dtype=object, count=len(values))
+                mask = np.equal(data, None)
+            elif None in values:
+                data = np.fromiter(values, dtype=object, count=len(values))
+                mask = np.equal(data, None)
+                data[mask] = fill
+                data = data.astype(dtype)
+            else:
+                data = np.array(values, dtype=dtype)
+                mask = np.zeros(len(data), dtype=bool)
+
+            result[cname] = np.ma.MaskedArray(data, mask=mask)
+
+        return result
+
+    def _build_arrow_arrays(self) -> list:
+        import pyarrow as pa
+
+        return [
+            pa.array(values, type=ARROW_TYPE_MAP.get(ctype))
+            for ctype, values in zip(self._column_types, self._columns)
+        ]
+
+
+def arrow_table_to_format(table, result_format: ResultFormat):
+    """Converts a pyarrow.Table received from the server to a result format"""
+
+    match result_format:
+        case "pyarrow":
+            return table
+        case "pandas-arrow":
+            import pandas as pd
+
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        case "pandas":
+            return table.to_pandas(types_mapper=_pandas_types_mapper())
+        case "numpy":
+            return {
+                name: _arrow_column_to_numpy(column)
+                for name, column in zip(table.column_names, table.columns)
+            }
+
+    check_result_format(result_format)
+
+
+def _pandas_types_mapper():
+    import pandas as pd
+    import pyarrow as pa
+
+    # Same dtypes as DTYPE_MAP, float64 columns keep the default mapping
+    return {
+        pa.string(): pd.StringDtype(),
+        pa.large_string(): pd.StringDtype(),
+        pa.int64(): pd.Int64Dtype(),
+        pa.uint64(): pd.UInt64Dtype(),
+        pa.bool_(): pd.BooleanDtype(),
+    }.get
+
+
+def _arrow_column_to_numpy(column):
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if column.null_count == 0:
+        return np.ma.MaskedArray(
+            column.to_numpy(), mask=np.zeros(len(column), dtype=bool)
+        )
+
+    mask = column.is_null().to_numpy()
+    ctype = column.type
+
+    if pa.types.is_boolean(ctype):
+        column = pc.fill_null(column, False)
+    elif pa.types.is_integer(ctype) or pa.types.is_floating(ctype):
+        column = pc.fill_null(column, pa.scalar(0, type=ctype))
+
+    return np.ma.MaskedArray(column.to_numpy(), mask=mask)
@@ -0,0 +1,26 @@
+from .exceptions import TuringDBException as TuringDBException
+from _typeshed import Incomplete
+
+ResultFormat: Incomplete
+RESULT_FORMATS: tuple[str, ...]
+DTYPE_MAP: Incomplete
+ARROW_TYPE_MAP: Incomplete
+NUMPY_TYPE_MAP: Incomplete
+
+def result_row_count(data) -> int: ...
+def check_result_format(result_format: str): ...
+
+class ResultBuilder:
+    def __init__(self, column_names: list[str], column_types: list[str]) -> None: ...
+    def add_chunk(self, chunk: list[list]): ...
+    @property
+    def row_count(self) -> int: ...
+    def build_as(self, result_format: ResultFormat): ...
+    def build(self): ...
+    def build_columns(self) -> dict[str, list]: ...
+    def build_arrow_table(self): ...
+    def build_record_batch(self): ...
+    def build_pandas_arrow(self): ...
+    def build_numpy(self) -> dict: ...
+
+def arrow_table_to_format(table, result_format: ResultFormat): ...
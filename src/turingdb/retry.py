@@ -0,0 +1,98 @@
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+def default_retry_exceptions() -> tuple[type[BaseException], ...]:
+    import httpx
+
+    # Failures before the server could have run the query, or lost answers
+    return (
+        httpx.ConnectError,
+        httpx.ConnectTimeout,
+        httpx.ReadError,
+        httpx.WriteError,
+        httpx.RemoteProtocolError,
+    )
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retries of idempotent requests: read queries, graph listings and status
+    checks. Attempt n waits a random delay of at most
+    min(max_backoff, backoff * 2**n) seconds, or the server's Retry-After.
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.1
+    max_backoff: float = 2.0
+    retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    retry_exceptions: tuple[type[BaseException], ...] = field(
+        default_factory=default_retry_exceptions
+    )
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        import httpx
+
+        if attempt + 1 >= self.max_attempts:
+            return False
+
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retry_statuses
+
+        return isinstance(error, self.retry_exceptions)
+
+    def delay(self, error: BaseException, attempt: int) -> float:
+        import random
+
+        import httpx
+
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+
+        # Full jitter spreads the retries of concurrent clients
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+@dataclass
+class HedgePolicy:
+    """
+    Hedged idempotent requests: when the first request has not answered
+    after `delay` seconds, a duplicate is sent and the first answer wins.
+    Without a fixed delay, the `percentile` of the last `window` latencies
+    is used, once `min_samples` have been measured.
+    """
+
+    delay: Optional[float] = None
+    percentile: float = 0.95
+    window: int = 200
+    min_samples: int = 20
+
+    _latencies: deque = field(init=False, repr=False, compare=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        self._latencies = deque(maxlen=self.window)
+
+    def record(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, None to send a single request"""
+
+        if self.delay is not None:
+            return self.delay
+
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+
+        return latencies[min(len(latencies) - 1, int(len(latencies) * self.percentile))]
@@ -0,0 +1,23 @@
+from dataclasses import dataclass, field
+
+def default_retry_exceptions() -> tuple[type[BaseException], ...]: ...
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = ...
+    backoff: float = ...
+    max_backoff: float = ...
+    retry_statuses: frozenset[int] = ...
+    retry_exceptions: tuple[type[BaseException], ...] = field(default_factory=default_retry_exceptions)
+    def should_retry(self, error: BaseException, attempt: int) -> bool: ...
+    def delay(self, error: BaseException, attempt: int) -> float: ...
+
+@dataclass
+class HedgePolicy:
+    delay: float | None = ...
+    percentile: float = ...
+    window: int = ...
+    min_samples: int = ...
+    def __post_init__(self) -> None: ...
+    def record(self, latency: float): ...
+    def hedge_delay(self) -> float | None: ...
@@ -1,10 +1,87 @@
 import os
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Literal, Optional
 
+from .cypher import render_query
 from .exceptions import TuringDBException
-from .path import PathType
+from .path import MiB, PathType
 from .protocol import QueryProtocol
 
+if TYPE_CHECKING:
+    import queue
+
+ScratchCleanup = Literal["immediate", "background", "expire"]
+SCRATCH_RULE_ID = "turingdb-scratch-expiration"
+
+
+@dataclass
+class TransferStats:
+    """
+    Progress of a transfer. `total_bytes` and `bytes_transferred` are None
+    for transfers done by the TuringDB server. Files found unchanged at the
+    destination count in `skipped_files` and not in `bytes_transferred`.
+    """
+
+    src: str
+    dst: str
+    total_bytes: Optional[int] = None
+    bytes_transferred: Optional[int] = None
+    elapsed: float = 0.0
+    files: int = 1
+    skipped_files: int = 0
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Bytes per second"""
+        if self.bytes_transferred is None or self.elapsed <= 0:
+            return None
+        return self.bytes_transferred / self.elapsed
+
+
+@dataclass
+class _ProgressTracker:
+    """boto3 transfer callback, called from the transfer threads"""
+
+    stats: TransferStats
+    progress: Optional[Callable[[TransferStats], None]] = None
+    _t0: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __call__(self, bytes_amount: int):
+        with self._lock:
+            self.stats.bytes_transferred = (self.stats.bytes_transferred or 0) + bytes_amount
+            self.stats.elapsed = time.perf_counter() - self._t0
+
+            if self.progress is not None:
+                self.progress(self.stats)
+
+    def skip(self):
+        with self._lock:
+            self.stats.skipped_files += 1
+
+    def done(self) -> TransferStats:
+        self.stats.elapsed = time.perf_counter() - self._t0
+        if self.stats.bytes_transferred is None and self.stats.total_bytes is not None:
+            self.stats.bytes_transferred = self.stats.total_bytes
+        return self.stats
+
+
+def _download_path(dst: str, key: str, relative_key: str) -> str:
+    """
+    Local path of an object downloaded into the dst directory. Keys such as
+    "dir/../../.bashrc" would be written outside of it, they are rejected
+    """
+
+    root = os.path.realpath(dst)
+    path = os.path.realpath(os.path.join(root, *relative_key.split("/")))
+
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise TuringDBException(f"Object {key} would be downloaded outside of {dst}")
+
+    return path
+
 
 class S3Client:
     def __init__(
@@ -14,11 +91,48 @@ class S3Client:
         secret_key: Optional[str] = None,
         region: Optional[str] = None,
         use_scratch: bool = True,
+        multipart_threshold: int = 64 * MiB,
+        multipart_chunksize: int = 64 * MiB,
+        max_concurrency: int = 16,
+        progress: Optional[Callable[[TransferStats], None]] = None,
+        max_files: int = 8,
+        scratch_cleanup: ScratchCleanup = "immediate",
+        scratch_expiration_days: Optional[int] = None,
     ):
+        """
+        Files larger than `multipart_threshold` are transferred in parts of
+        `multipart_chunksize` bytes, `max_concurrency` parts at a time.
+        Directories, globs and prefixes are transferred `max_files` files at
+        a time.
+        `progress` is called with the TransferStats of local <-> S3 transfers
+        as bytes are sent or received, from the transfer threads.
+
+        Local <-> TuringDB transfers stage their files in the scratch folder
+        of the bucket, under a key of their own. `scratch_cleanup` deletes
+        them at the end of the transfer ("immediate"), in batches from a
+        background thread ("background", see flush_scratch()), or leaves
+        them to the bucket's lifecycle rules ("expire"). With
+        `scratch_expiration_days`, a lifecycle rule expiring the scratch
+        folder is added to the bucket.
+        """
+
         import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
 
         self._use_scratch = use_scratch
         self._scratch_folder = "__turing__scratch__"
+        self._progress = progress
+        self._max_files = max_files
+        self._scratch_cleanup = scratch_cleanup
+        self._scratch_queue: Optional["queue.Queue[str]"] = None
+        self._scratch_failures: list[str] = []
+        self._lock = threading.Lock()
+        self._transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+        )
 
         # Credentials are optional, they override the installed credentials
         self._s3_session = boto3.Session(
@@ -27,7 +141,11 @@ class S3Client:
             region_name=region,
         )
 
-        self._s3 = self._s3_session.client("s3")
+        # Every concurrent part needs its own connection
+        self._s3 = self._s3_session.client(
+            "s3",
+            config=Config(max_pool_connections=max(10, max_concurrency * max_files)),
+        )
         self._s3_resource = self._s3_session.resource("s3")
         self._s3_bucket = self._s3_resource.Bucket(bucket_name)  # type: ignore
 
@@ -45,13 +163,92 @@ class S3Client:
 
         self._bucket_name = bucket_name
 
+        if scratch_expiration_days is not None:
+            self.expire_scratch_after(scratch_expiration_days)
+
     def connect(self, query_protocol: QueryProtocol):
         self._query_protocol = query_protocol
         self._query_protocol.query(
-            f'S3 CONNECT "{self._access_key}" "{self._secret_key}" "{self._region}"'
+            render_query(
+                "S3 CONNECT $access_key $secret_key $region",
+                {
+                    "access_key": self._access_key,
+                    "secret_key": self._secret_key,
+                    "region": self._region or "",
+                },
+            )
         )
 
-    def transfer(self, src: str, dst: str):
+    def expire_scratch_after(self, days: int):
+        """
+        Adds a lifecycle rule to the bucket that deletes scratch objects after
+        a number of days, keeping the bucket's other rules
+        """
+        from botocore.exceptions import ClientError
+
+        try:
+            rules = self._s3.get_bucket_lifecycle_configuration(
+                Bucket=self._bucket_name
+            )["Rules"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchLifecycleConfiguration":
+                raise
+            rules = []
+
+        rules = [rule for rule in rules if rule.get("ID") != SCRATCH_RULE_ID]
+        rules.append(
+            {
+                "ID": SCRATCH_RULE_ID,
+                "Filter": {"Prefix": f"{self._scratch_folder}/"},
+                "Status": "Enabled",
+                "Expiration": {"Days": days},
+                "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": days},
+            }
+        )
+
+        self._s3.put_bucket_lifecycle_configuration(
+            Bucket=self._bucket_name, LifecycleConfiguration={"Rules": rules}
+        )
+
+    def flush_scratch(self):
+        """
+        Waits until the background thread has deleted the scratch objects.
+        Raises a TuringDBException listing the prefixes that it failed to
+        delete since the last call.
+        """
+        if self._scratch_queue is not None:
+            self._scratch_queue.join()
+
+        with self._lock:
+            failed, self._scratch_failures = self._scratch_failures, []
+
+        if failed:
+            raise TuringDBException(
+                f"Could not delete the scratch prefixes {', '.join(failed)}"
+            )
+
+    def transfer(
+        self,
+        src: str,
+        dst: str,
+        skip_unchanged: bool = True,
+        target: Optional[QueryProtocol] = None,
+    ) -> TransferStats:
+        """
+        Copies src to dst and returns the size and duration of the transfer.
+
+        Local directories and globs such as "~/data/*.csv" are uploaded under
+        the dst prefix, and S3 prefixes ending with "/" are downloaded into
+        the dst directory or copied under the dst prefix. With
+        `skip_unchanged`, their files that have the same size and ETag at the
+        destination are not transferred again.
+
+        S3 -> S3 copies are done by S3, and TuringDB -> TuringDB copies go
+        through the scratch folder, without passing through this machine.
+        `target` is the client that pulls TuringDB -> TuringDB copies, by
+        default the connected one. It must be connected to the same bucket.
+        """
+        import glob
         import uuid
         from pathlib import Path
 
@@ -65,26 +262,75 @@ class S3Client:
             case PathType.LOCAL, PathType.LOCAL:
                 raise NotImplementedError("Local to local transfer is not implemented")
             case PathType.S3, PathType.S3:
-                raise NotImplementedError("S3 to S3 transfer is not implemented")
+                src = src.replace("s3://", "")
+                dst = dst.replace("s3://", "")
+
+                if src.endswith("/"):
+                    return self._copy_prefix(src, dst, skip_unchanged)
+
+                head = self._s3.head_object(Bucket=self._bucket_name, Key=src)
+                tracker = self._tracker(src, dst, head["ContentLength"])
+                self._copy(src, dst, tracker)
+                return tracker.done()
             case PathType.TURINGDB, PathType.TURINGDB:
-                raise NotImplementedError(
-                    "TuringDB to TuringDB transfer is not implemented"
-                )
+                if not self._use_scratch:
+                    raise TuringDBException(
+                        "Scratch is not enabled, please transfer to s3 first, then to TuringDB"
+                    )
+
+                s3_path = f"s3://{self._scratch_folder}/{uuid.uuid4().hex}"
+                tracker = self._tracker(src, dst)
+
+                try:
+                    self.transfer(src, s3_path)
+                    bucket_path = s3_path.replace("s3://", f"s3://{self._bucket_name}/")
+                    target = target if target is not None else self._query_protocol
+                    target.query(
+                        render_query(
+                            "S3 PULL $src $dst",
+                            {"src": bucket_path, "dst": dst.replace("turingdb://", "")},
+                        )
+                    )
+                finally:
+                    self._cleanup_scratch(s3_path.replace("s3://", ""))
+
+                return tracker.done()
 
             # Local <-> S3
             case PathType.LOCAL, PathType.S3:
-                src = str(Path(src).expanduser().resolve())
                 dst = dst.replace("s3://", "")
 
-                if os.path.isdir(src):
-                    raise NotImplementedError("Directory upload is not implemented")
+                if glob.has_magic(src) or os.path.isdir(os.path.expanduser(src)):
+                    return self._upload_many(src, dst, skip_unchanged)
 
-                self._s3.upload_file(src, self._bucket_name, dst)
+                src = str(Path(src).expanduser().resolve())
+
+                tracker = self._tracker(src, dst, os.path.getsize(src))
+                self._s3.upload_file(
+                    src,
+                    self._bucket_name,
+                    dst,
+                    Callback=tracker,
+                    Config=self._transfer_config,
+                )
+                return tracker.done()
             case PathType.S3, PathType.LOCAL:
                 src = src.replace("s3://", "")
                 dst = str(Path(dst).expanduser().resolve())
 
-                self._s3.download_file(self._bucket_name, src, dst)
+                if src.endswith("/"):
+                    return self._download_prefix(src, dst, skip_unchanged)
+
+                head = self._s3.head_object(Bucket=self._bucket_name, Key=src)
+                tracker = self._tracker(src, dst, head["ContentLength"])
+                self._s3.download_file(
+                    self._bucket_name,
+                    src,
+                    dst,
+                    Callback=tracker,
+                    Config=self._transfer_config,
+                )
+                return tracker.done()
 
             # TuringDB <-> S3
             case PathType.TURINGDB, PathType.S3:
@@ -94,13 +340,17 @@ class S3Client:
                 if os.path.isdir(src):
                     raise NotImplementedError("Directory upload is not implemented")
 
-                query = f'S3 PUSH "{src}" "{dst}"'
+                tracker = self._tracker(src, dst)
+                query = render_query("S3 PUSH $src $dst", {"src": src, "dst": dst})
                 self._query_protocol.query(query)
+                return tracker.done()
             case PathType.S3, PathType.TURINGDB:
                 src = src.replace("s3://", f"s3://{self._bucket_name}/")
                 dst = dst.replace("turingdb://", "")
-                query = f'S3 PULL "{src}" "{dst}"'
+                tracker = self._tracker(src, dst)
+                query = render_query("S3 PULL $src $dst", {"src": src, "dst": dst})
                 self._query_protocol.query(query)
+                return tracker.done()
 
             # TuringDB <-> Local
             case PathType.LOCAL, PathType.TURINGDB:
@@ -111,13 +361,16 @@ class S3Client:
 
                 s3_path = f"s3://{self._scratch_folder}/{uuid.uuid4().hex}"
 
+                tracker = self._tracker(src, dst)
+
                 try:
-                    self.transfer(src, s3_path)
+                    stats = self.transfer(src, s3_path)
                     self.transfer(s3_path, dst)
                 finally:
-                    self._s3_bucket.objects.filter(
-                        Prefix=f"{self._scratch_folder}/"
-                    ).delete()
+                    self._cleanup_scratch(s3_path.replace("s3://", ""))
+
+                tracker.stats.total_bytes = stats.total_bytes
+                return tracker.done()
 
             case PathType.TURINGDB, PathType.LOCAL:
                 if not self._use_scratch:
@@ -127,10 +380,256 @@ class S3Client:
 
                 s3_path = f"s3://{self._scratch_folder}/{uuid.uuid4().hex}"
 
+                tracker = self._tracker(src, dst)
+
                 try:
                     self.transfer(src, s3_path)
-                    self.transfer(s3_path, dst)
+                    stats = self.transfer(s3_path, dst)
                 finally:
-                    self._s3_bucket.objects.filter(
-                        Prefix=f"{self._scratch_folder}/"
-                    ).delete()
+                    self._cleanup_scratch(s3_path.replace("s3://", ""))
+
+                tracker.stats.total_bytes = stats.total_bytes
+                return tracker.done()
+
+    def _cleanup_scratch(self, prefix: str):
+        match self._scratch_cleanup:
+            case "immediate":
+                self._delete_prefixes([prefix])
+            case "background":
+                self._background_queue().put(prefix)
+            case "expire":
+                pass
+
+    def _background_queue(self) -> "queue.Queue[str]":
+        import queue
+
+        with self._lock:
+            if self._scratch_queue is None:
+                self._scratch_queue = queue.Queue()
+                threading.Thread(
+                    target=self._delete_scratch_loop,
+                    name="turingdb-scratch-cleanup",
+                    daemon=True,
+                ).start()
+
+        return self._scratch_queue
+
+    def _delete_scratch_loop(self):
+        import logging
+
+        assert self._scratch_queue is not None
+        scratch_queue = self._scratch_queue
+
+        while True:
+            prefixes = [scratch_queue.get()]
+            while not scratch_queue.empty() and len(prefixes) < 1000:
+                prefixes.append(scratch_queue.get_nowait())
+
+            try:
+                self._delete_prefixes(prefixes)
+            except Exception as e:
+                # Left to the lifecycle rules, if any, and reported by flush_scratch()
+                logging.getLogger(__name__).warning(
+                    "Could not delete the scratch prefixes %s: %s", ", ".join(prefixes), e
+                )
+                with self._lock:
+                    self._scratch_failures.extend(prefixes)
+            finally:
+                for _ in prefixes:
+                    scratch_queue.task_done()
+
+    def _delete_prefixes(self, prefixes: list[str]):
+        """Deletes the objects under the prefixes, 1000 per request"""
+
+        keys = [
+            {"Key": obj.key}
+            for prefix in prefixes
+            for obj in self._s3_bucket.objects.filter(Prefix=prefix)
+        ]
+
+        for i in range(0, len(keys), 1000):
+            self._s3.delete_objects(
+                Bucket=self._bucket_name,
+                Delete={"Objects": keys[i:i + 1000], "Quiet": True},
+            )
+
+    def _upload_many(self, src: str, dst: str, skip_unchanged: bool) -> TransferStats:
+        import glob
+        from pathlib import Path
+
+        pattern = os.path.expanduser(src)
+
+        if glob.has_magic(pattern):
+            # Keys are relative to the deepest directory without wildcards
+            parts = Path(pattern).parts
+            root = Path(*parts[: next(i for i, p in enumerate(parts) if glob.has_magic(p))])
+            paths = [Path(p) for p in glob.glob(pattern, recursive=True)]
+        else:
+            root = Path(pattern)
+            paths = list(root.rglob("*"))
+
+        prefix = f"{dst.rstrip('/')}/" if dst.strip("/") else ""
+        files = [
+            (str(path), prefix + path.relative_to(root).as_posix(), path.stat().st_size)
+            for path in paths
+            if path.is_file()
+        ]
+
+        remote = self._list_objects(prefix) if skip_unchanged else {}
+
+        def upload(path: str, key: str, size: int, tracker: _ProgressTracker):
+            if key in remote and self._is_unchanged(path, size, remote[key]):
+                tracker.skip()
+                return
+
+            self._s3.upload_file(
+                path,
+                self._bucket_name,
+                key,
+                Callback=tracker,
+                Config=self._transfer_config,
+            )
+
+        return self._run_many(src, dst, files, upload)
+
+    def _copy_prefix(self, src: str, dst: str, skip_unchanged: bool) -> TransferStats:
+        prefix = f"{dst.rstrip('/')}/" if dst.strip("/") else ""
+        sources = self._list_objects(src)
+        remote = self._list_objects(prefix) if skip_unchanged else {}
+
+        files = [
+            (key, prefix + key[len(src):], size)
+            for key, (size, _) in sources.items()
+            if not key.endswith("/")
+        ]
+
+        def copy(key: str, dst_key: str, size: int, tracker: _ProgressTracker):
+            # Only copies below the multipart threshold keep the ETag of their source
+            if remote.get(dst_key) == sources[key]:
+                tracker.skip()
+                return
+
+            self._copy(key, dst_key, tracker)
+
+        return self._run_many(src, dst, files, copy)
+
+    def _copy(self, src: str, dst: str, tracker: _ProgressTracker):
+        """
+        Server-side copy, split in parallel upload_part_copy requests above
+        the multipart threshold
+        """
+
+        self._s3.copy(
+            {"Bucket": self._bucket_name, "Key": src},
+            self._bucket_name,
+            dst,
+            Callback=tracker,
+            Config=self._transfer_config,
+        )
+
+    def _download_prefix(self, src: str, dst: str, skip_unchanged: bool) -> TransferStats:
+        remote = self._list_objects(src)
+        files = [
+            (_download_path(dst, key, key[len(src):]), key, size)
+            for key, (size, _) in remote.items()
+            if not key.endswith("/")
+        ]
+
+        def download(path: str, key: str, size: int, tracker: _ProgressTracker):
+            if (
+                skip_unchanged
+                and os.path.isfile(path)
+                and self._is_unchanged(path, size, remote[key])
+            ):
+                tracker.skip()
+                return
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._s3.download_file(
+                self._bucket_name,
+                key,
+                path,
+                Callback=tracker,
+                Config=self._transfer_config,
+            )
+
+        return self._run_many(src, dst, files, download)
+
+    def _run_many(
+        self,
+        src: str,
+        dst: str,
+        files: list[tuple[str, str, int]],
+        transfer: Callable[[str, str, int, _ProgressTracker], None],
+    ) -> TransferStats:
+        from concurrent.futures import ThreadPoolExecutor
+
+        tracker = self._tracker(src, dst, sum(size for _, _, size in files))
+        tracker.stats.files = len(files)
+        tracker.stats.bytes_transferred = 0
+
+        with ThreadPoolExecutor(max_workers=self._max_files) as executor:
+            futures = [
+                executor.submit(transfer, path, key, size, tracker)
+                for path, key, size in files
+            ]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return tracker.done()
+
+    def _list_objects(self, prefix: str) -> dict[str, tuple[int, str]]:
+        """Size and ETag of the objects under a prefix"""
+
+        paginator = self._s3.get_paginator("list_objects_v2")
+        objects = {}
+
+        for page in paginator.paginate(Bucket=self._bucket_name, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                objects[obj["Key"]] = (obj["Size"], obj["ETag"].strip('"'))
+
+        return objects
+
+    def _is_unchanged(self, path: str, size: int, remote: tuple[int, str]) -> bool:
+        remote_size, remote_etag = remote
+        if os.path.getsize(path) != remote_size:
+            return False
+
+        return self._local_etag(path, size) == remote_etag
+
+    def _local_etag(self, path: str, size: int) -> str:
+        """
+        ETag that S3 gives to a file uploaded with this client's transfer
+        config: the MD5 of the file, or the MD5 of the MD5s of its parts
+        """
+        import hashlib
+
+        from s3transfer.utils import ChunksizeAdjuster
+
+        config = self._transfer_config
+
+        if size < config.multipart_threshold:
+            md5 = hashlib.md5(usedforsecurity=False)
+            with open(path, "rb") as f:
+                while block := f.read(config.multipart_chunksize):
+                    md5.update(block)
+            return md5.hexdigest()
+
+        chunksize = ChunksizeAdjuster().adjust_chunksize(config.multipart_chunksize, size)
+        digests = []
+        with open(path, "rb") as f:
+            while block := f.read(chunksize):
+                digests.append(hashlib.md5(block, usedforsecurity=False).digest())
+
+        etag = hashlib.md5(b"".join(digests), usedforsecurity=False).hexdigest()
+        return f"{etag}-{len(digests)}"
+
+    def _tracker(
+        self, src: str, dst: str, total_bytes: Optional[int] = None
+    ) -> _ProgressTracker:
+        return _ProgressTracker(TransferStats(src, dst, total_bytes), self._progress)
@@ -1,8 +1,37 @@
+from .cypher import render_query as render_query
 from .exceptions import TuringDBException as TuringDBException
-from .path import PathType as PathType
+from .path import MiB as MiB, PathType as PathType
 from .protocol import QueryProtocol as QueryProtocol
+from _typeshed import Incomplete
+from dataclasses import dataclass
+from typing import Callable
+
+ScratchCleanup: Incomplete
+SCRATCH_RULE_ID: str
+
+@dataclass
+class TransferStats:
+    src: str
+    dst: str
+    total_bytes: int | None = ...
+    bytes_transferred: int | None = ...
+    elapsed: float = ...
+    files: int = ...
+    skipped_files: int = ...
+    @property
+    def throughput(self) -> float | None: ...
+
+@dataclass
+class _ProgressTracker:
+    stats: TransferStats
+    progress: Callable[[TransferStats], None] | None = ...
+    def __call__(self, bytes_amount: int): ...
+    def skip(self) -> None: ...
+    def done(self) -> TransferStats: ...
 
 class S3Client:
-    def __init__(self, bucket_name: str, access_key: str | None = None, secret_key: str | None = None, region: str | None = None, use_scratch: bool = True) -> None: ...
+    def __init__(self, bucket_name: str, access_key: str | None = None, secret_key: str | None = None, region: str | None = None, use_scratch: bool = True, multipart_threshold: int = ..., multipart_chunksize: int = ..., max_concurrency: int = 16, progress: Callable[[TransferStats], None] | None = None, max_files: int = 8, scratch_cleanup: ScratchCleanup = 'immediate', scratch_expiration_days: int | None = None) -> None: ...
     def connect(self, query_protocol: QueryProtocol): ...
-    def transfer(self, src: str, dst: str): ...
+    def expire_scratch_after(self, days: int): ...
+    def flush_scratch(self) -> None: ...
+    def transfer(self, src: str, dst: str, skip_unchanged: bool = True, target: QueryProtocol | None = None) -> TransferStats: ...
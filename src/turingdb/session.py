@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Literal, Mapping, Optional
+
+from .batch import BatchQuery, BatchResult
+from .cypher import render_query
+from .results import ResultFormat
+from .timing import QueryTiming
+
+if TYPE_CHECKING:
+    from .turingdb import TuringDB
+
+
+@dataclass(frozen=True)
+class Session:
+    """
+    Immutable view of a TuringDB client on a graph, change and commit.
+
+    Sessions share the connection pool of their client and hold no mutable
+    state, so one client can serve any number of threads. Every call
+    carries its own timing, see query_timed().
+    """
+
+    client: "TuringDB" = field(repr=False, compare=False)
+    graph: str = "default"
+    change: int | str = "main"
+    commit: str = "HEAD"
+
+    def __post_init__(self):
+        if isinstance(self.change, int):
+            object.__setattr__(self, "change", f"{self.change:x}")
+
+    @property
+    def params(self) -> dict[str, str]:
+        params = {"graph": self.graph}
+
+        if self.commit != "HEAD":
+            params["commit"] = self.commit
+
+        if self.change != "main":
+            params["change"] = str(self.change)
+
+        return params
+
+    def with_graph(self, graph_name: str) -> "Session":
+        return replace(self, graph=graph_name)
+
+    def checkout(
+        self, change: int | str | Literal["main"] = "main", commit: str = "HEAD"
+    ) -> "Session":
+        return replace(self, change=change, commit=commit)
+
+    def query(
+        self,
+        query: str,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ):
+        return self.query_timed(query, raw, result_format, params)[0]
+
+    def query_timed(
+        self,
+        query: str,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> tuple[Any, QueryTiming]:
+        query = render_query(query, params)
+        return self.client._query(query, self.params, raw, result_format)
+
+    def query_batch(
+        self,
+        queries: Iterable[BatchQuery],
+        stop_on_error: bool = True,
+        max_concurrency: int = 8,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ) -> list[BatchResult]:
+        return self.client._query_batch(
+            queries, self.params, stop_on_error, max_concurrency, raw, result_format
+        )
+
+    def query_stream(
+        self,
+        query: str,
+        chunk_rows: Optional[int] = None,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator:
+        return self.client._query_stream(
+            render_query(query, params), self.params, chunk_rows, result_format
+        )
+
+    def iter_query(
+        self,
+        query: str,
+        page_size: int = 100_000,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        commit: Optional[str] = None,
+    ) -> Iterator:
+        return self.client._iter_query(
+            render_query(query, params), self.params, page_size, result_format, commit
+        )
+
+    def is_graph_loaded(self) -> bool:
+        return self.client._is_graph_loaded(self.graph)
+
+    def new_change(self) -> "Session":
+        """Creates a change and returns a session working on it"""
+        change = self.client._new_change(self.params)
+        return self.checkout(change=str(change))
@@ -0,0 +1,26 @@
+from .batch import BatchQuery as BatchQuery, BatchResult as BatchResult
+from .cypher import render_query as render_query
+from .results import ResultFormat as ResultFormat
+from .timing import QueryTiming as QueryTiming
+from .turingdb import TuringDB as TuringDB
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Literal, Mapping
+
+@dataclass(frozen=True)
+class Session:
+    client: TuringDB = field(repr=False, compare=False)
+    graph: str = ...
+    change: int | str = ...
+    commit: str = ...
+    def __post_init__(self) -> None: ...
+    @property
+    def params(self) -> dict[str, str]: ...
+    def with_graph(self, graph_name: str) -> Session: ...
+    def checkout(self, change: int | str | Literal['main'] = 'main', commit: str = 'HEAD') -> Session: ...
+    def query(self, query: str, raw: bool = False, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None): ...
+    def query_timed(self, query: str, raw: bool = False, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None) -> tuple[Any, QueryTiming]: ...
+    def query_batch(self, queries: Iterable[BatchQuery], stop_on_error: bool = True, max_concurrency: int = 8, raw: bool = False, result_format: ResultFormat | None = None) -> list[BatchResult]: ...
+    def query_stream(self, query: str, chunk_rows: int | None = None, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None) -> Iterator: ...
+    def iter_query(self, query: str, page_size: int = 100000, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None, commit: str | None = None) -> Iterator: ...
+    def is_graph_loaded(self) -> bool: ...
+    def new_change(self) -> Session: ...
@@ -0,0 +1,118 @@
+import re
+from typing import Optional
+
+_TOKENS = re.compile(rb'[\[\]{}"\\]')
+_STRING_TOKENS = re.compile(rb'["\\]')
+_DATA_KEY = re.compile(rb'"data"\s*:\s*$')
+
+
+class ChunkStreamParser:
+    """
+    Incremental parser for query responses laid out as
+    {"header": {...}, "data": [chunk, ...], "time": ...}
+
+    Bytes are fed as they arrive, and every chunk of the data array is
+    returned as soon as it is complete. Only the current partial chunk is
+    kept in memory, the rest of the top-level object is parsed by finish().
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._prefix: Optional[bytes] = None
+        self._in_data = False
+        self._chunk_start: Optional[int] = None
+        self.header: Optional[dict] = None
+
+    def feed(self, data: bytes | bytearray | memoryview) -> list[list]:
+        import orjson
+
+        buf = self._buffer
+        buf += data
+        chunks = []
+
+        while True:
+            if self._in_string:
+                m = _STRING_TOKENS.search(buf, self._pos)
+                if m is None:
+                    self._pos = len(buf)
+                    break
+
+                i = m.start()
+                if buf[i] == 0x5C:  # backslash, skip the escaped character
+                    if i + 1 >= len(buf):
+                        self._pos = i
+                        break
+                    self._pos = i + 2
+                    continue
+
+                self._in_string = False
+                self._pos = i + 1
+                continue
+
+            m = _TOKENS.search(buf, self._pos)
+            if m is None:
+                self._pos = len(buf)
+                break
+
+            i = m.start()
+            c = buf[i]
+            self._pos = i + 1
+
+            if c == 0x22:  # "
+                self._in_string = True
+            elif c == 0x5B or c == 0x7B:  # [ {
+                self._depth += 1
+                if (
+                    self._depth == 2
+                    and c == 0x5B
+                    and self._prefix is None
+                    and _DATA_KEY.search(buf, 0, i)
+                ):
+                    self._start_data(bytes(buf[:i]))
+                elif self._depth == 3 and self._in_data:
+                    self._chunk_start = i
+            else:  # ] }
+                self._depth -= 1
+                if self._in_data:
+                    if self._depth == 2 and self._chunk_start is not None:
+                        view = memoryview(buf)
+                        chunks.append(orjson.loads(view[self._chunk_start:i + 1]))
+                        view.release()
+                        self._chunk_start = None
+                    elif self._depth == 1:
+                        self._in_data = False
+                        del buf[:i + 1]
+                        self._pos = 0
+
+        if self._in_data:
+            # Drop everything before the chunk currently being received
+            cut = self._chunk_start if self._chunk_start is not None else self._pos
+            del buf[:cut]
+            self._pos -= cut
+            if self._chunk_start is not None:
+                self._chunk_start = 0
+
+        return chunks
+
+    def finish(self):
+        """Parses the top-level object, with "data" left out"""
+        import orjson
+
+        if self._prefix is None:
+            return orjson.loads(self._buffer)
+
+        return orjson.loads(self._prefix + b"null" + bytes(self._buffer))
+
+    def _start_data(self, prefix: bytes):
+        import orjson
+
+        self._prefix = prefix
+        self._in_data = True
+
+        try:
+            self.header = orjson.loads(prefix + b"null}").get("header")
+        except orjson.JSONDecodeError:
+            self.header = None
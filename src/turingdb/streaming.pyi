@@ -0,0 +1,5 @@
+class ChunkStreamParser:
+    header: dict | None
+    def __init__(self) -> None: ...
+    def feed(self, data: bytes | bytearray | memoryview) -> list[list]: ...
+    def finish(self): ...
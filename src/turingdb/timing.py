@@ -0,0 +1,116 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+# Phases of a request, in order
+PHASES = ("connect", "upload", "server", "download", "decode", "build")
+
+# httpcore trace events, e.g. "http11.send_request_body.started", per phase
+TRACE_PHASES = {
+    "connect_tcp": "connect",
+    "connect_unix_socket": "connect",
+    "start_tls": "connect",
+    "send_connection_init": "connect",
+    "send_request_headers": "upload",
+    "send_request_body": "upload",
+    "receive_response_headers": "server",
+    "receive_response_body": "download",
+}
+
+
+@dataclass
+class QueryTiming:
+    """
+    Timing of a single request, in milliseconds. `phases` holds the time
+    spent connecting, uploading the request, waiting for the server,
+    downloading, decoding the response and building the result. Phases are
+    summed over the attempts of retried and hedged requests. `query` is the
+    query text, with the credentials of S3 CONNECT redacted.
+    """
+
+    total_exec_time: Optional[float] = None
+    query_exec_time: Optional[float] = None
+    cached: bool = False
+    attempts: int = 1
+    hedged: bool = False
+    endpoint: Optional[str] = None
+    query: Optional[str] = None
+    phases: dict[str, float] = field(default_factory=dict)
+    # Wall clock start, in nanoseconds since the epoch, for exporters
+    started_at: int = field(default_factory=time.time_ns, repr=False, compare=False)
+    _t0: int = field(default_factory=time.perf_counter_ns, repr=False, compare=False)
+    _extents: dict[str, tuple[int, int]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+
+    def stop(self):
+        self.total_exec_time = (time.perf_counter_ns() - self._t0) / 1e6
+
+    def add_phase(self, phase: str, start_ns: int, end_ns: int):
+        """Adds a perf_counter_ns interval to a phase"""
+
+        self.phases[phase] = self.phases.get(phase, 0.0) + (end_ns - start_ns) / 1e6
+
+        first, last = self._extents.get(phase, (start_ns, end_ns))
+        self._extents[phase] = (min(first, start_ns), max(last, end_ns))
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add_phase(phase, start, time.perf_counter_ns())
+
+    def spans(self) -> list[tuple[str, int, int]]:
+        """
+        First start and last end of each phase, in nanoseconds since the
+        epoch. Streamed phases interleave, so their spans overlap.
+        """
+
+        spans = [
+            (phase, self.started_at + first - self._t0, self.started_at + last - self._t0)
+            for phase, (first, last) in self._extents.items()
+        ]
+        return sorted(spans, key=lambda span: span[1])
+
+    def end_ns(self) -> int:
+        """End of the request, in nanoseconds since the epoch"""
+
+        if self.total_exec_time is None:
+            return time.time_ns()
+        return self.started_at + int(self.total_exec_time * 1e6)
+
+    def tracer(self) -> Callable[[str, Any], None]:
+        """httpx "trace" extension of a request, a new one per request"""
+
+        started: dict[str, int] = {}
+
+        def trace(event_name: str, info: Any):
+            self._trace_event(started, event_name)
+
+        return trace
+
+    def async_tracer(self) -> Callable[[str, Any], Any]:
+        """Same as tracer(), for httpx.AsyncClient"""
+
+        started: dict[str, int] = {}
+
+        async def trace(event_name: str, info: Any):
+            self._trace_event(started, event_name)
+
+        return trace
+
+    def _trace_event(self, started: dict[str, int], event_name: str):
+        step, _, state = event_name.rpartition(".")
+        step = step.partition(".")[2]
+
+        phase = TRACE_PHASES.get(step)
+        if phase is None:
+            return
+
+        if state == "started":
+            started[step] = time.perf_counter_ns()
+        elif step in started:
+            self.add_phase(phase, started.pop(step), time.perf_counter_ns())
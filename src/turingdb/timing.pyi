@@ -0,0 +1,28 @@
+import time
+from _typeshed import Incomplete
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+PHASES: Incomplete
+TRACE_PHASES: Incomplete
+
+@dataclass
+class QueryTiming:
+    total_exec_time: float | None = ...
+    query_exec_time: float | None = ...
+    cached: bool = ...
+    attempts: int = ...
+    hedged: bool = ...
+    endpoint: str | None = ...
+    query: str | None = ...
+    phases: dict[str, float] = field(default_factory=dict)
+    started_at: int = field(default_factory=time.time_ns, repr=False, compare=False)
+    def stop(self) -> None: ...
+    def add_phase(self, phase: str, start_ns: int, end_ns: int): ...
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]: ...
+    def spans(self) -> list[tuple[str, int, int]]: ...
+    def end_ns(self) -> int: ...
+    def tracer(self) -> Callable[[str, Any], None]: ...
+    def async_tracer(self) -> Callable[[str, Any], Any]: ...
@@ -1,72 +1,155 @@
+import threading
 import time
-from typing import Literal, Optional
-
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, Optional
+
+from .base import TuringDBBase
+from .compression import Compression
+from .cypher import (
+    check_identifier,
+    check_pageable,
+    page_query,
+    redact_query,
+    render_query,
+)
 from .exceptions import TuringDBException
-from .s3 import S3Client
-
-
-class TuringDB:
-    DEFAULT_HEADERS = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-
+from .path import MiB
+from .results import (
+    ResultBuilder,
+    ResultFormat,
+    check_result_format,
+    result_row_count,
+)
+from .wire import WireFormat
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .batch import BatchQuery, BatchResult
+    from .bulk import BulkStats, BulkWriter, Rows
+    from .cache import DiskResultCache, ResultCache
+    from .observers import QueryObserver
+    from .retry import HedgePolicy, RetryPolicy
+    from .s3 import ScratchCleanup, TransferStats
+    from .session import Session
+    from .timing import QueryTiming
+
+
+class TuringDB(TuringDBBase):
     def __init__(
         self,
         instance_id: str = "",
         auth_token: str = "",
         host: str = "https://engines.turingdb.ai/sdk",
         timeout: Optional[int] = None,
+        result_format: ResultFormat = "pandas",
+        wire_format: WireFormat = "json",
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        result_cache: Optional["ResultCache"] = None,
+        disk_cache: Optional["DiskResultCache"] = None,
+        compression: Optional[Compression] = None,
+        compress_requests_over: Optional[int] = None,
+        retry: Optional["RetryPolicy"] = None,
+        hedge: Optional["HedgePolicy"] = None,
+        observers: Optional[Iterable["QueryObserver"]] = None,
     ):
-        import copy
-
         import httpx
 
-        self.host = host
-        self._client = httpx.Client(
-            auth=None,
-            verify=False,
+        super().__init__(
+            instance_id=instance_id,
+            auth_token=auth_token,
+            host=host,
             timeout=timeout,
+            result_format=result_format,
+            wire_format=wire_format,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            result_cache=result_cache,
+            disk_cache=disk_cache,
+            compression=compression,
+            compress_requests_over=compress_requests_over,
+            retry=retry,
+            hedge=hedge,
+            observers=observers,
         )
-        self._s3_client: Optional[S3Client] = None
-        self._query_exec_time: Optional[float] = None
-        self._total_exec_time: Optional[float] = None
-        self._t0: float = 0
-        self._t1: float = 0
-        self._timeout = timeout
-
-        self._params = {
-            "graph": "default",
-        }
-
-        self._headers = copy.deepcopy(TuringDB.DEFAULT_HEADERS)
 
-        if instance_id != "":
-            self._headers["Turing-Instance-Id"] = instance_id
+        self._client = httpx.Client(**self._client_options())
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_lock = threading.Lock()
 
-        if auth_token != "":
-            self._headers["Authorization"] = f"Bearer {auth_token}"
+    def session(
+        self,
+        graph: Optional[str] = None,
+        change: Optional[int | str] = None,
+        commit: Optional[str] = None,
+    ) -> "Session":
+        """
+        Returns an immutable view of the client on a graph, change and commit,
+        sharing its connection pool. Arguments left to None default to the
+        client's current graph, change and commit.
+        """
+        from .session import Session
+
+        return Session(
+            self,
+            graph=graph if graph is not None else self.current_graph,
+            change=change if change is not None else self.current_change,
+            commit=commit if commit is not None else self.current_commit,
+        )
 
     def try_reach(self, timeout: int = 5):
-        self._client.timeout = timeout
-        self.list_available_graphs()
-        self._client.timeout = self._timeout
+        self._send_request("list_avail_graphs", timeout=timeout)
 
     def warmup(self, timeout: int = 5):
-        self._client.timeout = timeout
-        self.query("LIST GRAPH")
-        self._client.timeout = self._timeout
+        self._query("LIST GRAPH", self._params, timeout=timeout)
+
+    def prepare(
+        self,
+        graphs: Iterable[str] = (),
+        connections: int = 1,
+        timeout: float = 300.0,
+        poll_interval: float = 0.05,
+    ):
+        """
+        Opens `connections` pooled connections concurrently, up to the pool's
+        keep-alive limit, and loads `graphs` in parallel, then polls until
+        the server reports them loaded, with backoff starting at
+        `poll_interval` seconds. Returns once the client is ready to serve
+        queries, or raises TuringDBException after `timeout` seconds.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        graphs = list(graphs)
+        deadline = time.monotonic() + timeout
+        connections = self._warm_connection_count(connections)
+        # Each connection is held until all are open, so that none is reused
+        barrier = threading.Barrier(connections, timeout=timeout)
+
+        with ThreadPoolExecutor(max_workers=connections + len(graphs)) as executor:
+            futures = [
+                executor.submit(self._open_connection, barrier)
+                for _ in range(connections)
+            ]
+            futures += [
+                executor.submit(self._load_and_wait, graph, deadline, poll_interval)
+                for graph in graphs
+            ]
+
+            for future in futures:
+                future.result()
 
     def list_available_graphs(self) -> list[str]:
-        return self._send_request("list_avail_graphs")["data"]
+        return self._send_request("list_avail_graphs", idempotent=True)["data"]
 
     def list_loaded_graphs(self) -> list[str]:
-        return self._send_request("list_loaded_graphs")["data"][0][0]
+        return self._send_request("list_loaded_graphs", idempotent=True)["data"][0][0]
 
     def is_graph_loaded(self) -> bool:
-        return self._send_request(
-            "is_graph_loaded", params={"graph": self.get_graph()}
-        )["data"]
+        return self._is_graph_loaded(self.get_graph())
 
     def load_graph(self, graph_name: str, raise_if_loaded: bool = True):
         try:
@@ -76,55 +159,136 @@ class TuringDB:
                 raise e
 
     def create_graph(self, graph_name: str):
+        check_identifier(graph_name)
         return self.query(f"create graph {graph_name}")
 
-    def query(self, query: str):
-        json = self._send_request("query", data=query, params=self._params)
-
-        if not isinstance(json, dict):
-            raise TuringDBException("Invalid response from the server")
+    def query(
+        self,
+        query: str,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ):
+        """
+        Runs a query. `params` gives the values of its $parameters, which are
+        sent as escaped literals.
+        """
+        return self._query(render_query(query, params), self._params, raw, result_format)[0]
 
-        return self._parse_chunks(json)
+    def query_batch(
+        self,
+        queries: Iterable["BatchQuery"],
+        graph: Optional[str] = None,
+        stop_on_error: bool = True,
+        max_concurrency: int = 8,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ) -> list["BatchResult"]:
+        """
+        Runs many queries over the pooled connections, with at most
+        `max_concurrency` requests in flight, and returns one BatchResult per
+        query in order. Queries are not ordered against each other, use
+        max_concurrency=1 for statements that depend on the previous ones.
+        Queries can be (query, params) pairs, see query().
+
+        With `stop_on_error`, the first failure cancels the queries that have
+        not started and is raised. Otherwise every failure is reported in the
+        `error` of its BatchResult.
+        """
+
+        params = self.session(graph=graph).params
+        return self._query_batch(
+            queries, params, stop_on_error, max_concurrency, raw, result_format
+        )
 
-    def set_commit(self, commit: str):
-        self._params["commit"] = commit
+    def query_stream(
+        self,
+        query: str,
+        chunk_rows: Optional[int] = None,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Iterator:
+        """
+        Yields the result of a query while the response is being received,
+        in the client's result format ("pyarrow" yields record batches).
+        One frame is yielded per server chunk, unless `chunk_rows` regroups
+        the rows into frames of that size.
+        """
+
+        return self._query_stream(
+            render_query(query, params), self._params, chunk_rows, result_format
+        )
 
-    def set_change(self, change: int | str):
-        if isinstance(change, int):
-            change = f"{change:x}"
-        self._params["change"] = change
+    def iter_query(
+        self,
+        query: str,
+        page_size: int = 100_000,
+        result_format: Optional[ResultFormat] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        commit: Optional[str] = None,
+    ) -> Iterator:
+        """
+        Yields the result of a read query in pages of `page_size` rows,
+        fetched with SKIP/LIMIT windows while the previous page is consumed.
+        The pages are read from `commit`, by default the checked out commit,
+        or the latest one when on HEAD, so that changes submitted meanwhile
+        do not shift them. Add an ORDER BY for pages in a given order.
+        """
+
+        return self._iter_query(
+            render_query(query, params), self._params, page_size, result_format, commit
+        )
 
-    def checkout(self, change: int | Literal["main"] = "main", commit: str = "HEAD"):
-        if change == "main":
-            if "change" in self._params:
-                del self._params["change"]
-        else:
-            self.set_change(change)
+    def bulk_writer(
+        self,
+        graph: Optional[str] = None,
+        batch_bytes: int = 1024 * 1024,
+        batch_rows: Optional[int] = None,
+        max_concurrency: int = 1,
+        submit: bool = True,
+        batch_endpoints: int = 16,
+    ) -> "BulkWriter":
+        """Context manager writing nodes and edges in batches, see BulkWriter"""
+        from .bulk import BulkWriter
+
+        return BulkWriter(
+            self, graph, batch_bytes, batch_rows, max_concurrency, submit, batch_endpoints
+        )
 
-        if commit == "HEAD":
-            if "commit" in self._params:
-                del self._params["commit"]
-        else:
-            self.set_commit(commit)
+    def bulk_create(
+        self,
+        nodes: "Rows",
+        edges: Optional["Rows"] = None,
+        label: str = "Node",
+        edge_type: str = "EDGE",
+        key: str = "id",
+        source: str = "source",
+        target: str = "target",
+        graph: Optional[str] = None,
+        batch_bytes: int = 1024 * 1024,
+        batch_rows: Optional[int] = None,
+        max_concurrency: int = 1,
+        batch_endpoints: int = 16,
+    ) -> "BulkStats":
+        """
+        Creates a node per row of `nodes` and an edge per row of `edges`, in a
+        new change that is submitted at the end. Edges go from the node whose
+        `key` property is their `source` value to the one of their `target`.
+        """
+
+        with self.bulk_writer(
+            graph, batch_bytes, batch_rows, max_concurrency, batch_endpoints=batch_endpoints
+        ) as writer:
+            writer.add_nodes(nodes, label)
+            if edges is not None:
+                writer.add_edges(edges, edge_type, label, label, source, target, key)
+
+        return writer.stats
 
     def new_change(self) -> int:
-        if self._params.get("change") is not None:
-            raise TuringDBException("Cannot create a new change while working on one")
-
-        if self._params.get("commit") is not None:
-            raise TuringDBException("Cannot create a new change while working on a commit")
-
-        res = self.query("CHANGE NEW")
-        self._params["change"] = res.values["changeID"][0]
+        self._params["change"] = self._new_change(self._params)
         return self._params["change"]
 
-
-    def set_graph(self, graph_name: str):
-        self._params["graph"] = graph_name
-
-    def get_graph(self) -> str:
-        return self._params["graph"]
-
     def s3_connect(
         self,
         bucket_name: str,
@@ -132,110 +296,440 @@ class TuringDB:
         secret_key: Optional[str] = None,
         region: Optional[str] = None,
         use_scratch: bool = True,
+        multipart_threshold: int = 64 * MiB,
+        multipart_chunksize: int = 64 * MiB,
+        max_concurrency: int = 16,
+        progress: Optional[Callable[["TransferStats"], None]] = None,
+        max_files: int = 8,
+        scratch_cleanup: "ScratchCleanup" = "immediate",
+        scratch_expiration_days: Optional[int] = None,
     ):
+        """
+        Connects the server and this client to an S3 bucket. See S3Client
+        for the transfer options.
+        """
         from .s3 import S3Client
 
         self._s3_client = S3Client(
-            bucket_name, access_key, secret_key, region, use_scratch
+            bucket_name,
+            access_key,
+            secret_key,
+            region,
+            use_scratch,
+            multipart_threshold,
+            multipart_chunksize,
+            max_concurrency,
+            progress,
+            max_files,
+            scratch_cleanup,
+            scratch_expiration_days,
         )
         self._s3_client.connect(self)
 
-    def transfer(self, src: str, dst: str):
+    def transfer(
+        self,
+        src: str,
+        dst: str,
+        skip_unchanged: bool = True,
+        target: Optional["TuringDB"] = None,
+    ) -> "TransferStats":
+        """
+        Copies between local, s3:// and turingdb:// paths, see
+        S3Client.transfer(). turingdb:// to turingdb:// copies go to the
+        `target` client when given, which must be connected to the same bucket.
+        """
         if self._s3_client is None:
             raise TuringDBException("S3 client is not connected")
 
-        self._s3_client.transfer(src, dst)
+        return self._s3_client.transfer(src, dst, skip_unchanged, target)
+
+    def upload(
+        self,
+        local_path: str,
+        dst: str,
+        chunk_size: int = 8 * MiB,
+        compression: Optional[Compression] = None,
+        resume: bool = True,
+        progress: Optional[Callable[["TransferStats"], None]] = None,
+    ) -> "TransferStats":
+        """
+        Streams a local file to a turingdb:// path in chunks of `chunk_size`
+        bytes, without staging it in S3. Interrupted uploads continue from
+        the offset the server has received, unless `resume` is False.
+
+        Servers without the upload endpoints fall back to transfer(), through
+        the S3 bucket connected with s3_connect().
+        """
+        import httpx
+
+        from .upload import Upload
+
+        upload = Upload(
+            local_path, dst, self._headers, chunk_size, compression, resume, progress
+        )
+
+        try:
+            status = self._send_request(**upload.status_request())
+        except httpx.HTTPStatusError as e:
+            if not upload.is_unsupported(e.response.status_code):
+                raise
+            return self._upload_fallback(local_path, dst)
+
+        for request in upload.requests(status):
+            self._send_request(**request)
+
+        return upload.done()
+
+    def flush_scratch(self):
+        """
+        Waits until scratch objects deleted in the background are gone, and
+        raises a TuringDBException listing the ones that could not be deleted
+        """
+        if self._s3_client is not None:
+            self._s3_client.flush_scratch()
+
+    def _upload_fallback(self, local_path: str, dst: str) -> "TransferStats":
+        if self._s3_client is None:
+            raise TuringDBException(
+                "The server does not accept uploads, connect to S3 with s3_connect() "
+                "to transfer through the bucket"
+            )
+
+        return self._s3_client.transfer(local_path, dst)
+
+    def _open_connection(self, barrier: threading.Barrier):
+        request = self._client.build_request("POST", **self._build_request("list_avail_graphs"))
+        response = self._client.send(request, stream=True)
+
+        try:
+            response.raise_for_status()
+            # Reads the body without releasing the connection, unlike read()
+            for _ in response.stream:
+                pass
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            # Another connection failed and raises its error
+            pass
+        except BaseException:
+            barrier.abort()
+            raise
+        finally:
+            response.close()
+
+    def _load_and_wait(self, graph: str, deadline: float, poll_interval: float):
+        self.load_graph(graph, raise_if_loaded=False)
+        intervals = self._load_poll_intervals(graph, deadline, poll_interval)
+
+        while not self._is_graph_loaded(graph):
+            time.sleep(next(intervals))
 
     def _send_request(
         self,
         path: str,
-        data: Optional[dict | str] = None,
+        data: Optional[dict | str | bytes] = None,
         params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        timing: Optional["QueryTiming"] = None,
+        idempotent: bool = False,
     ):
-        import orjson
+        request, request_timing = self._start_request(
+            path, data, params, headers, timeout, timing
+        )
 
-        self._query_exec_time = None
-        self._total_exec_time = None
-        self._t0 = time.time()
+        if self._is_resilient(idempotent):
+            result = self._send_idempotent(request, request_timing)
+        else:
+            result = self._post(request, request_timing)
 
-        if data is None:
-            data = ""
+        self._finish_request(request_timing, owned=timing is None)
 
-        url = f"{self.host}/{path}"
+        return result
 
-        if isinstance(data, dict):
-            response = self._client.post(
-                url, json=data, params=params, headers=self._headers
-            )
-        else:
-            response = self._client.post(
-                url, content=data, params=params, headers=self._headers
-            )
-        response.raise_for_status()
+    def _send_idempotent(self, request: dict[str, Any], timing: "QueryTiming"):
+        attempt = 0
 
-        json = orjson.loads(response.text)
+        while True:
+            timing.attempts = attempt + 1
 
-        if isinstance(json, dict):
-            err = json.get("error")
-            if err is not None:
-                details = json.get("error_details")
-                if details is not None:
-                    err = f"{err}: {details}"
-                raise TuringDBException(err)
+            try:
+                return self._post_hedged(request, timing)
+            except Exception as e:
+                if self._retry is None or not self._retry.should_retry(e, attempt):
+                    raise
+                time.sleep(self._retry.delay(e, attempt))
+                attempt += 1
 
-        self._t1 = time.time()
-        self._total_exec_time = (self._t1 - self._t0) * 1000
+    def _post_hedged(self, request: dict[str, Any], timing: "QueryTiming"):
+        from concurrent.futures import FIRST_COMPLETED, wait
 
-        return json
+        delay = self._hedge.hedge_delay() if self._hedge is not None else None
+        if delay is None:
+            return self._post(request, timing)
 
-    def _parse_chunks(self, json: dict):
-        import pandas as pd
+        executor = self._hedge_executor()
+        first = executor.submit(self._post, request, timing)
 
-        self._query_exec_time = json["time"]
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
 
-        header = json["header"]
-        column_names = header["column_names"]
-        column_types = header["column_types"]
+        timing.hedged = True
+        pending = {first, executor.submit(self._post, request, timing)}
+        error: Optional[BaseException] = None
 
-        if len(column_names) != len(column_types):
-            raise Exception("Query response column names and types do not match")
+        # The first success wins, the slower request finishes in the background
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = error or future.exception()
 
-        dtype_map = {
-            "String": "string",
-            "Int64": "Int64",
-            "UInt64": "UInt64",
-            "Double": "float64",
-            "Bool": "boolean",
-        }
+        assert error is not None
+        raise error
 
-        df = pd.DataFrame()
+    def _post(self, request: dict[str, Any], timing: "QueryTiming"):
+        t0 = time.perf_counter()
+        response = self._client.post(**request, extensions={"trace": timing.tracer()})
 
-        for chunk in json["data"]:
-            df_chunk = pd.DataFrame({
-                cname: pd.Series(col, dtype=dtype_map.get(ctype, "object"))
-                for (cname, ctype), col in zip(zip(column_names, column_types), chunk)
-            })
-            df = pd.concat([df, df_chunk], ignore_index=True)
+        if self._hedge is not None and response.is_success:
+            self._hedge.record(time.perf_counter() - t0)
 
-        self._t1 = time.time()
-        self._total_exec_time = (self._t1 - self._t0) * 1000
+        return self._parse_response(response, timing)
 
-        return df
+    def _hedge_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
 
-    def get_query_exec_time(self) -> Optional[float]:
-        return self._query_exec_time
+        with self._hedge_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=self._limits["max_connections"] or 100,
+                    thread_name_prefix="turingdb-hedge",
+                )
 
-    def get_total_exec_time(self) -> Optional[float]:
-        return self._total_exec_time
+        return self._hedge_pool
 
-    @property
-    def current_graph(self) -> str:
-        return self._params["graph"]
+    def _query(
+        self,
+        query: str,
+        params: dict,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+        timeout: Optional[float] = None,
+        cache: bool = True,
+    ) -> tuple[Any, "QueryTiming"]:
+        entry, cached = self._query_from_cache(query, params, raw, result_format, cache)
+        if cached is not None:
+            return cached
+
+        request = self._query_request(query, params, timeout)
+        try:
+            result = self._send_request(**request)
+        finally:
+            # Failed writes may have been applied too
+            self._invalidate_unpinned(query, params)
+
+        return self._finish_query(entry, result, request["timing"], raw, result_format)
+
+    def _query_stream(
+        self,
+        query: str,
+        params: dict,
+        chunk_rows: Optional[int] = None,
+        result_format: Optional[ResultFormat] = None,
+    ) -> Iterator:
+        from .timing import QueryTiming
+
+        if chunk_rows is not None and chunk_rows < 1:
+            raise TuringDBException("chunk_rows must be at least 1")
+
+        result_format = result_format or self._result_format
+        check_result_format(result_format)
+
+        timing = QueryTiming(endpoint="query", query=redact_query(query))
+        self._record_timing(timing)
+
+        request = self._build_request("query", data=query, params=params)
+        builder: Optional[ResultBuilder] = None
+
+        for header, chunk in self._stream_chunks(request, timing):
+            if builder is None:
+                builder = ResultBuilder(header["column_names"], header["column_types"])
+
+            if chunk_rows is None:
+                builder.add_chunk(chunk)
+                yield self._build_frame(builder, result_format, timing)
+                builder = None
+                continue
+
+            size = len(chunk[0]) if chunk else 0
+            offset = 0
+
+            while offset < size:
+                take = min(chunk_rows - builder.row_count, size - offset)
+                builder.add_chunk([col[offset:offset + take] for col in chunk])
+                offset += take
+
+                if builder.row_count == chunk_rows:
+                    yield self._build_frame(builder, result_format, timing)
+                    builder = ResultBuilder(
+                        header["column_names"], header["column_types"]
+                    )
+
+        if builder is not None and builder.row_count > 0:
+            yield self._build_frame(builder, result_format, timing)
+
+        timing.stop()
+        self._notify(timing)
+
+    def _iter_query(
+        self,
+        query: str,
+        params: dict,
+        page_size: int = 100_000,
+        result_format: Optional[ResultFormat] = None,
+        commit: Optional[str] = None,
+    ) -> Iterator:
+        if page_size < 1:
+            raise TuringDBException("page_size must be at least 1")
+        check_pageable(query)
+
+        commit = commit or params.get("commit") or self._head_commit(params)
+        params = {**params, "commit": commit}
+
+        return self._iter_pages(query, params, page_size, result_format)
+
+    def _iter_pages(
+        self,
+        query: str,
+        params: dict,
+        page_size: int,
+        result_format: Optional[ResultFormat],
+    ) -> Iterator:
+        from concurrent.futures import ThreadPoolExecutor
+
+        def fetch(offset: int):
+            page = page_query(query, offset, page_size)
+            # Pages would fill the caches and evict the results they keep
+            return self._query(page, params, False, result_format, cache=False)[0]
+
+        # The next page is fetched while the current one is consumed
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="turingdb-page")
+        offset = 0
+
+        try:
+            future = executor.submit(fetch, offset)
+
+            while future is not None:
+                page = future.result()
+                rows = result_row_count(page)
+
+                offset += page_size
+                future = executor.submit(fetch, offset) if rows == page_size else None
+
+                if rows > 0:
+                    yield page
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _head_commit(self, params: dict) -> str:
+        history = self._query("CALL db.history()", params, raw=True)[0]
+        return self._parse_history(history, params["graph"])
+
+    def _query_batch(
+        self,
+        queries: Iterable["BatchQuery"],
+        params: dict,
+        stop_on_error: bool = True,
+        max_concurrency: int = 8,
+        raw: bool = False,
+        result_format: Optional[ResultFormat] = None,
+    ) -> list["BatchResult"]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        import httpx
+
+        from .batch import BatchResult, batch_query_text
+
+        if max_concurrency < 1:
+            raise TuringDBException("max_concurrency must be at least 1")
+
+        def run(query: "BatchQuery") -> "BatchResult":
+            query = batch_query_text(query)
+            try:
+                data, timing = self._query(query, params, raw, result_format)
+            except (TuringDBException, httpx.HTTPError) as e:
+                if stop_on_error:
+                    raise
+                return BatchResult(query, error=e)
+
+            return BatchResult(query, data, timing)
+
+        queries = list(queries)
+        executor = ThreadPoolExecutor(
+            max_workers=min(max_concurrency, max(len(queries), 1))
+        )
+
+        try:
+            futures = [executor.submit(run, query) for query in queries]
+            return [future.result() for future in futures]
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _is_graph_loaded(self, graph_name: str) -> bool:
+        return self._send_request(
+            "is_graph_loaded", params={"graph": graph_name}, idempotent=True
+        )["data"]
+
+    def _new_change(self, params: dict):
+        self._check_can_create_change(params)
+
+        res = self._query("CHANGE NEW", params, raw=True)[0]
+        return res["changeID"][0]
+
+    def _stream_chunks(
+        self, request: dict[str, Any], timing: "QueryTiming"
+    ) -> Iterator[tuple[dict, list]]:
+        from .streaming import ChunkStreamParser
+
+        parser = ChunkStreamParser()
+        pending = []
+
+        with self._client.stream(
+            "POST", **request, extensions={"trace": timing.tracer()}
+        ) as response:
+            response.raise_for_status()
+
+            for data in response.iter_bytes():
+                with timing.phase("decode"):
+                    chunks = parser.feed(data)
+
+                for chunk in chunks:
+                    if parser.header is None:
+                        # The header comes after the data, keep the chunks until the end
+                        pending.append(chunk)
+                    else:
+                        yield parser.header, chunk
+
+        with timing.phase("decode"):
+            json = parser.finish()
+        self._check_error(json)
+
+        if not isinstance(json, dict):
+            raise TuringDBException("Invalid response from the server")
+
+        for chunk in pending:
+            yield json["header"], chunk
+
+        timing.query_exec_time = json.get("time")
+
+    @staticmethod
+    def _build_frame(
+        builder: ResultBuilder, result_format: ResultFormat, timing: "QueryTiming"
+    ):
+        with timing.phase("build"):
+            if result_format == "pyarrow":
+                return builder.build_record_batch()
 
-    @property
-    def current_commit(self) -> str:
-        return self._params.get("commit") or "HEAD"
-   
-    @property
-    def current_change(self) -> str:
-        return self._params.get("change") or "main"
+            return builder.build_as(result_format)
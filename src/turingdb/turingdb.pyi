@@ -1,33 +1,39 @@
+from .base import TuringDBBase as TuringDBBase
+from .batch import BatchQuery as BatchQuery, BatchResult as BatchResult
+from .bulk import BulkStats as BulkStats, BulkWriter as BulkWriter, Rows as Rows
+from .cache import DiskResultCache as DiskResultCache, ResultCache as ResultCache
+from .compression import Compression as Compression
+from .cypher import check_identifier as check_identifier, check_pageable as check_pageable, page_query as page_query, redact_query as redact_query, render_query as render_query
 from .exceptions import TuringDBException as TuringDBException
-from .s3 import S3Client as S3Client
-from _typeshed import Incomplete
-from typing import Literal
+from .observers import QueryObserver as QueryObserver
+from .path import MiB as MiB
+from .results import ResultBuilder as ResultBuilder, ResultFormat as ResultFormat, check_result_format as check_result_format, result_row_count as result_row_count
+from .retry import HedgePolicy as HedgePolicy, RetryPolicy as RetryPolicy
+from .s3 import ScratchCleanup as ScratchCleanup, TransferStats as TransferStats
+from .session import Session as Session
+from .timing import QueryTiming as QueryTiming
+from .wire import WireFormat as WireFormat
+from typing import Any, Callable, Iterable, Iterator, Mapping
 
-class TuringDB:
-    DEFAULT_HEADERS: Incomplete
-    host: Incomplete
-    def __init__(self, instance_id: str = '', auth_token: str = '', host: str = 'https://engines.turingdb.ai/sdk', timeout: int | None = None) -> None: ...
+class TuringDB(TuringDBBase):
+    def __init__(self, instance_id: str = '', auth_token: str = '', host: str = 'https://engines.turingdb.ai/sdk', timeout: int | None = None, result_format: ResultFormat = 'pandas', wire_format: WireFormat = 'json', max_connections: int | None = 100, max_keepalive_connections: int | None = 20, keepalive_expiry: float | None = 5.0, http2: bool = False, result_cache: ResultCache | None = None, disk_cache: DiskResultCache | None = None, compression: Compression | None = None, compress_requests_over: int | None = None, retry: RetryPolicy | None = None, hedge: HedgePolicy | None = None, observers: Iterable['QueryObserver'] | None = None) -> None: ...
+    def session(self, graph: str | None = None, change: int | str | None = None, commit: str | None = None) -> Session: ...
     def try_reach(self, timeout: int = 5): ...
     def warmup(self, timeout: int = 5): ...
+    def prepare(self, graphs: Iterable[str] = (), connections: int = 1, timeout: float = 300.0, poll_interval: float = 0.05): ...
     def list_available_graphs(self) -> list[str]: ...
     def list_loaded_graphs(self) -> list[str]: ...
     def is_graph_loaded(self) -> bool: ...
     def load_graph(self, graph_name: str, raise_if_loaded: bool = True): ...
     def create_graph(self, graph_name: str): ...
-    def query(self, query: str): ...
-    def set_commit(self, commit: str): ...
-    def set_change(self, change: int | str): ...
-    def checkout(self, change: int | Literal['main'] = 'main', commit: str = 'HEAD'): ...
+    def query(self, query: str, raw: bool = False, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None): ...
+    def query_batch(self, queries: Iterable['BatchQuery'], graph: str | None = None, stop_on_error: bool = True, max_concurrency: int = 8, raw: bool = False, result_format: ResultFormat | None = None) -> list['BatchResult']: ...
+    def query_stream(self, query: str, chunk_rows: int | None = None, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None) -> Iterator: ...
+    def iter_query(self, query: str, page_size: int = 100000, result_format: ResultFormat | None = None, params: Mapping[str, Any] | None = None, commit: str | None = None) -> Iterator: ...
+    def bulk_writer(self, graph: str | None = None, batch_bytes: int = ..., batch_rows: int | None = None, max_concurrency: int = 1, submit: bool = True, batch_endpoints: int = 16) -> BulkWriter: ...
+    def bulk_create(self, nodes: Rows, edges: Rows | None = None, label: str = 'Node', edge_type: str = 'EDGE', key: str = 'id', source: str = 'source', target: str = 'target', graph: str | None = None, batch_bytes: int = ..., batch_rows: int | None = None, max_concurrency: int = 1, batch_endpoints: int = 16) -> BulkStats: ...
     def new_change(self) -> int: ...
-    def set_graph(self, graph_name: str): ...
-    def get_graph(self) -> str: ...
-    def s3_connect(self, bucket_name: str, access_key: str | None = None, secret_key: str | None = None, region: str | None = None, use_scratch: bool = True): ...
-    def transfer(self, src: str, dst: str): ...
-    def get_query_exec_time(self) -> float | None: ...
-    def get_total_exec_time(self) -> float | None: ...
-    @property
-    def current_graph(self) -> str: ...
-    @property
-    def current_commit(self) -> str: ...
-    @property
-    def current_change(self) -> str: ...
+    def s3_connect(self, bucket_name: str, access_key: str | None = None, secret_key: str | None = None, region: str | None = None, use_scratch: bool = True, multipart_threshold: int = ..., multipart_chunksize: int = ..., max_concurrency: int = 16, progress: Callable[[TransferStats], None] | None = None, max_files: int = 8, scratch_cleanup: ScratchCleanup = 'immediate', scratch_expiration_days: int | None = None): ...
+    def transfer(self, src: str, dst: str, skip_unchanged: bool = True, target: TuringDB | None = None) -> TransferStats: ...
+    def upload(self, local_path: str, dst: str, chunk_size: int = ..., compression: Compression | None = None, resume: bool = True, progress: Callable[[TransferStats], None] | None = None) -> TransferStats: ...
+    def flush_scratch(self) -> None: ...
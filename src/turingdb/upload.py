@@ -0,0 +1,116 @@
+import os
+from typing import Any, Callable, Iterator, Optional
+
+from .compression import Compression, check_compression, compress
+from .exceptions import TuringDBException
+from .path import PathType
+from .s3 import TransferStats, _ProgressTracker
+
+UPLOAD_PATH = "upload"
+UPLOAD_STATUS_PATH = "upload_status"
+UPLOAD_COMPLETE_PATH = "upload_complete"
+
+# Answers of servers without the upload endpoints
+UNSUPPORTED_STATUS_CODES = {404, 405, 501}
+
+
+def upload_target(local_path: str, dst: str) -> tuple[str, str]:
+    """Resolved local file and server path of an upload"""
+
+    if PathType.get_type(local_path) != PathType.LOCAL:
+        raise TuringDBException(f"{local_path} is not a local path")
+
+    if PathType.get_type(dst) != PathType.TURINGDB:
+        raise TuringDBException(f"{dst} is not a turingdb:// path")
+
+    path = os.path.abspath(os.path.expanduser(local_path))
+    if not os.path.isfile(path):
+        raise TuringDBException(f"{local_path} is not a file")
+
+    return path, dst.replace("turingdb://", "")
+
+
+def upload_headers(headers: dict, compression: Optional[Compression]) -> dict:
+    check_compression(compression)
+
+    headers = {**headers, "Content-Type": "application/octet-stream"}
+    if compression not in (None, "identity"):
+        headers["Content-Encoding"] = compression
+
+    return headers
+
+
+def iter_file_chunks(
+    path: str, offset: int, chunk_size: int
+) -> Iterator[tuple[int, bytes]]:
+    """Yields the offset and bytes of the chunks of a file, from an offset"""
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+
+        while chunk := f.read(chunk_size):
+            yield offset, chunk
+            offset += len(chunk)
+
+
+def encode_chunk(chunk: bytes, compression: Optional[Compression]) -> bytes:
+    if compression in (None, "identity"):
+        return chunk
+
+    return compress(chunk, compression)
+
+
+class Upload:
+    """
+    Requests of an upload to the upload endpoints, sent by the synchronous
+    and asynchronous clients: the status probe, then the chunks from the
+    resume offset, then the completion request.
+    """
+
+    def __init__(
+        self,
+        local_path: str,
+        dst: str,
+        headers: dict,
+        chunk_size: int,
+        compression: Optional[Compression] = None,
+        resume: bool = True,
+        progress: Optional[Callable[[TransferStats], None]] = None,
+    ):
+        self.path, self.name = upload_target(local_path, dst)
+        self.size = os.path.getsize(self.path)
+        self._headers = upload_headers(headers, compression)
+        self._chunk_size = chunk_size
+        self._compression = compression
+        self._resume = resume
+        self._tracker = _ProgressTracker(TransferStats(self.path, dst, self.size, 0), progress)
+
+    def status_request(self) -> dict[str, Any]:
+        """Also tells whether the server accepts uploads"""
+        return {"path": UPLOAD_STATUS_PATH, "params": {"path": self.name}}
+
+    def is_unsupported(self, status_code: int) -> bool:
+        """Whether the status probe failed because the server does not accept uploads"""
+        return status_code in UNSUPPORTED_STATUS_CODES
+
+    def requests(self, status: dict) -> Iterator[dict[str, Any]]:
+        """
+        Chunk requests, then the completion request. A chunk counts in the
+        progress once the next request is asked for, after it was sent.
+        """
+
+        offset = status["offset"] if self._resume else 0
+
+        for chunk_offset, chunk in iter_file_chunks(self.path, offset, self._chunk_size):
+            yield {
+                "path": UPLOAD_PATH,
+                "data": encode_chunk(chunk, self._compression),
+                "params": {"path": self.name, "offset": chunk_offset},
+                "headers": self._headers,
+            }
+            self._tracker(len(chunk))
+
+        yield {"path": UPLOAD_COMPLETE_PATH, "params": {"path": self.name, "size": self.size}}
+
+    def done(self) -> TransferStats:
+        return self._tracker.done()
@@ -0,0 +1,24 @@
+from .compression import Compression as Compression, check_compression as check_compression, compress as compress
+from .exceptions import TuringDBException as TuringDBException
+from .path import PathType as PathType
+from .s3 import TransferStats as TransferStats
+from _typeshed import Incomplete
+from typing import Any, Callable, Iterator
+
+UPLOAD_PATH: str
+UPLOAD_STATUS_PATH: str
+UPLOAD_COMPLETE_PATH: str
+UNSUPPORTED_STATUS_CODES: Incomplete
+
+def upload_target(local_path: str, dst: str) -> tuple[str, str]: ...
+def upload_headers(headers: dict, compression: Compression | None) -> dict: ...
+def iter_file_chunks(path: str, offset: int, chunk_size: int) -> Iterator[tuple[int, bytes]]: ...
+def encode_chunk(chunk: bytes, compression: Compression | None) -> bytes: ...
+
+class Upload:
+    size: Incomplete
+    def __init__(self, local_path: str, dst: str, headers: dict, chunk_size: int, compression: Compression | None = None, resume: bool = True, progress: Callable[[TransferStats], None] | None = None) -> None: ...
+    def status_request(self) -> dict[str, Any]: ...
+    def is_unsupported(self, status_code: int) -> bool: ...
+    def requests(self, status: dict) -> Iterator[dict[str, Any]]: ...
+    def done(self) -> TransferStats: ...
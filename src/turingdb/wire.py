@@ -0,0 +1,57 @@
+import importlib.util
+from typing import Literal, Optional, get_args
+
+from .exceptions import TuringDBException
+
+WireFormat = Literal["json", "arrow"]
+WIRE_FORMATS: tuple[str, ...] = get_args(WireFormat)
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def check_wire_format(wire_format: str):
+    if wire_format not in WIRE_FORMATS:
+        raise TuringDBException(
+            f"Unknown wire format '{wire_format}', "
+            f"expected one of {', '.join(WIRE_FORMATS)}"
+        )
+
+
+def accept_header(wire_format: WireFormat) -> str:
+    """
+    Accept header for query requests. Arrow is only advertised when pyarrow
+    is installed, and JSON stays acceptable so that servers without Arrow
+    support answer as usual.
+    """
+
+    if wire_format == "arrow" and importlib.util.find_spec("pyarrow") is not None:
+        return f"{ARROW_STREAM_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.9"
+
+    return JSON_MEDIA_TYPE
+
+
+def is_arrow_response(response) -> bool:
+    content_type = response.headers.get("content-type", "")
+    return content_type.split(";")[0].strip() == ARROW_STREAM_MEDIA_TYPE
+
+
+class ArrowResult:
+    """Query result received as an Arrow IPC stream"""
+
+    def __init__(self, table):
+        self.table = table
+
+    @property
+    def query_exec_time(self) -> Optional[float]:
+        metadata = self.table.schema.metadata or {}
+        exec_time = metadata.get(b"time")
+        return float(exec_time) if exec_time is not None else None
+
+
+def decode_arrow_stream(content: bytes) -> ArrowResult:
+    import pyarrow as pa
+
+    # py_buffer wraps the response bytes without copying them
+    with pa.ipc.open_stream(pa.py_buffer(content)) as reader:
+        return ArrowResult(reader.read_all())
@@ -0,0 +1,19 @@
+from .exceptions import TuringDBException as TuringDBException
+from _typeshed import Incomplete
+
+WireFormat: Incomplete
+WIRE_FORMATS: tuple[str, ...]
+JSON_MEDIA_TYPE: str
+ARROW_STREAM_MEDIA_TYPE: str
+
+def check_wire_format(wire_format: str): ...
+def accept_header(wire_format: WireFormat) -> str: ...
+def is_arrow_response(response) -> bool: ...
+
+class ArrowResult:
+    table: Incomplete
+    def __init__(self, table) -> None: ...
+    @property
+    def query_exec_time(self) -> float | None: ...
+
+def decode_arrow_stream(content: bytes) -> ArrowResult: ...
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+# The stand-in servers of the benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_server import MockTuringDBServer  # noqa: E402
+
+COLUMN_TYPES = ["Int64", "UInt64", "String", "Double", "Bool"]
+
+
+class RecordingServer(MockTuringDBServer):
+    """Mock server that keeps its queries and the content type of their responses"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.queries: list[str] = []
+        self.content_types: list[str] = []
+
+    def handle(self, path: str, body: bytes, accept: str) -> tuple[str, bytes]:
+        content_type, payload = super().handle(path, body, accept)
+        if path == "query":
+            self.queries.append(body.decode())
+            self.content_types.append(content_type)
+        return content_type, payload
+
+
+@pytest.fixture
+def server():
+    with RecordingServer(chunk_count=3, rows_per_chunk=5, column_types=COLUMN_TYPES) as server:
+        yield server
+
+
+@pytest.fixture
+def json_server():
+    """Server without Arrow support"""
+    with RecordingServer(
+        chunk_count=3, rows_per_chunk=5, column_types=COLUMN_TYPES, arrow=False
+    ) as server:
+        yield server
@@ -0,0 +1,96 @@
+import re
+from collections import Counter
+
+import orjson
+import pytest
+from mock_server import MockTuringDBServer
+
+from turingdb import TuringDB, TuringDBException
+from turingdb.wire import JSON_MEDIA_TYPE
+
+PATTERN = re.compile(r"\(m\d+:(\w+) \{id: (\d+)\}\)")
+
+
+def count_result(count: int) -> bytes:
+    return orjson.dumps({
+        "header": {"column_names": ["matched"], "column_types": ["Int64"]},
+        "data": [[[count]]],
+        "time": 0.1,
+    })
+
+
+class GraphServer(MockTuringDBServer):
+    """Mock server that knows how many nodes have each (label, id)"""
+
+    def __init__(self, nodes: Counter, **kwargs):
+        super().__init__(**kwargs)
+        self.nodes = nodes
+        self.queries: list[str] = []
+
+    def handle(self, path: str, body: bytes, accept: str) -> tuple[str, bytes]:
+        if path != "query":
+            return super().handle(path, body, accept)
+
+        query = body.decode()
+        self.queries.append(query)
+
+        if query == "CHANGE NEW":
+            return JSON_MEDIA_TYPE, orjson.dumps({
+                "header": {"column_names": ["changeID"], "column_types": ["Int64"]},
+                "data": [[[1]]],
+                "time": 0.1,
+            })
+
+        if query.endswith("RETURN count(*) AS matched"):
+            # Combinations of the nodes matched by the patterns
+            matched = 1
+            for label, key in PATTERN.findall(query):
+                matched *= self.nodes[(label, int(key))]
+            return JSON_MEDIA_TYPE, count_result(matched)
+
+        return super().handle(path, body, accept)
+
+    def creates(self) -> list[str]:
+        return [q for q in self.queries if "CREATE" in q and "MATCH" in q]
+
+
+def edges(count: int) -> list[dict]:
+    return [{"source": i, "target": i + 1} for i in range(count)]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_edge_batches_bind_few_endpoints(max_concurrency):
+    nodes = Counter({("Node", i): 1 for i in range(101)})
+
+    with GraphServer(nodes) as server:
+        client = TuringDB(host=server.url)
+        stats = client.bulk_create(
+            [], edges(100), max_concurrency=max_concurrency, batch_endpoints=8
+        )
+
+    assert stats.edges == 100
+    creates = server.creates()
+    assert sum(q.count("]->") for q in creates) == 100
+    assert all(len(PATTERN.findall(q)) <= 8 for q in creates)
+    assert server.queries[-1] == "CHANGE SUBMIT"
+
+
+@pytest.mark.parametrize("matches, error", [(0, "matches no node"), (2, "several nodes")])
+@pytest.mark.parametrize("max_concurrency", [1, 4])
+def test_edges_are_checked_before_they_are_created(matches, error, max_concurrency):
+    nodes = Counter({("Node", i): 1 for i in range(11)})
+    nodes[("Node", 5)] = matches
+
+    with GraphServer(nodes) as server:
+        client = TuringDB(host=server.url)
+        with pytest.raises(TuringDBException, match=error):
+            client.bulk_create([], edges(10), max_concurrency=max_concurrency)
+
+    # The batch with the bad key is not created, nor the change submitted
+    assert server.creates() == []
+    assert "CHANGE SUBMIT" not in server.queries
+
+
+def test_batch_endpoints_must_allow_an_edge():
+    with pytest.raises(TuringDBException, match="batch_endpoints"):
+        TuringDB().bulk_writer(batch_endpoints=1)
@@ -0,0 +1,151 @@
+import asyncio
+import os
+
+import orjson
+import pytest
+from mock_server import MockTuringDBServer
+
+from turingdb import AsyncTuringDB, DiskResultCache, ResultCache, TuringDB
+
+pa = pytest.importorskip("pyarrow")
+
+
+def key(query: str) -> tuple:
+    return ("http://host", None, "graph", "main", "abc123", query)
+
+
+def table(rows: int):
+    return pa.table({"n": list(range(rows))})
+
+
+def age(cache: DiskResultCache, query: str, seconds: float):
+    """Moves the last use of a cached result back in time"""
+    path = os.path.join(cache.directory, cache._file_name(key(query)))
+    mtime = os.stat(path).st_mtime - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_hits_do_not_write_the_index(tmp_path, monkeypatch):
+    cache = DiskResultCache(tmp_path)
+    cache.put(key("a"), table(10))
+
+    writes = []
+    monkeypatch.setattr(cache, "_write_index", writes.append)
+
+    for _ in range(10):
+        assert cache.get(key("a")).equals(table(10))
+
+    assert writes == []
+    assert cache.stats()["hits"] == 10
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    cache = DiskResultCache(tmp_path)
+    for query in "abc":
+        cache.put(key(query), table(1000))
+    size = cache.stats()["bytes"] // 3
+
+    age(cache, "a", 30)
+    age(cache, "b", 20)
+    age(cache, "c", 10)
+    # a becomes the most recently used
+    cache.get(key("a"))
+
+    cache.max_bytes = 3 * size
+    cache.put(key("d"), table(1000))
+
+    assert cache.get(key("b")) is None
+    for query in "acd":
+        assert cache.get(key(query)) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 3
+
+
+def test_files_of_other_processes_are_indexed(tmp_path):
+    cache = DiskResultCache(tmp_path)
+    other = DiskResultCache(tmp_path)
+    cache.put(key("a"), table(10))
+    other.put(key("b"), table(10))
+
+    assert cache.get(key("b")) is not None
+    assert cache.stats()["entries"] == 2
+
+
+class MixedServer(MockTuringDBServer):
+    """Mock server answering a column of unknown type with mixed values"""
+
+    def handle(self, path: str, body: bytes, accept: str) -> tuple[str, bytes]:
+        if path != "query":
+            return super().handle(path, body, accept)
+
+        return "application/json", orjson.dumps({
+            "header": {"column_names": ["a"], "column_types": ["X"]},
+            "data": [[[1, "x"]]],
+            "time": 0.1,
+        })
+
+
+@pytest.mark.parametrize("raw", [False, True])
+def test_results_arrow_cannot_hold_are_not_cached(tmp_path, raw):
+    cache = DiskResultCache(tmp_path)
+
+    with MixedServer() as server:
+        client = TuringDB(host=server.url, disk_cache=cache)
+        client.set_commit("abc123")
+        result = client.query("MATCH (n) RETURN n.a", raw=raw)
+
+    values = result["a"] if raw else result["a"].tolist()
+    assert values == [1, "x"]
+    assert cache.stats()["entries"] == 0
+
+
+@pytest.mark.parametrize("change", ["main", 3])
+def test_writes_invalidate_unpinned_results(change):
+    with MockTuringDBServer() as server:
+        client = TuringDB(host=server.url, result_cache=ResultCache(unpinned_ttl=60))
+        client.set_change(change)
+
+        client.query("MATCH (n) RETURN n")
+        client.query("MATCH (n) RETURN n")
+        assert server.request_count == 1
+
+        client.query("CREATE (n:Node)")
+        client.query("MATCH (n) RETURN n")
+
+    assert server.request_count == 3
+
+
+def test_async_writes_invalidate_unpinned_results():
+    async def run(server):
+        cache = ResultCache(unpinned_ttl=60)
+        async with AsyncTuringDB(host=server.url, result_cache=cache) as client:
+            client.set_change(3)
+            await client.query("MATCH (n) RETURN n")
+            await client.query("CREATE (n:Node)")
+            await client.query("MATCH (n) RETURN n")
+
+    with MockTuringDBServer() as server:
+        asyncio.run(run(server))
+
+    assert server.request_count == 3
+
+
+def test_writes_keep_results_of_commits_and_other_graphs():
+    cache = ResultCache(unpinned_ttl=60)
+
+    with MockTuringDBServer() as server:
+        other = TuringDB(host=server.url, result_cache=cache)
+        other.set_graph("other")
+        other.query("MATCH (n) RETURN n")
+
+        client = TuringDB(host=server.url, result_cache=cache)
+        client.set_commit("abc123")
+        client.query("MATCH (n) RETURN n")
+
+        client.set_commit("HEAD")
+        client.query("CREATE (n:Node)")
+        client.set_commit("abc123")
+        client.query("MATCH (n) RETURN n")
+        other.query("MATCH (n) RETURN n")
+
+    assert server.request_count == 3
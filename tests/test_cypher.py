@@ -0,0 +1,118 @@
+import asyncio
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from turingdb import AsyncTuringDB, TuringDB, TuringDBException
+from turingdb.cypher import compile_template, format_literal, format_properties, render_query
+
+
+@pytest.mark.parametrize(
+    "value, literal",
+    [
+        ('say "hi"', r'"say \"hi\""'),
+        ("back\\slash", r'"back\\slash"'),
+        ("ends with \\", r'"ends with \\"'),
+        ('\\"', r'"\\\""'),
+        ("it's", '"it\'s"'),
+        ('" RETURN 1 //', r'"\" RETURN 1 //"'),
+    ],
+)
+def test_strings_are_escaped(value, literal):
+    assert format_literal(value) == literal
+    assert render_query("RETURN $x", {"x": value}) == f"RETURN {literal}"
+
+
+@pytest.mark.parametrize(
+    "value, literal",
+    [
+        (None, "null"),
+        (True, "true"),
+        (False, "false"),
+        (42, "42"),
+        (-1.5, "-1.5"),
+        (np.int64(7), "7"),
+        (np.float32(0.5), "0.5"),
+        (np.array([1, 2]), "[1, 2]"),
+        ([1, "a", None], '[1, "a", null]'),
+        ((1, 2), "[1, 2]"),
+        ([[1, [2]], {"k": [3]}], "[[1, [2]], {k: [3]}]"),
+        ({"a": {"b": "c"}, "odd key": 1}, '{a: {b: "c"}, "odd key": 1}'),
+        ({'x"y': 1}, r'{"x\"y": 1}'),
+    ],
+)
+def test_literals(value, literal):
+    assert format_literal(value) == literal
+
+
+@pytest.mark.parametrize("value", [math.nan, math.inf, -math.inf, [1.0, math.nan], {"k": math.inf}])
+def test_non_finite_numbers_are_rejected(value):
+    with pytest.raises(TuringDBException, match="Cannot write"):
+        render_query("RETURN $x", {"x": value})
+
+
+@pytest.mark.parametrize("value", [object(), {1, 2}, b"bytes"])
+def test_unknown_types_are_rejected(value):
+    with pytest.raises(TuringDBException, match="Cannot write a"):
+        format_literal(value)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "RETURN '$x'",
+        'RETURN "$x"',
+        "RETURN `$x`",
+        "RETURN 'it\\'s $x'",
+        'RETURN "say \\"$x\\""',
+        "MATCH (n {name: \"$x\"}) RETURN n.`$x`",
+    ],
+)
+def test_parameters_in_strings_stay_literal(query):
+    assert compile_template(query) == ((query,), ())
+    assert render_query(query, {"x": 1}) == query
+
+
+def test_parameters_are_replaced_outside_of_strings():
+    query = "MATCH (n {name: $name, note: '$name'}) WHERE n.age > $age RETURN n, $name"
+
+    rendered = render_query(query, {"name": 'a "b"', "age": 3})
+
+    assert rendered == (
+        'MATCH (n {name: "a \\"b\\"", note: \'$name\'}) WHERE n.age > 3 RETURN n, "a \\"b\\""'
+    )
+
+
+def test_values_are_not_rendered_twice():
+    assert render_query("RETURN $a, $b", {"a": "$b", "b": 1}) == 'RETURN "$b", 1'
+
+
+def test_missing_parameters_raise():
+    with pytest.raises(TuringDBException, match="Missing query parameters: b, c"):
+        render_query("RETURN $a, $b, $c", {"a": 1})
+
+
+def test_queries_without_params_are_unchanged():
+    assert render_query("RETURN $x") == "RETURN $x"
+
+
+def test_null_properties_are_left_out():
+    properties = {"a": 1, "b": None, "c": math.nan, "d": pd.NA, "e": pd.NaT, "f": "x"}
+
+    assert format_properties(properties) == ' {a: 1, f: "x"}'
+    assert format_properties({"a": None}) == ""
+
+
+@pytest.mark.parametrize("name", ["", "1graph", "my graph", "g; DROP", "g`", "g-1", "é"])
+def test_create_graph_rejects_non_identifiers(name):
+    with pytest.raises(TuringDBException, match="Invalid name"):
+        TuringDB(host="http://127.0.0.1:9").create_graph(name)
+
+    async def create():
+        async with AsyncTuringDB(host="http://127.0.0.1:9") as client:
+            await client.create_graph(name)
+
+    with pytest.raises(TuringDBException, match="Invalid name"):
+        asyncio.run(create())
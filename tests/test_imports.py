@@ -0,0 +1,62 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def run(code: str) -> str:
+    """Runs code in a fresh interpreter, where nothing is imported yet"""
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+@pytest.mark.parametrize(
+    "imports",
+    [
+        "from turingdb import turingsh",
+        "import turingdb.turingsh; from turingdb import turingsh",
+        "from turingdb.turingsh import main; from turingdb import turingsh",
+        "from turingdb import turingsh; import turingdb.turingsh.command",
+    ],
+)
+def test_turingsh_is_the_shell_entry_point(imports):
+    output = run(
+        f"{imports}\n"
+        "import turingdb\n"
+        "from turingdb.turingsh.turingsh import main\n"
+        "print(turingdb.turingsh is main)"
+    )
+
+    assert output == "True"
+
+
+def test_shell_and_async_client_are_imported_on_first_use():
+    output = run(
+        "import sys, turingdb\n"
+        "print('click' in sys.modules, 'turingdb.async_turingdb' in sys.modules)\n"
+        "turingdb.AsyncTuringDB\n"
+        "print('turingdb.async_turingdb' in sys.modules)"
+    )
+
+    assert output.splitlines() == ["False False", "True"]
+
+
+def test_optional_features_are_imported_on_first_use():
+    modules = ["batch", "bulk", "cache", "observers", "retry", "s3", "session", "timing"]
+    output = run(
+        "import sys, turingdb\n"
+        f"print([m for m in {modules!r} if 'turingdb.' + m in sys.modules])\n"
+        "print(turingdb.ResultCache.__module__, turingdb.BulkWriter.__module__)"
+    )
+
+    assert output.splitlines() == ["[]", "turingdb.cache turingdb.bulk"]
+
+
+def test_lazy_attributes_are_exported():
+    output = run(
+        "import turingdb\n"
+        "print(all(getattr(turingdb, name) is not None for name in turingdb.__all__))"
+    )
+
+    assert output == "True"
@@ -0,0 +1,139 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from mock_server import MockTuringDBServer
+
+from turingdb import AsyncTuringDB, HedgePolicy, RetryPolicy, TuringDB
+
+READ = "MATCH (n) RETURN n"
+WRITE = "CREATE (n:Node)"
+
+
+class ScriptedServer(MockTuringDBServer):
+    """Mock server whose requests fail ("fail"), are slow ("slow") or not, in turn"""
+
+    def __init__(self, script: list[str], **kwargs):
+        super().__init__(**kwargs)
+        self.script = list(script)
+        self.request_times: list[float] = []
+
+    def fault(self) -> tuple[bool, bool]:
+        with self._lock:
+            self.request_times.append(time.monotonic())
+            action = self.script.pop(0) if self.script else "ok"
+
+        return action == "fail", action == "slow"
+
+
+def query_timed(server: MockTuringDBServer, use_async: bool, query: str, **options):
+    if not use_async:
+        return TuringDB(host=server.url, **options).session().query_timed(query)
+
+    async def run():
+        async with AsyncTuringDB(host=server.url, **options) as client:
+            return await client.query_timed(query)
+
+    return asyncio.run(run())
+
+
+def fast_retry(**options) -> RetryPolicy:
+    return RetryPolicy(**{"backoff": 0.01, **options})
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def use_async(request) -> bool:
+    return request.param
+
+
+def test_failed_read_is_retried(use_async):
+    with ScriptedServer(["fail"]) as server:
+        _, timing = query_timed(server, use_async, READ, retry=fast_retry())
+
+    assert server.request_count == 2
+    assert timing.attempts == 2
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+def test_retried_statuses(use_async, status):
+    with ScriptedServer(["fail", "fail"], fail_status=status) as server:
+        query_timed(server, use_async, READ, retry=fast_retry())
+
+    assert server.request_count == 3
+
+
+def test_other_statuses_are_not_retried(use_async):
+    with ScriptedServer(["fail"], fail_status=500) as server:
+        with pytest.raises(httpx.HTTPStatusError):
+            query_timed(server, use_async, READ, retry=fast_retry())
+
+    assert server.request_count == 1
+
+
+def test_writes_are_not_retried(use_async):
+    with ScriptedServer(["fail"]) as server:
+        with pytest.raises(httpx.HTTPStatusError):
+            query_timed(server, use_async, WRITE, retry=fast_retry())
+
+    assert server.request_count == 1
+
+
+@pytest.mark.parametrize("max_attempts", [1, 3])
+def test_max_attempts(use_async, max_attempts):
+    with ScriptedServer(["fail"] * 10) as server:
+        with pytest.raises(httpx.HTTPStatusError):
+            query_timed(server, use_async, READ, retry=fast_retry(max_attempts=max_attempts))
+
+    assert server.request_count == max_attempts
+
+
+def test_retry_after_is_honoured(use_async):
+    retry = RetryPolicy(backoff=0.0, max_backoff=5.0)
+
+    with ScriptedServer(["fail"], retry_after=1) as server:
+        query_timed(server, use_async, READ, retry=retry)
+
+    assert server.request_times[1] - server.request_times[0] >= 1.0
+
+
+def test_retry_after_is_capped_by_max_backoff(use_async):
+    retry = RetryPolicy(backoff=0.0, max_backoff=0.1)
+
+    with ScriptedServer(["fail"], retry_after=30) as server:
+        query_timed(server, use_async, READ, retry=retry)
+
+    assert server.request_times[1] - server.request_times[0] < 1.0
+
+
+def test_slow_read_is_hedged(use_async):
+    hedge = HedgePolicy(delay=0.05)
+
+    with ScriptedServer(["slow"], slow_delay=2.0) as server:
+        t0 = time.monotonic()
+        _, timing = query_timed(server, use_async, READ, hedge=hedge)
+        elapsed = time.monotonic() - t0
+
+    assert timing.hedged
+    assert len(server.request_times) == 2
+    assert elapsed < 1.0
+
+
+def test_fast_read_is_not_hedged(use_async):
+    hedge = HedgePolicy(delay=1.0)
+
+    with ScriptedServer([]) as server:
+        _, timing = query_timed(server, use_async, READ, hedge=hedge)
+
+    assert not timing.hedged
+    assert len(server.request_times) == 1
+
+
+def test_writes_are_not_hedged(use_async):
+    hedge = HedgePolicy(delay=0.05)
+
+    with ScriptedServer(["slow"], slow_delay=0.3) as server:
+        _, timing = query_timed(server, use_async, WRITE, hedge=hedge)
+
+    assert not timing.hedged
+    assert len(server.request_times) == 1
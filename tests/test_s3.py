@@ -0,0 +1,279 @@
+import os
+
+import pytest
+
+from turingdb import TuringDB, TuringDBException
+from turingdb.s3 import MiB
+
+moto = pytest.importorskip("moto")
+
+BUCKET = "turingdb-test"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    import boto3
+
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+
+    with moto.mock_aws():
+        client = boto3.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+@pytest.fixture
+def connect(server, s3):
+    """Connects a client to the test bucket, with transfer options"""
+
+    def connect(**options) -> TuringDB:
+        client = TuringDB(host=server.url)
+        client.s3_connect(BUCKET, **options)
+        return client
+
+    return connect
+
+
+def write_file(path, size: int) -> bytes:
+    data = os.urandom(size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return data
+
+
+def keys(s3, prefix: str = "") -> list[str]:
+    objects = s3.list_objects_v2(Bucket=BUCKET, Prefix=prefix).get("Contents", [])
+    return sorted(obj["Key"] for obj in objects)
+
+
+def test_multipart_upload(connect, s3, tmp_path):
+    client = connect(multipart_threshold=5 * MiB, multipart_chunksize=5 * MiB)
+    data = write_file(tmp_path / "big.bin", 12 * MiB)
+
+    stats = client.transfer(str(tmp_path / "big.bin"), "s3://big.bin")
+
+    # 5 + 5 + 2 MiB parts
+    assert s3.head_object(Bucket=BUCKET, Key="big.bin")["ETag"].strip('"').endswith("-3")
+    assert s3.get_object(Bucket=BUCKET, Key="big.bin")["Body"].read() == data
+    assert stats.total_bytes == stats.bytes_transferred == len(data)
+
+
+def test_single_part_upload_below_threshold(connect, s3, tmp_path):
+    client = connect(multipart_threshold=5 * MiB, multipart_chunksize=5 * MiB)
+    write_file(tmp_path / "small.bin", MiB)
+
+    client.transfer(str(tmp_path / "small.bin"), "s3://small.bin")
+
+    assert "-" not in s3.head_object(Bucket=BUCKET, Key="small.bin")["ETag"]
+
+
+def test_progress_and_throughput(connect, tmp_path):
+    updates: list[int] = []
+    client = connect(
+        multipart_threshold=5 * MiB,
+        multipart_chunksize=5 * MiB,
+        progress=lambda stats: updates.append(stats.bytes_transferred),
+    )
+    write_file(tmp_path / "big.bin", 12 * MiB)
+
+    stats = client.transfer(str(tmp_path / "big.bin"), "s3://big.bin")
+
+    assert len(updates) > 1
+    assert updates == sorted(updates)
+    assert updates[-1] == 12 * MiB
+    assert stats.files == 1
+    assert stats.elapsed > 0
+    assert stats.throughput == pytest.approx(12 * MiB / stats.elapsed)
+
+
+def test_download(connect, tmp_path):
+    client = connect(multipart_threshold=5 * MiB, multipart_chunksize=5 * MiB)
+    data = write_file(tmp_path / "big.bin", 6 * MiB)
+    client.transfer(str(tmp_path / "big.bin"), "s3://big.bin")
+
+    stats = client.transfer("s3://big.bin", str(tmp_path / "out.bin"))
+
+    assert (tmp_path / "out.bin").read_bytes() == data
+    assert stats.total_bytes == stats.bytes_transferred == len(data)
+
+
+def test_glob_upload(connect, s3, tmp_path):
+    client = connect()
+    for name in ["a.csv", "b.csv", "c.txt", "sub/d.csv"]:
+        write_file(tmp_path / "data" / name, 1024)
+
+    stats = client.transfer(str(tmp_path / "data" / "*.csv"), "s3://csv/")
+
+    assert keys(s3) == ["csv/a.csv", "csv/b.csv"]
+    assert stats.files == 2
+    assert stats.bytes_transferred == 2048
+
+    client.transfer(str(tmp_path / "data" / "**" / "*.csv"), "s3://all/")
+
+    assert keys(s3, "all/") == ["all/a.csv", "all/b.csv", "all/sub/d.csv"]
+
+
+def test_directory_upload(connect, s3, tmp_path):
+    client = connect()
+    for name in ["a.csv", "sub/b.csv", "sub/deeper/c.csv"]:
+        write_file(tmp_path / "data" / name, 1024)
+
+    stats = client.transfer(str(tmp_path / "data"), "s3://dir")
+
+    assert keys(s3) == ["dir/a.csv", "dir/sub/b.csv", "dir/sub/deeper/c.csv"]
+    assert stats.files == 3
+    assert stats.total_bytes == 3072
+
+
+def test_upload_skips_unchanged_files(connect, tmp_path):
+    client = connect(multipart_threshold=5 * MiB, multipart_chunksize=5 * MiB)
+    write_file(tmp_path / "data" / "small.csv", 1024)
+    # Multipart, its ETag is the MD5 of the MD5s of its parts
+    write_file(tmp_path / "data" / "big.bin", 6 * MiB)
+
+    client.transfer(str(tmp_path / "data"), "s3://dir/")
+    stats = client.transfer(str(tmp_path / "data"), "s3://dir/")
+
+    assert stats.skipped_files == 2
+    assert stats.bytes_transferred == 0
+
+    write_file(tmp_path / "data" / "small.csv", 1024)
+    stats = client.transfer(str(tmp_path / "data"), "s3://dir/")
+
+    assert stats.skipped_files == 1
+    assert stats.bytes_transferred == 1024
+
+    stats = client.transfer(str(tmp_path / "data"), "s3://dir/", skip_unchanged=False)
+
+    assert stats.skipped_files == 0
+    assert stats.bytes_transferred == 6 * MiB + 1024
+
+
+def test_prefix_download(connect, tmp_path):
+    client = connect()
+    files = {
+        name: write_file(tmp_path / "data" / name, 1024)
+        for name in ["a.csv", "sub/b.csv"]
+    }
+    client.transfer(str(tmp_path / "data"), "s3://dir/")
+
+    stats = client.transfer("s3://dir/", str(tmp_path / "out"))
+
+    for name, data in files.items():
+        assert (tmp_path / "out" / name).read_bytes() == data
+    assert stats.files == 2
+    assert stats.skipped_files == 0
+
+    stats = client.transfer("s3://dir/", str(tmp_path / "out"))
+
+    assert stats.skipped_files == 2
+    assert stats.bytes_transferred == 0
+
+
+def test_s3_copy(connect, s3, tmp_path):
+    client = connect()
+    data = write_file(tmp_path / "a.csv", 1024)
+    client.transfer(str(tmp_path / "a.csv"), "s3://src/a.csv")
+    client.transfer(str(tmp_path / "a.csv"), "s3://src/sub/b.csv")
+
+    stats = client.transfer("s3://src/a.csv", "s3://copy.csv")
+
+    assert s3.get_object(Bucket=BUCKET, Key="copy.csv")["Body"].read() == data
+    assert stats.bytes_transferred == 1024
+
+    stats = client.transfer("s3://src/", "s3://dst/")
+
+    assert keys(s3, "dst/") == ["dst/a.csv", "dst/sub/b.csv"]
+    assert stats.files == 2
+
+    stats = client.transfer("s3://src/", "s3://dst/")
+
+    assert stats.skipped_files == 2
+    assert stats.bytes_transferred == 0
+
+
+def test_scratch_is_deleted(connect, s3, tmp_path):
+    client = connect()
+    write_file(tmp_path / "a.csv", 1024)
+
+    stats = client.transfer(str(tmp_path / "a.csv"), "turingdb://a.csv")
+
+    assert stats.total_bytes == 1024
+    assert keys(s3) == []
+
+
+def test_upload_falls_back_to_transfer(connect, server, s3, tmp_path, monkeypatch):
+    """Servers without the upload endpoints pull the file from the scratch folder"""
+
+    server.missing_endpoints = {"upload_status"}
+    client = connect()
+    assert client._s3_client is not None
+
+    transfers = []
+    transfer = client._s3_client.transfer
+
+    def record(src: str, dst: str, *args, **kwargs):
+        transfers.append((src, dst))
+        return transfer(src, dst, *args, **kwargs)
+
+    monkeypatch.setattr(client._s3_client, "transfer", record)
+    write_file(tmp_path / "a.csv", 1024)
+
+    stats = client.upload(str(tmp_path / "a.csv"), "turingdb://a.csv")
+
+    assert transfers[0] == (str(tmp_path / "a.csv"), "turingdb://a.csv")
+    assert stats.total_bytes == 1024
+    pulls = [query for query in server.queries if query.startswith("S3 PULL")]
+    assert len(pulls) == 1
+    assert f"s3://{BUCKET}/__turing__scratch__/" in pulls[0]
+    assert pulls[0].endswith('"a.csv"')
+    assert keys(s3) == []
+
+
+def test_background_scratch_cleanup(connect, s3, tmp_path):
+    client = connect(scratch_cleanup="background")
+    write_file(tmp_path / "a.csv", 1024)
+
+    client.transfer(str(tmp_path / "a.csv"), "turingdb://a.csv")
+    client.flush_scratch()
+
+    assert keys(s3) == []
+
+
+def test_failed_scratch_cleanup_is_reported(connect, s3, tmp_path, monkeypatch, caplog):
+    client = connect(scratch_cleanup="background")
+    assert client._s3_client is not None
+
+    def fail(prefixes: list[str]):
+        raise RuntimeError("AccessDenied")
+
+    monkeypatch.setattr(client._s3_client, "_delete_prefixes", fail)
+    write_file(tmp_path / "a.csv", 1024)
+
+    client.transfer(str(tmp_path / "a.csv"), "turingdb://a.csv")
+
+    with pytest.raises(TuringDBException, match="__turing__scratch__/"):
+        client.flush_scratch()
+
+    assert "AccessDenied" in caplog.text
+    assert len(keys(s3, "__turing__scratch__/")) == 1
+
+    # Failures are reported once
+    client.flush_scratch()
+
+
+@pytest.mark.parametrize("key", ["dir/../escaped.csv", "dir/sub/../../../escaped.csv"])
+def test_prefix_download_rejects_keys_outside_of_dst(connect, s3, tmp_path, key):
+    client = connect()
+    s3.put_object(Bucket=BUCKET, Key="dir/a.csv", Body=b"a")
+    s3.put_object(Bucket=BUCKET, Key=key, Body=b"escaped")
+
+    with pytest.raises(TuringDBException, match="outside of"):
+        client.transfer("s3://dir/", str(tmp_path / "out" / "nested"))
+
+    assert not list(tmp_path.rglob("escaped.csv"))
+    assert not (tmp_path / "out" / "nested" / "a.csv").exists()
@@ -0,0 +1,152 @@
+import orjson
+import pandas as pd
+import pytest
+from mock_server import MockTuringDBServer
+
+from turingdb import TuringDB, TuringDBException
+from turingdb.streaming import ChunkStreamParser
+
+HEADER = {"column_names": ["name", "n"], "column_types": ["String", "Int64"]}
+
+TRICKY_STRINGS = [
+    'say "hi"',
+    "brackets ] } [ { inside",
+    "back\\slash",
+    "ends with a backslash \\",
+    '\\"',
+    '"data": [',
+    "unicode é € 😀",
+    "",
+]
+
+
+def response(data: list, **extra) -> dict:
+    return {"header": HEADER, "data": data, "time": 0.5, **extra}
+
+
+def parse(body: bytes, step: int) -> tuple[list, ChunkStreamParser, dict]:
+    """Feeds the body in slices of `step` bytes"""
+
+    parser = ChunkStreamParser()
+    chunks = []
+    for i in range(0, len(body), step):
+        chunks.extend(parser.feed(body[i:i + step]))
+
+    return chunks, parser, parser.finish()
+
+
+STEPS = [1, 2, 7, 1 << 20]
+
+DATA = [
+    [["a", "b"], [1, 2]],
+    [TRICKY_STRINGS, list(range(len(TRICKY_STRINGS)))],
+    [[], []],
+    [["c"], [3]],
+]
+
+
+@pytest.mark.parametrize("step", STEPS)
+@pytest.mark.parametrize("option", [None, orjson.OPT_INDENT_2])
+def test_chunks_are_parsed(step, option):
+    body = orjson.dumps(response(DATA), option=option)
+
+    chunks, parser, rest = parse(body, step)
+
+    assert chunks == DATA
+    assert parser.header == HEADER
+    assert rest == {"header": HEADER, "data": None, "time": 0.5}
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_strings_of_the_header_are_skipped(step):
+    header = {**HEADER, "note": '"data": [[1]] \\" }'}
+    body = orjson.dumps({"header": header, "data": DATA, "time": 0.5})
+
+    chunks, parser, _ = parse(body, step)
+
+    assert chunks == DATA
+    assert parser.header == header
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_header_after_data(step):
+    body = orjson.dumps({"data": DATA, "header": HEADER, "time": 0.5})
+
+    chunks, parser, rest = parse(body, step)
+
+    assert chunks == DATA
+    assert parser.header is None
+    assert rest["header"] == HEADER
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_empty_data(step):
+    chunks, parser, rest = parse(orjson.dumps(response([])), step)
+
+    assert chunks == []
+    assert parser.header == HEADER
+    assert rest["time"] == 0.5
+
+
+@pytest.mark.parametrize("step", STEPS)
+def test_error_body(step):
+    body = orjson.dumps({"error": "GRAPH_NOT_FOUND", "error_details": "graph [x]"})
+
+    chunks, parser, rest = parse(body, step)
+
+    assert chunks == []
+    assert parser.header is None
+    assert rest == {"error": "GRAPH_NOT_FOUND", "error_details": "graph [x]"}
+
+
+def test_only_the_partial_chunk_is_buffered():
+    body = orjson.dumps(response([[["x" * 1000], [1]]] * 100))
+    parser = ChunkStreamParser()
+
+    for i in range(0, len(body), 100):
+        parser.feed(body[i:i + 100])
+        assert len(parser._buffer) < 1200
+
+
+class StreamServer(MockTuringDBServer):
+    """Mock server answering queries with a fixed body"""
+
+    def __init__(self, body: bytes, **kwargs):
+        super().__init__(**kwargs)
+        self.body = body
+
+    def handle(self, path: str, body: bytes, accept: str) -> tuple[str, bytes]:
+        if path == "query":
+            return "application/json", self.body
+        return super().handle(path, body, accept)
+
+
+@pytest.mark.parametrize("chunk_rows, sizes", [(None, [7] * 5), (10, [10, 10, 10, 5]), (35, [35])])
+def test_query_stream_regroups_rows(chunk_rows, sizes):
+    with MockTuringDBServer(chunk_count=5, rows_per_chunk=7) as server:
+        client = TuringDB(host=server.url)
+        frames = list(client.query_stream("MATCH (n) RETURN n", chunk_rows=chunk_rows))
+        expected = client.query("MATCH (n) RETURN n")
+
+    assert [len(frame) for frame in frames] == sizes
+    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True), expected)
+    assert client.get_query_exec_time() == 0.1
+
+
+def test_query_stream_with_header_after_data():
+    body = orjson.dumps({"data": DATA, "header": HEADER, "time": 0.5})
+
+    with StreamServer(body) as server:
+        frames = list(TuringDB(host=server.url).query_stream("MATCH (n) RETURN n", chunk_rows=3))
+
+    rows = pd.concat(frames, ignore_index=True)
+    assert [len(frame) for frame in frames] == [3, 3, 3, 2]
+    assert rows["name"].tolist() == ["a", "b", *TRICKY_STRINGS, "c"]
+
+
+def test_query_stream_error():
+    body = orjson.dumps({"error": "GRAPH_NOT_FOUND"})
+
+    with StreamServer(body) as server:
+        with pytest.raises(TuringDBException, match="GRAPH_NOT_FOUND"):
+            list(TuringDB(host=server.url).query_stream("MATCH (n) RETURN n"))
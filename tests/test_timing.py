@@ -0,0 +1,38 @@
+import asyncio
+import gc
+import weakref
+
+from turingdb import AsyncTuringDB, TuringDB
+
+QUERY = "MATCH (n) RETURN n"
+
+
+def test_last_timing_is_per_task(server):
+    async def run():
+        async with AsyncTuringDB(host=server.url) as client:
+
+            async def query():
+                _, timing = await client.query_timed(QUERY)
+                await asyncio.sleep(0.01)
+                return client._last_timing() is timing
+
+            results = await asyncio.gather(*(query() for _ in range(10)))
+            return results, client._last_timing()
+
+    results, parent_timing = asyncio.run(run())
+
+    assert all(results)
+    # Timings of the tasks stay in the tasks
+    assert parent_timing is None
+
+
+def test_discarded_clients_release_their_timing(server):
+    client = TuringDB(host=server.url)
+    client.query(QUERY)
+    timing = weakref.ref(client._last_timing())
+
+    client._client.close()
+    del client
+    gc.collect()
+
+    assert timing() is None
@@ -0,0 +1,91 @@
+import asyncio
+
+import orjson
+import pytest
+from mock_server import MockTuringDBServer
+
+from turingdb import AsyncTuringDB, TuringDB, TuringDBException
+from turingdb.wire import JSON_MEDIA_TYPE
+
+
+class UploadServer(MockTuringDBServer):
+    """Mock server with the upload endpoints, that already has `offset` bytes"""
+
+    def __init__(self, offset: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.offset = offset
+        self.chunks: list[bytes] = []
+        self.completed = False
+
+    def handle(self, path: str, body: bytes, accept: str) -> tuple[str, bytes]:
+        match path:
+            case "upload_status":
+                return JSON_MEDIA_TYPE, orjson.dumps({"offset": self.offset})
+            case "upload":
+                self.chunks.append(body)
+                return JSON_MEDIA_TYPE, orjson.dumps({})
+            case "upload_complete":
+                self.completed = True
+                return JSON_MEDIA_TYPE, orjson.dumps({})
+
+        return super().handle(path, body, accept)
+
+
+@pytest.fixture
+def data(tmp_path) -> bytes:
+    data = bytes(range(256)) * 40
+    (tmp_path / "data.bin").write_bytes(data)
+    return data
+
+
+def upload(url: str, path: str, use_async: bool, **options):
+    if not use_async:
+        return TuringDB(host=url).upload(path, "turingdb://data.bin", **options)
+
+    async def run():
+        async with AsyncTuringDB(host=url) as client:
+            return await client.upload(path, "turingdb://data.bin", **options)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_upload_in_chunks(tmp_path, data, use_async, compression):
+    updates: list[int] = []
+
+    with UploadServer() as server:
+        stats = upload(
+            server.url,
+            str(tmp_path / "data.bin"),
+            use_async,
+            chunk_size=4096,
+            compression=compression,
+            progress=lambda stats: updates.append(stats.bytes_transferred),
+        )
+
+    assert b"".join(server.chunks) == data
+    assert len(server.chunks) == 3
+    assert server.completed
+    assert updates == [4096, 8192, len(data)]
+    assert stats.total_bytes == stats.bytes_transferred == len(data)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+@pytest.mark.parametrize("resume", [True, False])
+def test_upload_resumes_from_the_server_offset(tmp_path, data, use_async, resume):
+    with UploadServer(offset=1000) as server:
+        stats = upload(server.url, str(tmp_path / "data.bin"), use_async, resume=resume)
+
+    expected = data[1000:] if resume else data
+    assert b"".join(server.chunks) == expected
+    assert stats.bytes_transferred == len(expected)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_upload_falls_back_to_s3(tmp_path, data, use_async):
+    """Without the upload endpoints, nor a connected bucket"""
+
+    with MockTuringDBServer(fail_rate=1.0, fail_status=404) as server:
+        with pytest.raises(TuringDBException, match="s3_connect"):
+            upload(server.url, str(tmp_path / "data.bin"), use_async)
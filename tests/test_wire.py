@@ -0,0 +1,80 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from turingdb import AsyncTuringDB, TuringDB
+from turingdb.results import RESULT_FORMATS
+from turingdb.wire import ARROW_STREAM_MEDIA_TYPE, JSON_MEDIA_TYPE
+
+pytest.importorskip("pyarrow")
+
+QUERY = "MATCH (n) RETURN n"
+
+
+def assert_same_result(json_result, arrow_result, result_format: str):
+    match result_format:
+        case "pandas" | "pandas-arrow":
+            pd.testing.assert_frame_equal(json_result, arrow_result)
+        case "pyarrow":
+            assert json_result.equals(arrow_result)
+        case _:
+            assert json_result.keys() == arrow_result.keys()
+            for name, column in json_result.items():
+                assert column.dtype == arrow_result[name].dtype
+                assert column.tolist() == arrow_result[name].tolist()
+
+
+@pytest.mark.parametrize("result_format", RESULT_FORMATS)
+def test_json_and_arrow_results_match(server, result_format):
+    json_client = TuringDB(host=server.url)
+    arrow_client = TuringDB(host=server.url, wire_format="arrow")
+
+    json_result = json_client.query(QUERY, result_format=result_format)
+    arrow_result = arrow_client.query(QUERY, result_format=result_format)
+
+    assert server.content_types == [JSON_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE]
+    assert_same_result(json_result, arrow_result, result_format)
+    assert json_client.get_query_exec_time() == arrow_client.get_query_exec_time() == 0.1
+
+
+def test_raw_results_match(server):
+    json_result = TuringDB(host=server.url).query(QUERY, raw=True)
+    arrow_result = TuringDB(host=server.url, wire_format="arrow").query(QUERY, raw=True)
+
+    assert json_result == arrow_result
+    assert len(json_result["col0"]) == 15
+
+
+@pytest.mark.parametrize("result_format", RESULT_FORMATS)
+def test_async_json_and_arrow_results_match(server, result_format):
+    async def query(wire_format: str):
+        async with AsyncTuringDB(host=server.url, wire_format=wire_format) as client:
+            return await client.query(QUERY, result_format=result_format)
+
+    json_result = asyncio.run(query("json"))
+    arrow_result = asyncio.run(query("arrow"))
+
+    assert server.content_types == [JSON_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE]
+    assert_same_result(json_result, arrow_result, result_format)
+
+
+@pytest.mark.parametrize("result_format", RESULT_FORMATS)
+def test_arrow_falls_back_to_json(server, json_server, result_format):
+    """A server without Arrow support answers the Arrow client in JSON"""
+
+    expected = TuringDB(host=server.url, wire_format="arrow").query(
+        QUERY, result_format=result_format
+    )
+    result = TuringDB(host=json_server.url, wire_format="arrow").query(
+        QUERY, result_format=result_format
+    )
+
+    assert json_server.content_types == [JSON_MEDIA_TYPE]
+    assert_same_result(result, expected, result_format)
+
+
+def test_json_client_does_not_accept_arrow(server):
+    TuringDB(host=server.url).query(QUERY)
+
+    assert server.content_types == [JSON_MEDIA_TYPE]